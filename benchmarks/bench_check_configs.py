@@ -0,0 +1,57 @@
+"""Benchmarks `docstr check` of many copies of the numpy example config,
+reporting the configs checked per second.
+
+Run after `pip install -e .` from the repo's root, as the configs import the
+tests' example docstrings: `python benchmarks/bench_check_configs.py`
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import yaml
+
+from docstr.cli.check import check_configs
+
+
+def write_configs(dir_path, num_configs):
+    """Writes copies of the numpy example config, every tenth one invalid."""
+    with open('tests/numpy_example_config.yaml', 'r') as openf:
+        config = yaml.safe_load(openf)
+    args = config['NumpyDocClassRecursiveParse']['very_useful_class'][
+        'NumpyDocClass'
+    ]
+
+    paths = []
+    for i in range(num_configs):
+        args['x'] = 'not_a_number' if i % 10 == 9 else i
+        path = os.path.join(dir_path, f'config_{i}.yaml')
+        with open(path, 'w') as openf:
+            yaml.safe_dump(config, openf, sort_keys=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_configs', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        configs = write_configs(dir_path, args.num_configs)
+        start = time.perf_counter()
+        failed = sum(
+            bool(result.errors)
+            for result in check_configs(configs, jobs=args.jobs)
+        )
+        seconds = time.perf_counter() - start
+
+    print(
+        f'Checked {len(configs)} configs, {failed} with errors, in',
+        f'{seconds:.3f}s: {len(configs) / seconds:.0f} configs/s',
+    )
+
+
+if __name__ == '__main__':
+    main()
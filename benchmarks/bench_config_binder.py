@@ -0,0 +1,156 @@
+"""Benchmarks binding a config-only run of a generated program of about 2000
+args, comparing the ConfigBinder to building the program's ConfigArgParser
+and parsing the config with it.
+
+Run after `pip install -e .`: `python benchmarks/bench_config_binder.py`
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+from docstr.cli.cli import load_program
+from docstr.configargparse import (
+    ConfigBinder,
+    IndexedNamespace,
+    get_configargparser,
+)
+
+# The types of the generated args cycle through these, as in the docstrings.
+ARG_TYPES = [
+    ('int', '0', 1),
+    ('float', '0.5', 2.5),
+    ('str', "'text'", 'other'),
+    ('bool', 'False', True),
+    ("'a' | 'b' | 'c'", "'a'", 'b'),
+]
+
+INIT_DOCSTRING = [
+    '        """',
+    '        Args',
+    '        ----',
+    '        see self',
+    '        """',
+]
+
+
+def get_module_source(num_leaves, num_args):
+    """Returns the source of a root class with the given number of nested
+    leaf classes, each with the given number of args.
+    """
+    lines = []
+    for i in range(num_leaves):
+        params = ', '.join(
+            f'a{j}={ARG_TYPES[j % len(ARG_TYPES)][1]}' for j in range(num_args)
+        )
+        lines += [
+            f'class Leaf{i}(object):',
+            '    """A generated leaf.',
+            '',
+            '    Attributes',
+            '    ----------',
+        ]
+        for j in range(num_args):
+            type_name, default, _ = ARG_TYPES[j % len(ARG_TYPES)]
+            lines += [
+                f'    a{j} : {type_name} = {default}',
+                f'        The generated arg {j}.',
+            ]
+        lines += ['    """', f'    def __init__(self, {params}):']
+        lines += INIT_DOCSTRING + ['']
+
+    params = ', '.join(f'leaf{i}' for i in range(num_leaves))
+    lines += ['class Root(object):', '    """A generated root.', '']
+    lines += ['    Attributes', '    ----------']
+    for i in range(num_leaves):
+        lines += [f'    leaf{i} : Leaf{i}', f'        The leaf {i}.']
+    lines += ['    """', f'    def __init__(self, {params}):']
+    lines += INIT_DOCSTRING
+    lines += ['', '    def run(self):', '        return 0', '']
+    return '\n'.join(lines)
+
+
+def get_config(num_leaves, num_args):
+    """Returns the docstr config setting every arg of the generated program.
+    """
+    root = {}
+    for i in range(num_leaves):
+        root[f'leaf{i}'] = {f'Leaf{i}': {
+            f'a{j}': ARG_TYPES[j % len(ARG_TYPES)][2] for j in range(num_args)
+        }}
+    return {
+        'docstr': {
+            'style': 'numpy',
+            'from import': {
+                'bench_binder_program': ['Root'] + [
+                    f'Leaf{i}' for i in range(num_leaves)
+                ],
+            },
+            'main': 'run',
+        },
+        'Root': root,
+    }
+
+
+def time_it(func, repeat):
+    """Returns the result of the function and its mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_leaves', type=int, default=40)
+    parser.add_argument('--num_args', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        with open(os.path.join(dir_path, 'bench_binder_program.py'), 'w') as f:
+            f.write(get_module_source(args.num_leaves, args.num_args))
+        config_path = os.path.join(dir_path, 'config.yaml')
+        with open(config_path, 'w') as openf:
+            yaml.safe_dump(get_config(args.num_leaves, args.num_args), openf)
+
+        sys.path.insert(0, dir_path)
+        _, prog_parser = load_program(config_path)
+        tokens = prog_parser.tokens
+        config = prog_parser.config
+
+    def parse_with_argparse():
+        cap_parser = get_configargparser(tokens)
+        return cap_parser.parse_args(
+            args=[],
+            namespace=IndexedNamespace(),
+            config_file_contents=yaml.dump(dict(config)),
+        )
+
+    def bind():
+        return ConfigBinder.from_tokens(tokens).bind(config)
+
+    parsed, parse_seconds = time_it(parse_with_argparse, args.repeat)
+    bound, bind_seconds = time_it(bind, args.repeat)
+    assert parsed == bound
+
+    # Repeated parses of the program, e.g. in a batch or sweep, where a CLI
+    # arg falls back to argparse.
+    _, reparse_seconds = time_it(
+        lambda: prog_parser.parse(['--leaf0.a0', '1']),
+        args.repeat,
+    )
+    _, rebind_seconds = time_it(prog_parser.parse, args.repeat)
+
+    print(f'{len(config)} args')
+    print(f'get_configargparser + parse_args: {parse_seconds:.4f}s')
+    print(f'ConfigBinder.from_tokens + bind: {bind_seconds:.4f}s')
+    print(f'ProgramParser.parse with a CLI arg: {reparse_seconds:.4f}s')
+    print(f'ProgramParser.parse of the config: {rebind_seconds:.4f}s')
+
+
+if __name__ == '__main__':
+    main()
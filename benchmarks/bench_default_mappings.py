@@ -0,0 +1,75 @@
+"""Benchmarks loading a yaml config whose nodes are tagged with a large
+`!docstr.configs` default mapping, comparing merge_mappings(), which reads
+through to the default rather than copying it, to recursive_dict_update(),
+which shallow copies the default for every tagged node.
+
+Run from the repository: `python benchmarks/bench_default_mappings.py`
+"""
+import argparse
+from functools import partial
+import os
+import sys
+import time
+
+import yaml
+
+# Import the docstr of this repository, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docstr.configargparse import (
+    default_mapping_constructor,
+    recursive_dict_update,
+)
+
+
+def copy_mapping_constructor(loader, node, default_map):
+    """The constructor before sharing the default, which shallow copies the
+    default and its mappings along the tagged node's keys.
+    """
+    return recursive_dict_update(
+        default_map,
+        loader.construct_mapping(node, True),
+        copy=True,
+    )
+
+
+def get_config(num_keys, num_nodes):
+    """Returns the default mapping and the yaml text of the tagged nodes."""
+    default_map = {f'arg_{i}': {'value': i} for i in range(num_keys)}
+    yaml_text = '\n'.join(
+        f'node_{i}: !docstr.configs:default {{arg_{i}: {{value: -1}}}}'
+        for i in range(num_nodes)
+    )
+    return default_map, yaml_text
+
+
+def time_load(constructor, default_map, yaml_text):
+    """Returns the seconds to load the yaml text with the given constructor.
+    """
+    loader = type('BenchLoader', (yaml.SafeLoader,), {})
+    loader.add_constructor(
+        '!docstr.configs:default',
+        partial(constructor, default_map=default_map),
+    )
+    start = time.perf_counter()
+    yaml.load(yaml_text, Loader=loader)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_keys', type=int, default=10000)
+    parser.add_argument('--num_nodes', type=int, default=1000)
+    args = parser.parse_args()
+
+    default_map, yaml_text = get_config(args.num_keys, args.num_nodes)
+    for name, constructor in (
+        ('recursive_dict_update', copy_mapping_constructor),
+        ('merge_mappings', default_mapping_constructor),
+    ):
+        seconds = time_load(constructor, default_map, yaml_text)
+        print(f'{name}: {seconds:.3f}s for {args.num_nodes} nodes')
+
+
+if __name__ == '__main__':
+    main()
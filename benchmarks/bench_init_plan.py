@@ -0,0 +1,69 @@
+"""Benchmarks repeatedly initializing a generated program of nested objects,
+as the trials of a sweep do, comparing `init_prog()` to executing the
+program's compiled InitPlan.
+
+Run after `pip install -e .`: `python benchmarks/bench_init_plan.py`
+"""
+import argparse
+import time
+
+from docstr.configargparse import InitPlan, NestedNamespace, init_prog
+
+
+class Node(object):
+    """A generated object of the program, given its args as kwargs."""
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def get_namespace(depth, width, num_args):
+    """Returns the namespace of a tree of Nodes of the given depth, where each
+    node has the given number of children and args.
+    """
+    namespace = NestedNamespace()
+    namespace.docstr_type = Node
+    for i in range(num_args):
+        setattr(namespace, f'a{i}', i)
+    if depth > 1:
+        for i in range(width):
+            setattr(
+                namespace,
+                f'child{i}',
+                get_namespace(depth - 1, width, num_args),
+            )
+    return namespace
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--width', type=int, default=5)
+    parser.add_argument('--num_args', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    namespace = get_namespace(args.depth, args.width, args.num_args)
+    num_objects = sum(args.width ** i for i in range(args.depth))
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        init_prog(namespace)
+    init_prog_seconds = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    plan = InitPlan.compile(namespace)
+    compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        plan.init(namespace)
+    plan_seconds = (time.perf_counter() - start) / args.repeat
+
+    print(f'{num_objects} objects of {args.num_args} args')
+    print(f'init_prog: {init_prog_seconds * 1e6:.1f}us per program')
+    print(f'InitPlan.compile: {compile_seconds * 1e6:.1f}us once')
+    print(f'InitPlan.init: {plan_seconds * 1e6:.1f}us per program')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmarks building the ConfigArgParser of a generated program of 50
+optional components, comparing registering every nested argument group when
+built to registering them lazily once a parse uses them.
+
+Run after `pip install -e .`: `python benchmarks/bench_nested_parsers.py`
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+from bench_config_binder import get_config, get_module_source, time_it
+from docstr.cli.cli import load_program
+from docstr.configargparse import IndexedNamespace, get_configargparser
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_leaves', type=int, default=50)
+    parser.add_argument('--num_args', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Only the first component is configured, the rest are left as defaults.
+    config = get_config(args.num_leaves, args.num_args)
+    config['Root'] = {'leaf0': config['Root']['leaf0']}
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        with open(os.path.join(dir_path, 'bench_binder_program.py'), 'w') as f:
+            f.write(get_module_source(args.num_leaves, args.num_args))
+        config_path = os.path.join(dir_path, 'config.yaml')
+        with open(config_path, 'w') as openf:
+            yaml.safe_dump(config, openf)
+
+        sys.path.insert(0, dir_path)
+        _, prog_parser = load_program(config_path)
+        tokens = prog_parser.tokens
+        config_contents = yaml.dump(dict(prog_parser.config))
+
+    def build_and_parse(lazy_nested):
+        cap_parser = get_configargparser(tokens, lazy_nested=lazy_nested)
+        return cap_parser.parse_args(
+            args=['--leaf1.a0', '2'],
+            namespace=IndexedNamespace(),
+            config_file_contents=config_contents,
+        )
+
+    eager, eager_build = time_it(
+        lambda: get_configargparser(tokens),
+        args.repeat,
+    )
+    lazy, lazy_build = time_it(
+        lambda: get_configargparser(tokens, lazy_nested=True),
+        args.repeat,
+    )
+    parsed, eager_seconds = time_it(
+        lambda: build_and_parse(False),
+        args.repeat,
+    )
+    lazy_parsed, lazy_seconds = time_it(
+        lambda: build_and_parse(True),
+        args.repeat,
+    )
+    assert repr(parsed) == repr(lazy_parsed)
+
+    print(f'{args.num_leaves} components of {args.num_args} args')
+    print(f'eager build: {eager_build:.4f}s, {len(eager._actions)} actions')
+    print(f'lazy build: {lazy_build:.4f}s, {len(lazy._actions)} actions')
+    print(f'eager build + parse of 2 components: {eager_seconds:.4f}s')
+    print(f'lazy build + parse of 2 components: {lazy_seconds:.4f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,16 @@ __all__ = [
     'parsing',
 ]
 
-from .parsing import parse, parse_config
 
-for module in __all__:
-    globals()[module] = import_module(f'.{module}', __name__)
-del import_module, module
+def __getattr__(name):
+    """Imports the submodules and the parsing functions on first access, such
+    that the console script's completions do not import sphinx nor docutils.
+    """
+    if name in {'parse', 'parse_config'}:
+        return getattr(import_module('.parsing', __name__), name)
+    if name in __all__:
+        return import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 __all__ += ['parse', 'parse_config', '__version__']
@@ -0,0 +1,322 @@
+"""Launch cache of a docstr program's parsed config, docstring tokens, and
+ConfigArgParser, such that repeated runs of the same config only load the
+cache and apply their overrides rather than parsing everything again.
+"""
+from dataclasses import dataclass
+import hashlib
+from importlib.util import find_spec
+import logging
+import os
+import pickle
+
+from docstr import __version__
+from docstr.completion import get_cache_key, get_index_path, save_index
+from docstr.configargparse import (
+    cast_bool_str,
+    get_docstring_args,
+    get_parser_spec,
+)
+from docstr.docstring import (
+    ClassDocstring,
+    FuncDocstring,
+    MultiType,
+    ValueExists,
+)
+
+
+def hash_file(path, chunk_size=1 << 16):
+    """Returns the sha256 hex digest of the contents of the file at path."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as openf:
+        for chunk in iter(lambda: openf.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def get_module_hashes(modules):
+    """Returns the source hashes of the given modules without importing them.
+
+    Args
+    ----
+    modules : [str]
+        The fully qualified names of the modules to be hashed.
+
+    Returns
+    -------
+    {str: str}
+        The module names to the sha256 hex digest of their source file. The
+        value is None if the module has no source file, e.g. builtins.
+    """
+    module_hashes = {}
+    for module in sorted(modules):
+        try:
+            spec = find_spec(module)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None or not spec.has_location or spec.origin is None:
+            module_hashes[module] = None
+        else:
+            module_hashes[module] = hash_file(spec.origin)
+    return module_hashes
+
+
+def get_token_modules(tokens):
+    """Returns the modules of every object whose docstring is in the tokens.
+
+    Args
+    ----
+    tokens : ClassDocstring | FuncDocstring
+        The root of the parsed tokens of the python program.
+
+    Returns
+    -------
+    {str}
+        The names of the modules the parsed docstrings were written within.
+    """
+    modules = set()
+    stack = [tokens]
+    while stack:
+        docstring = stack.pop()
+        modules.add(docstring.type.__module__)
+        for arg in get_docstring_args(docstring).values():
+            if isinstance(arg.type, (ClassDocstring, FuncDocstring)):
+                stack.append(arg.type)
+    return modules
+
+
+def get_type_name(arg_type):
+    """Returns the readable name of an argument's type for completion."""
+    if arg_type is bool or arg_type is cast_bool_str:
+        return 'bool'
+    if arg_type is ValueExists.false:
+        return 'str'
+    if isinstance(arg_type, MultiType):
+        return ' | '.join(
+            get_type_name(t) if isinstance(t, type) else repr(t)
+            for t in arg_type
+        )
+    return getattr(arg_type, '__name__', str(arg_type))
+
+
+def get_completion_index(parser_spec):
+    """Returns the completion index of the program's arguments.
+
+    Args
+    ----
+    parser_spec : docstr.configargparse.ParserSpec
+        The recorded ConfigArgParser of the program, see `get_parser_spec()`.
+
+    Returns
+    -------
+    dict
+        The program's name, `prog`, and its `args` as the dotted argument
+        names in the order of the program's parser to their `type`,
+        `choices`, `default`, and `help`. Choices are the strs of a literal
+        MultiType's values or of a bool. See `docstr.completion`.
+    """
+    args = {}
+    for arg in parser_spec.args:
+        if arg.dest.rpartition('.')[2] == 'docstr_type':
+            continue
+
+        if arg.choices is not None:
+            choices = [str(value) for value in arg.choices]
+        elif arg.type is cast_bool_str:
+            choices = ['False', 'True']
+        else:
+            choices = None
+
+        args[arg.dest] = {
+            'type': get_type_name(arg.type),
+            'choices': choices,
+            'default': None if arg.default is None else str(arg.default),
+            'help': arg.help,
+        }
+    return {'prog': parser_spec.prog, 'args': args}
+
+
+def includes_unchanged(cap_namespace):
+    """Returns True if every config file included by the program's config
+    still exists with the same content hash.
+
+    Args
+    ----
+    cap_namespace : NestedNamespace
+        The output of `prototype_hack_reformat_yaml_dict_unnested_cap()`,
+        whose `docstr.includes` are the included paths to their hashes.
+
+    Returns
+    -------
+    bool
+    """
+    includes = getattr(cap_namespace.docstr, 'includes', None) or {}
+    for path, digest in includes.items():
+        if not os.path.isfile(path) or hash_file(path) != digest:
+            return False
+    return True
+
+
+@dataclass
+class LaunchCacheEntry:
+    """The cached state of a docstr program given its config.
+
+    Attributes
+    ----------
+    config_path : str
+        The absolute path of the config file.
+    config_hash : str
+        The sha256 hex digest of the config file's contents.
+    module_hashes : {str: str}
+        The source hashes of the modules the program's docstrings and
+        `from import` namespace come from when the entry was created.
+    cap_namespace : NestedNamespace
+        The output of `prototype_hack_reformat_yaml_dict_unnested_cap()`.
+    tokens : ClassDocstring | FuncDocstring
+        The parsed docstring tokens of the program's entry object.
+    parser_spec : docstr.configargparse.ParserSpec
+        The recorded ConfigArgParser to be rebuilt without the tokens.
+    version : str = docstr.__version__
+    """
+    config_path : str
+    config_hash : str
+    module_hashes : dict
+    cap_namespace : object
+    tokens : object
+    parser_spec : object
+    version : str = __version__
+
+    @property
+    def key(self):
+        """The key of the entry in the LaunchCache, see `get_cache_key()`."""
+        return get_cache_key(self.config_path, self.config_hash)
+
+
+class LaunchCache(object):
+    """A directory of pickled LaunchCacheEntries keyed by the config's absolute
+    path and content hash.
+
+    Attributes
+    ----------
+    cache_dir : str = None
+        The directory the cache entries are saved within. Defaults to
+        `~/.cache/docstr`.
+
+    Notes
+    -----
+    An entry is only used if the content hashes of the config and its included
+    config files and the source hashes of its modules still match, otherwise
+    it is rebuilt and overwritten. Saving an entry also writes the completion
+    index of the program's args, see `docstr.completion`.
+    """
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = os.path.join(
+                os.path.expanduser('~'),
+                '.cache',
+                'docstr',
+            )
+        self.cache_dir = cache_dir
+
+    def path(self, cache_key):
+        """Returns the file path of the cache entry for the cache key."""
+        return os.path.join(self.cache_dir, f'{cache_key}.pickle')
+
+    def load(self, config_path):
+        """Loads the valid cache entry of the given config, if one exists.
+
+        Args
+        ----
+        config_path : str
+            The path to the docstr yaml config of the program.
+
+        Returns
+        -------
+        LaunchCacheEntry | None
+            The cached entry, or None if missing, stale, or unreadable.
+        """
+        config_path = os.path.abspath(config_path)
+        config_hash = hash_file(config_path)
+        path = self.path(get_cache_key(config_path, config_hash))
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as openf:
+                entry = pickle.load(openf)
+        except Exception as e:
+            logging.warning(
+                'Ignoring unreadable docstr cache `%s`: %s',
+                path,
+                e,
+            )
+            return None
+
+        if (
+            entry.version != __version__
+            or entry.config_path != config_path
+            or entry.config_hash != config_hash
+            or entry.module_hashes != get_module_hashes(entry.module_hashes)
+            or not includes_unchanged(entry.cap_namespace)
+        ):
+            logging.debug('Stale docstr cache entry: %s', path)
+            return None
+        return entry
+
+    def save(self, config_path, cap_namespace, tokens, parser):
+        """Saves the parsed state of the given config as its cache entry.
+
+        Args
+        ----
+        config_path : str
+            The path to the docstr yaml config of the program.
+        cap_namespace : NestedNamespace
+            The output of `prototype_hack_reformat_yaml_dict_unnested_cap()`.
+        tokens : ClassDocstring | FuncDocstring
+            The parsed docstring tokens of the program's entry object.
+        parser : configargparse.ArgumentParser
+            The program's ConfigArgParser generated from the tokens.
+
+        Returns
+        -------
+        LaunchCacheEntry
+            The entry, which is not saved if it is unable to be pickled, e.g.
+            given a default that is a lambda.
+        """
+        modules = get_token_modules(tokens)
+        # Only the modules of the used `from import` objects were imported.
+        namespace = cap_namespace.docstr.namespace
+        modules.update(namespace[name].__module__ for name in namespace.used())
+        config_path = os.path.abspath(config_path)
+        entry = LaunchCacheEntry(
+            config_path=config_path,
+            config_hash=hash_file(config_path),
+            module_hashes=get_module_hashes(modules),
+            cap_namespace=cap_namespace,
+            tokens=tokens,
+            parser_spec=get_parser_spec(parser),
+        )
+
+        # Write then rename, so concurrent launches never read partial files.
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(entry.key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as openf:
+                pickle.dump(entry, openf, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logging.warning(
+                'Not caching the unpicklable docstr program of `%s`: %s',
+                config_path,
+                e,
+            )
+            os.remove(tmp_path)
+            return entry
+        os.replace(tmp_path, path)
+
+        # Shell completion reads this index rather than the pickled entry.
+        save_index(
+            get_index_path(self.cache_dir, entry.key),
+            get_completion_index(entry.parser_spec),
+        )
+
+        return entry
@@ -4,6 +4,9 @@ __all__ = [
     'cli',
 ]
 
-for module in __all__:
-    globals()[module] = import_module(f'.{module}', __name__)
-del import_module, module
+
+def __getattr__(name):
+    """Imports the submodules on first access, as in `docstr.__getattr__`."""
+    if name in __all__:
+        return import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
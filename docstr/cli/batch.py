@@ -0,0 +1,401 @@
+"""Batch running of many docstr program configs on a process pool.
+
+The configs of the same program share its parsed docstring tokens and parser,
+which are parsed once in the parent process before the pool's workers are
+forked, such that the workers inherit this warm parse state copy-on-write.
+"""
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from io import StringIO
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import traceback
+
+from docstr.cli.cli import (
+    load_program,
+    prototype_hack_reformat_yaml_dict_unnested_cap,
+    run_program,
+    set_lazy_config_args,
+)
+
+# The functions and contexts of the running `pool_imap()` calls, set by the
+# parent process before forking the pool's workers.
+_WARM_STATE = {}
+_WARM_KEYS = itertools.count()
+
+
+@dataclass
+class RunResult:
+    """The outcome of running a docstr program.
+
+    Attributes
+    ----------
+    config : str
+        The config file path of the program that was run.
+    exit_status : int
+        0 if the program's main returned, whatever it returned, the code of a
+        SystemExit, and 1 if an exception was raised.
+    stdout : str
+        The stdout written by the program while running.
+    wall_time : float
+        The wall clock seconds spent initializing and running the program.
+    cpu_time : float
+        The CPU seconds of the process spent initializing and running the
+        program.
+    returned : object = None
+        The object returned by the program's main, or its repr if it is not
+        picklable.
+    error : str = None
+        The traceback of the exception raised by the program, if any.
+    """
+    config : str
+    exit_status : int
+    stdout : str
+    wall_time : float
+    cpu_time : float
+    returned : object = None
+    error : str = None
+
+
+def get_exit_status(system_exit):
+    """Returns the exit status of the SystemExit as the interpreter would exit
+    with it, where a code that is not None nor an int is an error message.
+    """
+    if system_exit.code is None:
+        return 0
+    if isinstance(system_exit.code, int):
+        return int(system_exit.code)
+    return 1
+
+
+def run_captured(config, func, *args, **kwargs):
+    """Calls the function, capturing its stdout, exit status, and time.
+
+    Args
+    ----
+    config : str
+        The config file path that the function runs, used to label the result.
+    func : callable
+        The function to be called with the remaining args and kwargs.
+
+    Returns
+    -------
+    RunResult
+        The captured outcome of calling the function.
+    """
+    stdout = StringIO()
+    returned = None
+    error = None
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with redirect_stdout(stdout):
+            returned = func(*args, **kwargs)
+        # The returned object is a result of main, e.g. a metric, not a status.
+        exit_status = 0
+    except SystemExit as e:
+        exit_status = get_exit_status(e)
+        if not (e.code is None or isinstance(e.code, int)):
+            error = str(e.code)
+    except Exception:
+        exit_status = 1
+        error = traceback.format_exc()
+    wall_time = time.perf_counter() - start
+    cpu_time = time.process_time() - cpu_start
+
+    # Results are sent back from the workers, so only keep picklable returns.
+    try:
+        pickle.dumps(returned)
+    except Exception:
+        returned = repr(returned)
+
+    return RunResult(
+        config=config,
+        exit_status=exit_status,
+        stdout=stdout.getvalue(),
+        wall_time=wall_time,
+        cpu_time=cpu_time,
+        returned=returned,
+        error=error,
+    )
+
+
+def _call_warm(keyed_item):
+    """Calls the warm function of a `pool_imap()` call on the item."""
+    key, item = keyed_item
+    func, context = _WARM_STATE[key]
+    return func(context, item)
+
+
+def pool_imap(func, items, jobs=None, chunksize=1, context=None):
+    """Lazily maps the function over the items on a pool of forked workers.
+
+    The context is set before forking the workers, which inherit it
+    copy-on-write, so the items only need to identify the work.
+
+    Args
+    ----
+    func : callable
+        The function called as `func(context, item)` on each item in a worker.
+    items : iterable
+        The picklable items to be mapped. Only a bounded number of items are
+        taken from the iterable ahead of the results being consumed.
+    jobs : int = None
+        The number of worker processes. Defaults to the number of CPUs. If 1,
+        or forking processes is unsupported, then the items are mapped in
+        this process.
+    chunksize : int = 1
+        The number of items sent to a worker at a time.
+    context : object = None
+        The state shared by every call of the function, e.g. the loaded
+        programs, which is never pickled.
+
+    Yields
+    ------
+    object
+        The result of the function for each item in the order of the items.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    if jobs > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        logging.warning(
+            'Forked processes are unsupported on this platform. Running the '
+            'jobs sequentially in this process instead.'
+        )
+        jobs = 1
+
+    if jobs == 1:
+        for item in items:
+            yield func(context, item)
+        return
+
+    # The pool consumes its iterable eagerly, so bound the items in flight to
+    # keep lazy iterables of many items, e.g. parameter spaces, lazy.
+    slots = threading.Semaphore(4 * jobs * chunksize)
+    stopped = threading.Event()
+
+    def bounded(items):
+        for item in items:
+            slots.acquire()
+            if stopped.is_set():
+                return
+            yield key, item
+
+    key = next(_WARM_KEYS)
+    _WARM_STATE[key] = (func, context)
+    try:
+        with multiprocessing.get_context('fork').Pool(jobs) as pool:
+            try:
+                for result in pool.imap(_call_warm, bounded(items), chunksize):
+                    slots.release()
+                    yield result
+            finally:
+                # Unblock the pool's task thread if the results were abandoned.
+                stopped.set()
+                slots.release()
+    finally:
+        del _WARM_STATE[key]
+
+
+def load_batch_program(config, loaded, cache_dir=None, lazy_config=False):
+    """Loads the program of the config, reusing the tokens and parser of an
+    already loaded config of the same program.
+
+    Args
+    ----
+    config : str
+        The config file path of the program.
+    loaded : [(NestedNamespace, ProgramParser)]
+        The docstr section and program parser of each distinct program loaded
+        so far, which is appended to if the config's program is new.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+    lazy_config : bool = False
+        If True, only the sections of the config that are the program's args
+        are constructed. See `load_program()`.
+
+    Returns
+    -------
+    (NestedNamespace, ProgramParser)
+        The reformatted config namespace of the config and its program parser.
+    """
+    cap_namespace = prototype_hack_reformat_yaml_dict_unnested_cap(
+        config,
+        lazy_config,
+    )
+    docstr_args = cap_namespace.docstr
+
+    for loaded_docstr, loaded_parser in loaded:
+        if (
+            loaded_docstr.entry_obj is docstr_args.entry_obj
+            and loaded_docstr.style == docstr_args.style
+            and loaded_docstr.whitelist == docstr_args.whitelist
+            and loaded_docstr.configs == docstr_args.configs
+        ):
+            prog_config = set_lazy_config_args(
+                config,
+                cap_namespace,
+                loaded_parser,
+            )
+            return cap_namespace, loaded_parser.with_config(prog_config)
+
+    cap_namespace, prog_parser = load_program(
+        config,
+        cache_dir,
+        cap_namespace,
+        lazy_config,
+    )
+    loaded.append((cap_namespace.docstr, prog_parser))
+    return cap_namespace, prog_parser
+
+
+def get_load_error(config, error):
+    """Returns the failed RunResult of a config whose program did not load.
+
+    Args
+    ----
+    config : str
+        The config file path of the program.
+    error : BaseException
+        The exception raised while loading, e.g. a SystemExit of argparse.
+
+    Returns
+    -------
+    RunResult
+    """
+    if isinstance(error, SystemExit):
+        exit_status = get_exit_status(error)
+    else:
+        exit_status = 1
+    return RunResult(
+        config=config,
+        exit_status=exit_status,
+        stdout='',
+        wall_time=0.0,
+        cpu_time=0.0,
+        error=''.join(traceback.format_exception(
+            type(error),
+            error,
+            error.__traceback__,
+        )),
+    )
+
+
+def get_batch_programs(configs, cache_dir=None, lazy_config=False):
+    """Loads the programs of the configs, parsing each program's tokens once.
+
+    Args
+    ----
+    configs : [str]
+        The config file paths of the programs.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+    lazy_config : bool = False
+        If True, only the sections of the configs that are the programs' args
+        are constructed. See `load_program()`.
+
+    Returns
+    -------
+    [(NestedNamespace, ProgramParser) | RunResult]
+        The reformatted config namespace of each config and its program parser
+        in the order of the configs, or the failed RunResult of a config that
+        did not load, such that the other configs still run. The configs of
+        the same program share the same tokens and parser.
+    """
+    loaded = []
+    programs = []
+    for config in configs:
+        try:
+            programs.append(load_batch_program(
+                config,
+                loaded,
+                cache_dir,
+                lazy_config,
+            ))
+        except (Exception, SystemExit) as e:
+            programs.append(get_load_error(config, e))
+    return programs
+
+
+def _run_batch_item(context, index):
+    """Runs the program of the config at the index in the batch's context."""
+    config = context['configs'][index]
+    program = context['programs'][index]
+    if isinstance(program, RunResult):
+        return program
+    cap_namespace, prog_parser = program
+    return run_captured(
+        config,
+        run_program,
+        cap_namespace,
+        prog_parser,
+        context['prog_args'],
+        **context['options'],
+    )
+
+
+def run_batch(
+    configs,
+    prog_args=None,
+    jobs=None,
+    cache_dir=None,
+    init_jobs=None,
+    share=False,
+    unshared=None,
+    lazy=False,
+    lazy_config=False,
+):
+    """Runs the programs of many configs on a pool of worker processes.
+
+    Args
+    ----
+    configs : [str]
+        The config file paths of the programs to be run.
+    prog_args : [str] = None
+        The arguments for the python programs that override every config.
+    jobs : int = None
+        The number of worker processes. Defaults to the number of CPUs.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+    init_jobs : int = None
+        If given, the number of threads that initialize each program's
+        objects in parallel. See `run_program()`.
+    share : bool = False
+        If True, identical nested objects are initialized once and shared.
+    unshared : set = None
+        The types, or their fully qualified names, that are never shared.
+    lazy : bool = False
+        If True, nested objects are initialized on their first use.
+    lazy_config : bool = False
+        If True, only the sections of the configs that are the programs' args
+        are constructed. See `load_program()`.
+
+    Returns
+    -------
+    [RunResult]
+        The outcome of running each config in the order of the configs.
+    """
+    configs = list(configs)
+    context = dict(
+        configs=configs,
+        programs=get_batch_programs(configs, cache_dir, lazy_config),
+        prog_args=[] if prog_args is None else list(prog_args),
+        options=dict(
+            init_jobs=init_jobs,
+            share=share,
+            unshared=unshared,
+            lazy=lazy,
+        ),
+    )
+    return list(pool_imap(
+        _run_batch_item,
+        range(len(configs)),
+        jobs,
+        context=context,
+    ))
@@ -0,0 +1,189 @@
+"""Validation of many docstr program configs without running them.
+
+Each config is flattened and every one of its args is cast and checked as the
+program's ConfigArgParser would when run, stopping before `init_prog()`, such
+that every error of a config is reported rather than only its first.
+"""
+import argparse
+from contextlib import redirect_stderr
+from dataclasses import dataclass, field
+from io import StringIO
+import math
+import os
+
+from docstr.cli.batch import load_batch_program, pool_imap
+from docstr.configargparse import ArgumentParser
+
+@dataclass
+class CheckResult:
+    """The errors found when checking a config against its program.
+
+    Attributes
+    ----------
+    config : str
+        The config file path that was checked.
+    errors : [str] = list
+        The messages of every error in the config, empty if it is valid.
+    """
+    config : str
+    errors : list = field(default_factory=list)
+
+
+def get_arg_errors(parser, action, value):
+    """Returns the errors of casting the config's value for the action.
+
+    Args
+    ----
+    parser : configargparse.ArgumentParser
+        The program's parser the action belongs to.
+    action : argparse.Action
+        The action of the argument whose value is checked.
+    value : object
+        The value of the argument in the flattened config.
+
+    Returns
+    -------
+    [str]
+        The error of the value's cast or choices, if any, as the parser
+        reports it.
+    """
+    if value is None:
+        # ConfigArgParse skips null values, leaving the default.
+        return []
+    if isinstance(value, list):
+        return [
+            f'argument --{action.dest}: unable to be set to a list: {value}'
+        ]
+    try:
+        # The config file's values are given to the parser as strs.
+        parser._check_value(action, parser._get_value(action, str(value)))
+    except argparse.ArgumentError as e:
+        return [str(e)]
+    return []
+
+
+def check_args(prog_parser, prog_args=None):
+    """Checks the program's config and arguments, stopping before
+    `init_prog()`.
+
+    Args
+    ----
+    prog_parser : docstr.configargparse.ProgramParser
+        The program's parser with the flattened config as its config.
+    prog_args : [str] = None
+        The arguments for the python program that override its config.
+
+    Returns
+    -------
+    [str]
+        The messages of every error found, empty if the program's arguments
+        parse.
+    """
+    parser = prog_parser.get_parser()
+    if isinstance(parser, ArgumentParser):
+        # Registers the nested groups of the config's args to check them.
+        parser.register_nested(prog_parser.config)
+    actions = {action.dest: action for action in parser._actions}
+    prog_args = [] if prog_args is None else prog_args
+
+    errors = []
+    for name, value in prog_parser.config.items():
+        action = actions.get(name)
+        if action is None:
+            errors.append(f'unrecognized argument: --{name}')
+        else:
+            errors += get_arg_errors(parser, action, value)
+
+    for dest, action in actions.items():
+        option = f'--{dest}'
+        if (
+            action.required
+            and dest not in prog_parser.config
+            and not any(
+                arg == option or arg.startswith(f'{option}=')
+                for arg in prog_args
+            )
+        ):
+            errors.append(f'the argument {option} is required')
+
+    if errors:
+        return errors
+
+    # Catches anything else the parser rejects, e.g. the program's arguments.
+    stderr = StringIO()
+    try:
+        with redirect_stderr(stderr):
+            prog_parser.parse(prog_args)
+    except SystemExit:
+        lines = stderr.getvalue().strip().splitlines()
+        message = lines[-1] if lines else 'unable to parse the arguments'
+        errors.append(message.partition(': error: ')[2] or message)
+    return errors
+
+
+def _check_item(context, index):
+    """Checks the config at the index, reusing the context's loaded programs'
+    parsers.
+    """
+    config = context['configs'][index]
+    try:
+        _, prog_parser = load_batch_program(
+            config,
+            context['loaded'],
+            context['cache_dir'],
+        )
+        errors = check_args(prog_parser, context['prog_args'])
+    except Exception as e:
+        errors = [f'{type(e).__name__}: {e}']
+    return CheckResult(config, errors)
+
+
+def check_configs(configs, prog_args=None, jobs=None, cache_dir=None):
+    """Checks many configs against their programs' docstrings on a pool of
+    worker processes without initializing nor running the programs.
+
+    Args
+    ----
+    configs : [str]
+        The config file paths of the programs to be checked.
+    prog_args : [str] = None
+        The arguments for the python programs that override every config.
+    jobs : int = None
+        The number of worker processes. Defaults to the number of CPUs.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+
+    Yields
+    ------
+    CheckResult
+        The errors of each config in the order of the configs.
+
+    Notes
+    -----
+    The first config's program is loaded before the workers are forked, so
+    they share its parser. A worker loads any other program once, the first
+    time it checks one of that program's configs.
+    """
+    configs = list(configs)
+    context = dict(
+        configs=configs,
+        loaded=[],
+        cache_dir=cache_dir,
+        prog_args=[] if prog_args is None else list(prog_args),
+    )
+
+    if configs:
+        yield _check_item(context, 0)
+    if len(configs) < 2:
+        return
+
+    # Checking a config is fast, so send the workers many at a time.
+    num_jobs = jobs or os.cpu_count() or 1
+    chunksize = max(1, min(64, math.ceil(len(configs) / (4 * num_jobs))))
+    yield from pool_imap(
+        _check_item,
+        range(1, len(configs)),
+        jobs,
+        chunksize,
+        context,
+    )
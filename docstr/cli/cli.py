@@ -1,147 +1,760 @@
 """The base docstr command line interface through ConfigArgParse."""
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
 import logging
 import os
 from functools import partial
-from importlib import import_module
-from operator import attrgetter
+import sys
 import yaml
 
 import configargparse as cap
 
 from docstr import parse_config #, parse
+from docstr.cache import LaunchCache
 from docstr.configargparse import (
     NestedNamespace,
     YAMLConfigFileParserCustomLoader,
     add_default_mappings,
     get_configargparser,
     init_prog,
+    ProgramParser,
 )
-from docstr.docstring import get_full_qual_name
+from docstr.imports import LazyImports, LazyWhitelist
+from docstr.includes import add_includes, track_includes
+from docstr.lazyconfig import LazyMapping, load_lazy
 
-# TODO Run ConfigArgParse subparser
 def run_cap(subparsers):
-    """Given a config file, run the program using docstr, parsing as necessary.
+    """Given config files, run the programs using docstr, parsing as necessary.
     """
     subcap = subparsers.add_parser(
         'run',
         help='Run a python program given the config file.',
+        description=' '.join([
+            'Run the python program of each given config file. Any arguments',
+            'not for docstr are passed to every program to override its',
+            'config. Multiple configs are run on a process pool, where the',
+            'configs of the same program share its parsed docstring tokens.',
+        ]),
+    )
+
+    subcap.add_argument(
+        'configs',
+        nargs='+',
+        help=' '.join([
+            'The config files of the python programs to be run using docstr.',
+            'A directory runs all of its yaml configs and a glob pattern runs',
+            'all of its matching configs. The configs must be given before',
+            "the program's arguments.",
+        ]),
+    )
+
+    subcap.add_argument(
+        '-j',
+        '--docstr.jobs',
+        type=int,
+        default=None,
+        help=' '.join([
+            'The number of worker processes that run the configs. Defaults',
+            'to running a single config in this process and multiple configs',
+            'on as many processes as there are CPUs.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.init_jobs',
+        type=int,
+        default=None,
+        help=' '.join([
+            "The number of threads that initialize the program's objects,",
+            'where independent nested objects are constructed concurrently.',
+            'Defaults to initializing one object at a time.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.lazy',
+        action='store_true',
+        help=' '.join([
+            'Initialize only the entry object, where its nested objects are',
+            'initialized on their first use.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.lazy_config',
+        action='store_true',
+        help=' '.join([
+            "Only construct the sections of the config that are the program's",
+            'args, constructing any other section on its first access.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.share',
+        action='store_true',
+        help=' '.join([
+            'Initialize identical nested objects, i.e. the same type with the',
+            'same args, once and share the object between their parents.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.unshared',
+        nargs='+',
+        default=None,
+        help=' '.join([
+            'The fully qualified names of the types that are never shared',
+            'when sharing identical nested objects.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.via_daemon',
+        action='store_true',
+        help=' '.join([
+            'Run each config in a worker forked by the warm `docstr serve`',
+            'daemon, streaming its output back.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.socket',
+        default=None,
+        env_var='DOCSTR_SOCKET',
+        help=' '.join([
+            "The path of the docstr daemon's Unix socket. Defaults to",
+            '`~/.cache/docstr/daemon.sock`.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.cache_dir',
+        default=None,
+        env_var='DOCSTR_CACHE_DIR',
+        help=' '.join([
+            'The directory of the docstr launch cache of parsed configs,',
+            'tokens, and parsers. The cache is not used when not given.',
+        ]),
+    )
+
+    subcap.set_defaults(docstr_command=run_command)
+
+
+def run_command(args, prog_args):
+    """Runs the `docstr run` subcommand given its parsed arguments.
+
+    Returns
+    -------
+    int
+        The exit status of the run, where a single config run without
+        `--docstr.jobs` nor `--docstr.via_daemon` exits with 0 whatever its
+        main returned. Use `run_config()` for the result of the program's
+        main.
+    """
+    configs = expand_config_paths(args.configs)
+    if args.docstr.via_daemon:
+        # Import here, as the daemon module imports this module.
+        from docstr.daemon import run_via_daemon
+
+        options = dict(
+            init_jobs=args.docstr.init_jobs,
+            share=args.docstr.share,
+            unshared=args.docstr.unshared,
+            lazy=args.docstr.lazy,
+        )
+        return max(
+            run_via_daemon(
+                config,
+                prog_args,
+                args.docstr.socket,
+                options,
+                lazy_config=args.docstr.lazy_config,
+            )
+            for config in configs
+        )
+
+    if len(configs) == 1 and args.docstr.jobs is None:
+        # The result of main is not an exit status, as in `run_batch()`.
+        run_config(
+            configs[0],
+            prog_args,
+            cache_dir=args.docstr.cache_dir,
+            init_jobs=args.docstr.init_jobs,
+            share=args.docstr.share,
+            unshared=args.docstr.unshared,
+            lazy=args.docstr.lazy,
+            lazy_config=args.docstr.lazy_config,
+        )
+        return 0
+
+    # Import here, as the batch module depends on this module.
+    from docstr.cli.batch import run_batch
+
+    results = run_batch(
+        configs,
+        prog_args,
+        jobs=args.docstr.jobs,
+        cache_dir=args.docstr.cache_dir,
+        init_jobs=args.docstr.init_jobs,
+        share=args.docstr.share,
+        unshared=args.docstr.unshared,
+        lazy=args.docstr.lazy,
+        lazy_config=args.docstr.lazy_config,
+    )
+    for result in results:
+        print(
+            f'==> {result.config} <== exit status {result.exit_status},',
+            f'{result.wall_time:.3f}s',
+        )
+        if result.stdout:
+            print(result.stdout, end='' if result.stdout[-1] == '\n' else '\n')
+        if result.error:
+            print(result.error, file=sys.stderr)
+
+    return int(any(result.exit_status for result in results))
+
+
+def sweep_cap(subparsers):
+    """Given a config file, run its program over a grid of parameters."""
+    subcap = subparsers.add_parser(
+        'sweep',
+        help='Run a python program over a grid search of its parameters.',
+        description=' '.join([
+            'Run the python program of the config file once for every',
+            'combination of the values in its `docstr: sweep:` section. Any',
+            'arguments not for docstr are passed to every trial to override',
+            'its config.',
+        ]),
+    )
+
+    subcap.add_argument(
+        'config',
+        help=' '.join([
+            'The config file of the python program whose parameters are',
+            "searched over. Must be given before the program's arguments.",
+        ]),
+    )
+
+    subcap.add_argument(
+        '-j',
+        '--docstr.jobs',
+        type=int,
+        default=None,
+        help=' '.join([
+            'The number of worker processes that run the trials. Defaults to',
+            'as many processes as there are CPUs.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.start',
+        type=int,
+        default=0,
+        help=' '.join([
+            'The trial index to resume the sweep from, skipping the trials',
+            'before it.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.shard',
+        type=int,
+        nargs=2,
+        default=(0, 1),
+        metavar=('I', 'N'),
+        help=' '.join([
+            'Only run the I-th of N contiguous shards of the trials, e.g. to',
+            'split a sweep across machines.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.budget',
+        default=None,
+        help=' '.join([
+            "The dotted name of the program's int or float argument that is",
+            'its budget, e.g. epochs. When given, the trials are searched by',
+            'successive halving rather than a grid search, where the best',
+            "trials are promoted to larger budgets based on the program's",
+            'returned metric.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.min_budget',
+        type=float,
+        default=1,
+        help='The budget of every trial on the first rung.',
+    )
+
+    subcap.add_argument(
+        '--docstr.max_budget',
+        type=float,
+        default=None,
+        help=' '.join([
+            'The largest budget a trial is run with. Defaults to the',
+            'min budget times eta squared.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.eta',
+        type=int,
+        default=3,
+        help=' '.join([
+            'The factor the budget grows by, and the number of trials shrinks',
+            'by, from one rung to the next.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.num_trials',
+        type=int,
+        default=None,
+        help=' '.join([
+            'The number of trials randomly sampled from the space for',
+            'successive halving. Defaults to every trial in the space.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.hyperband',
+        action='store_true',
+        help='Search by the brackets of successive halving of Hyperband.',
+    )
+
+    subcap.add_argument(
+        '--docstr.mode',
+        choices=['min', 'max'],
+        default='min',
+        help=' '.join([
+            "Whether the program's returned metric is minimized or",
+            'maximized.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.seed',
+        type=int,
+        default=None,
+        help='The seed of the random sampling of trials from the space.',
+    )
+
+    subcap.add_argument(
+        '--docstr.no_dedup',
+        action='store_true',
+        help=' '.join([
+            'Run every trial, rather than skipping the trials whose resolved',
+            "configs, after applying defaults and normalizing the values'",
+            "types, are identical to an earlier trial's.",
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.queue',
+        default=None,
+        help=' '.join([
+            'The directory of a work queue the trials are written into rather',
+            'than run, to be run by `docstr worker` on every node sharing the',
+            'directory.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.results',
+        default=None,
+        help=' '.join([
+            'The JSON lines file the record of every trial is appended to.',
+            'Trials that already succeeded in this file are skipped, so',
+            'rerunning an interrupted sweep resumes it. With',
+            '`--docstr.queue`, they are not submitted.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.fsync_interval',
+        type=float,
+        default=1.0,
+        help=' '.join([
+            'The seconds between writing the buffered trial records to the',
+            'results file.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.cache_dir',
+        default=None,
+        env_var='DOCSTR_CACHE_DIR',
+        help=' '.join([
+            'The directory of the docstr launch cache of parsed configs,',
+            'tokens, and parsers. The cache is not used when not given.',
+        ]),
+    )
+
+    subcap.set_defaults(docstr_command=sweep_command)
+
+
+def sweep_command(args, prog_args):
+    """Runs the `docstr sweep` subcommand given its parsed arguments.
+
+    Returns
+    -------
+    int
+        1 if any trial exited with a non-zero exit status, otherwise 0.
+    """
+    # Import here, as the params module depends on this module.
+    from docstr.params import get_best, iterate_sweep, run_successive_halving
+
+    if args.docstr.queue is not None:
+        from docstr.workqueue import submit_sweep
+
+        count = submit_sweep(
+            args.config,
+            args.docstr.queue,
+            prog_args=prog_args,
+            cache_dir=args.docstr.cache_dir,
+            start=args.docstr.start,
+            shard=args.docstr.shard[0],
+            num_shards=args.docstr.shard[1],
+            results=args.docstr.results,
+        )
+        print(f'Submitted {count} trials to {args.docstr.queue}')
+        return 0
+
+    if args.docstr.budget is None:
+        runs = iterate_sweep(
+            args.config,
+            prog_args=prog_args,
+            jobs=args.docstr.jobs,
+            cache_dir=args.docstr.cache_dir,
+            start=args.docstr.start,
+            shard=args.docstr.shard[0],
+            num_shards=args.docstr.shard[1],
+            results=args.docstr.results,
+            fsync_interval=args.docstr.fsync_interval,
+            dedup=not args.docstr.no_dedup,
+        )
+    else:
+        max_budget = args.docstr.max_budget
+        if max_budget is None:
+            max_budget = args.docstr.min_budget * args.docstr.eta ** 2
+        runs = run_successive_halving(
+            args.config,
+            args.docstr.budget,
+            args.docstr.min_budget,
+            max_budget,
+            eta=args.docstr.eta,
+            num_trials=args.docstr.num_trials,
+            hyperband=args.docstr.hyperband,
+            mode=args.docstr.mode,
+            seed=args.docstr.seed,
+            prog_args=prog_args,
+            jobs=args.docstr.jobs,
+            cache_dir=args.docstr.cache_dir,
+        )
+
+    failed = False
+    for trial, result in runs:
+        failed = failed or result.exit_status != 0
+        print(
+            f'==> trial {trial.index} {trial.args} <== exit status',
+            f'{result.exit_status}, {result.wall_time:.3f}s,',
+            f'returned {result.returned!r}',
+        )
+        if result.stdout:
+            print(result.stdout, end='' if result.stdout[-1] == '\n' else '\n')
+        if result.error:
+            print(result.error, file=sys.stderr)
+
+    if args.docstr.budget is not None and runs:
+        trial, result = get_best(runs, args.docstr.mode, args.docstr.budget)
+        print(
+            f'==> best trial {trial.index} {trial.args} <== returned',
+            f'{result.returned!r}',
+        )
+
+    return int(failed)
+
+
+def worker_cap(subparsers):
+    """Given a work queue directory, run its trials until none are pending."""
+    subcap = subparsers.add_parser(
+        'worker',
+        help='Run the trials of a work queue until none are pending.',
+        description=' '.join([
+            'Claim and run the trials of the work queue written by',
+            '`docstr sweep --docstr.queue`, until none are pending. The',
+            "program's parsed tokens and imported modules are kept warm for",
+            'every trial. Run one or more workers on every node sharing the',
+            'queue directory.',
+        ]),
+    )
+
+    subcap.add_argument('queue_dir', help='The directory of the work queue.')
+
+    subcap.add_argument(
+        '--docstr.requeue',
+        action='store_true',
+        help=' '.join([
+            'Return the claimed trials that are not done to pending before',
+            'running, e.g. after workers died. Only use when no other worker',
+            'is running.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.cache_dir',
+        default=None,
+        env_var='DOCSTR_CACHE_DIR',
+        help=' '.join([
+            'The directory of the docstr launch cache of parsed configs,',
+            'tokens, and parsers. The cache is not used when not given.',
+        ]),
+    )
+
+    subcap.set_defaults(docstr_command=worker_command)
+
+
+def worker_command(args, prog_args):
+    """Runs the `docstr worker` subcommand given its parsed arguments.
+
+    Returns
+    -------
+    int
+        0 once no trials are pending.
+    """
+    # Import here, as the workqueue module depends on this module.
+    from docstr.workqueue import WorkQueue, run_worker
+
+    if prog_args:
+        raise ValueError(
+            f'Unexpected arguments to `docstr worker`: {prog_args}. The '
+            "program's arguments are given when the trials are submitted."
+        )
+    if args.docstr.requeue:
+        WorkQueue(args.queue_dir).requeue()
+
+    count = run_worker(args.queue_dir, args.docstr.cache_dir)
+    print(f'Ran {count} trials from {args.queue_dir}')
+    return 0
+
+
+def serve_cap(subparsers):
+    """Serve the docstr daemon that runs programs given by its clients."""
+    subcap = subparsers.add_parser(
+        'serve',
+        help='Serve a warm docstr daemon for `docstr run --docstr.via_daemon`',
+        description=' '.join([
+            'Serve a daemon over a Unix socket that keeps docstr, the',
+            "programs' modules, and their parsed docstrings loaded, and forks",
+            'a worker per `docstr run --docstr.via_daemon` request that runs',
+            'the program and streams its output back. A program is loaded',
+            'again once its config or any of its modules change.',
+        ]),
     )
 
-    # TODO I dislike the required -c and --docstr.config instead of positional,
-    #   but this seems necessary with ConfigArgParse as it is seems to work.
-    subcap.add_argument(
-        '-c',
-        '--docstr.config',
-        required=True,
-        #'config',
-        is_config_file=True,
-        help='The config file of the python program to be run using docstr.',
-    )
-
-    subcap.add_argument(
-        '-s',
-        '--docstr.style',
-        required=True,
-        help=' '.join([
-            'The default docstring style used in the project to be parsed by',
-            'docstr.',
-        ]),
-        #dest='',
-    )
-
-    subcap.add_argument(
-        '-m',
-        '--docstr.main',
-        required=True,
-        help=' '.join([
-            "The python object's name that serves as the main function to",
-            'run the python program. This may be a fully qualified name,',
-            'which means it is the full module path appeneded with a period',
-            'and the qualified name of the object that is the main function.',
-            'If the python namespace for docstr is defined, then the aliases',
-            'used for the main function may be used. See `from import` and',
-            '`import as` commands.',
-        ]),
-        #dest='docstr.main',
-    )
-
-    import_alias_help = ' '.join([
-        '**import as**: To alias an object imported from a module,',
-        'The "import" entry consists of a dictionary mapping of the actual',
-        'object imported to its alias to use in parsing the configuration of',
-        'python program, e.g., `import object as obj` is:',
-        '\n```',
-        '\timport:',
-        '\t\tobject: obj',
-        '\n```',
-    ])
-
-    subcap.add_argument(
-        '--docstr.from_import',
-        required=False,
-        type=dict,
-        #dest='docstr.from_import',
-        help=' '.join([
-            "To specify the equivalent of python's",
-            '`from module import object` a dictionary mapping mapped to by',
-            '`from import` or `from-import` to a dictionary of module names',
-            'that map to a list of objects to be imported from those modules.',
-            'For example, for the following python from import snippet:',
-            '\n```\n',
-            'from module_root.module_child import (',
-            '\n\tobject_1',
-            '\n\tobject_2',
-            '\n)',
-            '\n```\n',
-            'The equivalent is the following yaml:',
-            '\n```\n',
-            'from import:',
-            '\n\tmodule_root.module_child:',
-            '\n\t\t- object_1',
-            '\n\t\t- object_2',
-            '\n```\n',
-            f'\n{import_alias_help}',
-            '\n\nUnlike typical python import syntax, the `from-import`',
-            'argument supports the same use of `as` for aliasing imported',
-            'objects, as in `import object as obj`. The following are',
-            'result in an equivalent namespace created. In python:',
-            '\n```\n',
-            'from module_root.module_child import (',
-            '\n\tobject_1',
-            '\n\tobject_2',
-            '\n)',
-            '\nfrom module_root.module_child import object_3 as obj3',
-            '\n```\n',
-            'The equivalent is the following yaml:',
-            '\n```\n',
-            'from import:',
-            '\n\tmodule_root.module_child:',
-            '\n\t\t- object_1',
-            '\n\t\t- object_2',
-            '\n\t\t- object_3: obj3',
-            '\n```\n',
-        ]),
-    )
-
-    # TODO support basic import
-    #subcap.add_argument(
-    #    '--import',
-    #    required=False,
-    #    help=' '.join([
-    #        f'\n{import_alias_help}',
-    #    ]),
-    #)
+    subcap.add_argument(
+        '--docstr.socket',
+        default=None,
+        env_var='DOCSTR_SOCKET',
+        help=' '.join([
+            "The path of the daemon's Unix socket. Defaults to",
+            '`~/.cache/docstr/daemon.sock`.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '--docstr.cache_dir',
+        default=None,
+        env_var='DOCSTR_CACHE_DIR',
+        help=' '.join([
+            'The directory of the docstr launch cache of parsed configs,',
+            'tokens, and parsers. The cache is not used when not given.',
+        ]),
+    )
+
+    subcap.set_defaults(docstr_command=serve_command)
+
+
+def serve_command(args, prog_args):
+    """Runs the `docstr serve` subcommand until interrupted."""
+    if prog_args:
+        raise ValueError(f'Unexpected arguments for docstr serve: {prog_args}')
+
+    # Import here, as the daemon module imports this module.
+    from docstr.daemon import serve
+
+    serve(args.docstr.socket, args.docstr.cache_dir)
+
+
+def check_cap(subparsers):
+    """Given config files, check them against their programs' docstrings."""
+    subcap = subparsers.add_parser(
+        'check',
+        help='Check config files without running their python programs.',
+        description=' '.join([
+            'Check every given config file against its python program by',
+            'flattening it and casting each of its args as the program would',
+            'when run, stopping before any object is initialized. Every error',
+            'of each config is reported. The configs are checked on a process',
+            'pool, where the configs of the same program share its parser.',
+        ]),
+    )
+
+    subcap.add_argument(
+        'configs',
+        nargs='+',
+        help=' '.join([
+            'The config files to be checked. A directory checks all of its',
+            'yaml configs and a glob pattern checks all of its matching',
+            "configs. The configs must be given before the program's",
+            'arguments.',
+        ]),
+    )
+
+    subcap.add_argument(
+        '-j',
+        '--docstr.jobs',
+        type=int,
+        default=None,
+        help=' '.join([
+            'The number of worker processes that check the configs. Defaults',
+            'to as many processes as there are CPUs.',
+        ]),
+    )
 
+    subcap.add_argument(
+        '--docstr.cache_dir',
+        default=None,
+        env_var='DOCSTR_CACHE_DIR',
+        help=' '.join([
+            'The directory of the docstr launch cache of parsed configs,',
+            'tokens, and parsers. The cache is not used when not given.',
+        ]),
+    )
+
+    subcap.set_defaults(docstr_command=check_command)
+
+
+def check_command(args, prog_args):
+    """Runs the `docstr check` subcommand given its parsed arguments.
+
+    Returns
+    -------
+    int
+        1 if any config has errors, otherwise 0.
     """
+    # Import here, as the check module depends on this module.
+    from docstr.cli.check import check_configs
+
+    count = 0
+    failed = 0
+    for result in check_configs(
+        expand_config_paths(args.configs),
+        prog_args,
+        jobs=args.docstr.jobs,
+        cache_dir=args.docstr.cache_dir,
+    ):
+        count += 1
+        if result.errors:
+            failed += 1
+            print(f'==> {result.config} <== {len(result.errors)} errors')
+            for error in result.errors:
+                print(f'    {error}')
+
+    print(f'Checked {count} configs, {failed} with errors')
+    return int(failed > 0)
+
+
+def complete_cap(subparsers):
+    """Given a config file, complete its program's arguments."""
+    subcap = subparsers.add_parser(
+        'complete',
+        help="Complete a config's program arguments for shell completion.",
+        description=' '.join([
+            "Print the completions of the config's program arguments, one",
+            'per line, from the completion index written when the config is',
+            'run with the launch cache, without importing the program. See',
+            '`docstr.completion` for enabling it in bash.',
+        ]),
+    )
+
     subcap.add_argument(
-        'prog_args',
-        nargs='?',
-        type=list,
-        help='The remaining arguments to be used by the python program.',
+        'config',
+        help=' '.join([
+            'The config file of the program, followed by `--` and the',
+            "program's arguments up to and including the word being",
+            'completed.',
+        ]),
     )
-    #"""
 
-    # TODO map a function call to parse_config() when run subcmd used.
+    subcap.add_argument(
+        '--docstr.describe',
+        action='store_true',
+        help='Follow each option by a tab and its type and help.',
+    )
+
+    subcap.add_argument(
+        '--docstr.cache_dir',
+        default=None,
+        env_var='DOCSTR_CACHE_DIR',
+        help=' '.join([
+            'The directory of the docstr launch cache. Defaults to',
+            '`~/.cache/docstr`.',
+        ]),
+    )
+
+    subcap.set_defaults(docstr_command=complete_command)
+
+
+def complete_command(args, prog_args):
+    """Runs the `docstr complete` subcommand given its parsed arguments.
+
+    Returns
+    -------
+    int
+        0, as no completions is not an error.
+    """
+    from docstr.completion import complete, load_index
+
+    if prog_args[:1] == ['--']:
+        prog_args = prog_args[1:]
+
+    index = load_index(args.config, args.docstr.cache_dir)
+    if index is not None:
+        for completion in complete(index, prog_args, args.docstr.describe):
+            print(completion)
+    return 0
+
+
+def expand_config_paths(paths):
+    """Expands the given config paths, directories, and glob patterns.
+
+    Args
+    ----
+    paths : [str]
+        Paths to config files, directories of yaml config files, or glob
+        patterns of config files.
+
+    Returns
+    -------
+    [str]
+        The config file paths in the given order, where each directory and
+        glob pattern is expanded in sorted order.
+    """
+    configs = []
+    for path in paths:
+        if os.path.isdir(path):
+            configs += sorted(glob(os.path.join(path, '*.yaml')))
+        elif any(char in path for char in '*?['):
+            configs += sorted(glob(path))
+        else:
+            configs.append(path)
+
+    if not configs:
+        raise FileNotFoundError(f'No config files found given: {paths}')
+    return configs
 
 
 # TODO Parse ConfigArgParse subparser
@@ -169,20 +782,56 @@ def unknown_tag(loader, suffix, node):
     return data
 
 
-def prototype_hack_reformat_yaml_dict_unnested_cap(config_path):
+# libyaml's C loader, if installed, parses configs much faster.
+class _DocstrLoader(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):
+    """The yaml loader of docstr configs, whose tags are added to it rather
+    than to PyYAML's loaders shared by every other yaml user.
+    """
+
+
+add_includes(_DocstrLoader)
+_DocstrLoader.add_multi_constructor('!', unknown_tag)
+
+
+def prototype_hack_reformat_yaml_dict_unnested_cap(config_path, lazy=False):
+    """Reformats the yaml config into the docstr config and the program's
+    flat dict of dotted args.
+
+    Args
+    ----
+    config_path : str
+        The path to the yaml config of the python program.
+    lazy : bool = False
+        If True, the program's section of the config is composed but not
+        constructed, and is kept as the LazyMapping `config` of the program's
+        namespace, whose `args` are None until `flatten_config()` flattens
+        the args of the program's tokens.
+
+    Returns
+    -------
+    NestedNamespace
+    """
     with open(config_path, 'r') as openf:
-        loader = yaml.SafeLoader
+        loader = _DocstrLoader
         #loader.add_constructor(None, lambda x, y: x.construct_mapping(y, True))
-        loader.add_multi_constructor('!', unknown_tag)
         #loader.add_multi_constructor(
         #    '',
         #    lambda loader, tag_suffix, node: tag_suffix + ' ' + node.value,
         #)
-        config = yaml.load(openf, Loader=loader)
+        with track_includes(config_path) as includes:
+            if lazy:
+                config = load_lazy(openf, loader)
+            else:
+                config = yaml.load(openf, Loader=loader)
 
     # TODO parse docstr config & namespace things from docstr part of yaml
     docstr_parsed = {}
-    docstr_config = config.pop('docstr') # Crashes if no docstr key
+    docstr_config = config['docstr'] # Crashes if no docstr key
+    if isinstance(docstr_config, LazyMapping):
+        docstr_config = docstr_config.to_dict()
+    else:
+        # Included configs are shared, so only pop items from copies of dicts.
+        docstr_config = dict(docstr_config)
     #reformatted_key = f"docstr.{key.replace(' ', '_')}"
 
     cap_namespace = NestedNamespace()
@@ -190,6 +839,7 @@ def prototype_hack_reformat_yaml_dict_unnested_cap(config_path):
     cap_namespace.docstr.style = docstr_config.pop('style', 'numpy')
     cap_namespace.docstr.main = docstr_config.pop('main', None)
     cap_namespace.docstr.configs = docstr_config.pop('configs', None)
+    cap_namespace.docstr.sweep = docstr_config.pop('sweep', None)
 
     if len(docstr_config) > 1:
         raise ValueError(
@@ -202,182 +852,333 @@ def prototype_hack_reformat_yaml_dict_unnested_cap(config_path):
         raise ValueError(f'Unexpected key in docstr config: {key}')
     del key
 
-    # Handle namespace things given `from_import`
-    namespace = {}
-    for module, objs in from_import.items():
-        imported_module = import_module(module)
-        if isinstance(objs, str):
-            namespace[objs] = attrgetter(objs)(imported_module)
-        elif isinstance(objs, list):
-            for obj in objs: # NOTE does not support `from import as`
-                namespace[obj] = attrgetter(obj)(imported_module)
-        else:
-            raise TypeError(
-                f'Unexpected module mapped value type: {type(objs)}'
-            )
-
-    # Given the namespace in the config (or not), reformat the config dict into
-    # expected nested format.
-    config_reformatted = {}
+    # Handle namespace things given `from_import`, importing on first use.
+    namespace = LazyImports(from_import)
 
-    # Depth first loop that walks the remaining "tree" config.
-    first_item = config.popitem()
-    item_stack = [first_item[1]]
+    # Given the namespace in the config (or not), reformat each program's
+    # section of the config into the flat dict of its dotted args.
+    sections = [key for key in config if key != 'docstr']
+    prog_names = []
+    for prog_name in sections:
+        prog_config = config[prog_name]
+        if prog_name != sections[-1] and not is_program(
+            prog_name,
+            prog_config,
+            namespace,
+        ):
+            # Sections before the last that are not programs are only data,
+            # e.g. the targets of yaml anchors.
+            continue
+        prog_names.append(prog_name)
 
-    # Need to keep track of accepted parents as prefix.
-    if first_item[0] in namespace:
-        stack_prefix = ''
-        entry_obj = first_item[0]
-    else:
-        stack_prefix = first_item[0]
-        if len(first_item[1]) == 1:
-            entry_obj = list(first_item[1].keys())[0]
+        prog_namespace = NestedNamespace()
+        prog_namespace.entry_obj = namespace[
+            get_entry_name(prog_name, prog_config, namespace)
+        ]
+        if lazy:
+            prog_namespace.config = prog_config
+            prog_namespace.args = None
         else:
-            raise NotImplementedError('Naming the prog with more than one key')
-    cap_namespace.docstr.prog_name = first_item[0]
-    setattr(cap_namespace, first_item[0], NestedNamespace())
-
-    # TODO There is some silent and not always occurring bug where 2
-    # rpartitions of the stack_prefix occurs.
-    #   Seems to be when removing keys that are named values in namespace, it
-    #   does not go through all their values as part of that object if there
-    #   were others to go through.
-    # We could know when NOT to decrement stack_prefix, and that is if the
-    # current empty dict is for a dict with only one key to a configurable
-    # object,
-    # TODO the unit tests need to include this kind of hierarchical test cases
-
-    # This is a hot fix to store if it is a configurable object or a named arg.
-    hierarchical_config = [True]
-
-    while item_stack:
-        if isinstance(item_stack[-1], dict):
-            if item_stack[-1]:
-                # is non-leaf w/ children
-                next_item = item_stack[-1].popitem()
-                if next_item[0] not in namespace:
-                    if stack_prefix:
-                        stack_prefix += f'.{next_item[0]}'
-                    else:
-                        stack_prefix = next_item[0]
-                    hierarchical_config.append(True)
-                else:
-                    hierarchical_config.append(False)
-                item_stack.append(next_item[1])
-            else:
-                # the non-leaf is empty, time to pop
-                #print('')
-                #print(stack_prefix)
-                #for item_ya in item_stack:
-                #    print(item_ya)
-                item_stack.pop()
-                if hierarchical_config.pop():
-                    stack_prefix = stack_prefix.rpartition('.')[0]
-        else: # item is a leaf
-            config_reformatted[stack_prefix] = item_stack.pop()
-            if hierarchical_config.pop():
-                stack_prefix = stack_prefix.rpartition('.')[0]
+            prog_namespace.args = flatten_config(prog_config, namespace)
+        setattr(cap_namespace, prog_name, prog_namespace)
 
+    # The last program in the config is the one that is run.
+    cap_namespace.docstr.prog_names = prog_names
+    cap_namespace.docstr.prog_name = prog_names[-1]
+    cap_namespace.docstr.includes = includes
     cap_namespace.docstr.namespace = namespace
-    cap_namespace.docstr.entry_obj = namespace[entry_obj]
-    cap_namespace.docstr.whitelist = {
-        get_full_qual_name(n) for n in namespace.values()
-    }
-    getattr(cap_namespace, first_item[0]).args = config_reformatted
+    cap_namespace.docstr.entry_obj = getattr(
+        cap_namespace,
+        prog_names[-1],
+    ).entry_obj
+    cap_namespace.docstr.whitelist = LazyWhitelist(namespace)
 
     return cap_namespace
 
 
-def docstr_cap(config=None, known_args=False, return_prog=False):
-    """The docstr main ConfigArgParser."""
-    if config is None:
-        from sys import argv as sys_argv
-        config = sys_argv[1]
+def get_entry_name(prog_name, prog_config, namespace):
+    """Returns the name of the entry object of a program's config section.
 
-        if len(sys_argv) > 2 :
-            prog_args = sys_argv[2:]
-        else:
-            prog_args = []
-    else:
-        prog_args = None
+    Args
+    ----
+    prog_name : str
+        The top level key of the program's section of the config.
+    prog_config : Mapping
+        The program's section of the config.
+    namespace : dict
+        The names of the configurable objects from `from import`.
 
-    # NOTE Does note need to be a sys_argv, can be a str positional in CAP.
-    ext = os.path.splitext(config)[-1]
-    if ext != '.yaml':
-        raise NotImplementedError('Currently only yaml configs are supported.')
+    Returns
+    -------
+    str
+        The program's name if it is a configurable object, otherwise the only
+        key of its section, or the only key that is a configurable object.
+    """
+    if prog_name in namespace:
+        return prog_name
+    if len(prog_config) == 1:
+        return next(iter(prog_config))
+    entries = [key for key in prog_config if key in namespace]
+    if len(entries) != 1:
+        raise ValueError(' '.join([
+            f'The program `{prog_name}` must contain exactly one configurable',
+            f'object from `from import` as its entry object, not: {entries}',
+        ]))
+    return entries[0]
 
-    # Parse the yaml config into the format for docstr prototype w/ CAP
-    cap_namespace = prototype_hack_reformat_yaml_dict_unnested_cap(config)
 
-    #root_cap = cap.ArgumentParser(
-    #    prog='docstr',
-    #    description='Python docstring parsing for write once design.',
-    #    config_file_parser_class=cap.YAMLConfigFileParser,
-    #    # TODO want to be able to support any config file format CAP supports.
-    #    default_config_files=['~/.docstr/docstr_defaults'],
-    #)
+def is_program(prog_name, prog_config, namespace):
+    """Returns True if the config section has an entry object to be run."""
+    if prog_name in namespace:
+        return True
+    if not isinstance(prog_config, Mapping):
+        return False
+    try:
+        return get_entry_name(prog_name, prog_config, namespace) in namespace
+    except ValueError:
+        return False
 
-    # TODO Implement docstr CAP (arg group), after prototype
 
-    # TODO Pass the rest of the args via sys_arv to the docstr CAP.
+# Marks the end of the keys of a config's section when flattening it.
+_NO_KEY = object()
 
 
-    # TODO implement any necessary subcommands, after prototype hack
-    #subcaps = root_cap.add_subparsers(help='subcommand help',)
-    #run_cap(subcaps)
-    #parse_cap(subcaps)
-    #compile_cap(subcaps)
+def flatten_config(config, namespace, prefix='', dests=None):
+    """Flattens a program's config into its dotted args in one ordered pass
+    without modifying the config.
 
-    # TODO pass the docstr cap to the parse_config() or parse()
-    #   We want docstr cap to handle config path, given file stream, & dict.
-    #parse_config(*root_cap.parse_known_args(namespace=NestedNamespace()))
-    tokens = parse_config(
-        cap_namespace.docstr,
-        getattr(cap_namespace, cap_namespace.docstr.prog_name),
-    )
+    Keys that are configurable objects in the namespace name the type of
+    their section and are not part of the dotted names, e.g. the config
+    `{'model': {'Model': {'lr': 0.1}}}` flattens to `{'model.lr': 0.1}`.
+    Lists are values, including lists of component configs, e.g.
+    `layers: [{Linear: {...}}, ...]`, as the parser has no args of their
+    items. Empty mappings have no args.
+
+    Args
+    ----
+    config : Mapping
+        The program's section of the config, e.g. a dict or LazyMapping.
+    namespace : dict
+        The names of the configurable objects from `from import`.
+    prefix : str = ''
+        The dotted name of the config within the program's args.
+    dests : set(str) = None
+        If given, only these dotted args are flattened, e.g. the dests of the
+        program's parser, and the other sections of a LazyMapping are left
+        unconstructed.
+
+    Returns
+    -------
+    dict
+        The dotted arg names to their values in the order of the config.
+    """
+    groups = set()
+    if dests is not None:
+        for dest in dests:
+            while '.' in dest:
+                dest = dest.rpartition('.')[0]
+                groups.add(dest)
+
+    args = {}
+    stack = [(prefix, config, iter(config))]
+    while stack:
+        prefix, container, keys = stack[-1]
+        key = next(keys, _NO_KEY)
+        if key is _NO_KEY:
+            stack.pop()
+            continue
+
+        is_type = False
+        if isinstance(container, list):
+            name = f'{prefix}.{key}' if prefix else str(key)
+        elif key in namespace:
+            name = prefix
+            is_type = True
+            # Resolves the configurable object, as the config refers to it.
+            namespace[key]
+        elif prefix:
+            name = f'{prefix}.{key}'
+        else:
+            name = key
 
+        is_group = dests is None or is_type or name in groups
+        if not is_group and name not in dests:
+            # Not an arg, so a LazyMapping leaves the value unconstructed.
+            continue
+
+        value = container[key]
+        if isinstance(value, Mapping) and is_group:
+            stack.append((name, value, iter(value)))
+        elif dests is None or name in dests:
+            if isinstance(value, LazyMapping):
+                value = value.to_dict()
+            args[name] = value
+    return args
+
+
+def get_config_file_parser(configs=None):
+    """Returns the config file parser for the program given the docstr configs.
+
+    Args
+    ----
+    configs : dict = None
+        The default mappings under `docstr: configs:` to be applied through
+        the `!docstr.configs:<key>` yaml tags.
+
+    Returns
+    -------
+    str | functools.partial
+        'yaml' if there are no configs, otherwise the partial of
+        YAMLConfigFileParserCustomLoader with the tagged SafeLoader.
+    """
     # Create docstr yaml SafeLoader with yaml tags for mapping defaults.
-    if cap_namespace.docstr.configs:
-        loader = add_default_mappings(
-            yaml.SafeLoader,
-            cap_namespace.docstr.configs,
-        )
-        loader = partial(YAMLConfigFileParserCustomLoader, loader=loader)
-    else:
-        loader = 'yaml'
+    if configs:
+        loader = add_default_mappings(yaml.SafeLoader, configs)
+        return partial(YAMLConfigFileParserCustomLoader, loader=loader)
+    return 'yaml'
 
 
-    # TODO parsing of docstrings finished, get the CAP form those tokens
-    prog_cap = get_configargparser(tokens, config_file_parser=loader)
+def set_lazy_config_args(config, cap_namespace, prog_parser):
+    """Sets the program's args of a lazily composed config, if not yet set,
+    by only constructing the sections of the config that are program args.
 
-    # TODO run the program with the parsed tokens and aligned CAP values
-    #getattr(**prog_cap.parse_args(args.prog_args), docstr_args.main)()
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    cap_namespace : NestedNamespace
+        The output of `prototype_hack_reformat_yaml_dict_unnested_cap()`.
+    prog_parser : docstr.configargparse.ProgramParser
+        The parser of the config's program.
+
+    Returns
+    -------
+    dict
+        The flat dict of the program's dotted argument names to values.
+    """
+    prog_namespace = getattr(cap_namespace, cap_namespace.docstr.prog_name)
+    if prog_namespace.args is None:
+        with track_includes(config) as includes:
+            prog_namespace.args = flatten_config(
+                prog_namespace.config,
+                cap_namespace.docstr.namespace,
+                dests=set(prog_parser.binder.args),
+            )
+        cap_namespace.docstr.includes.update(includes)
+    return prog_namespace.args
+
+
+def load_program(config, cache_dir=None, cap_namespace=None, lazy=False):
+    """Loads the docstr program of the given config, parsing as necessary.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    cache_dir : str = None
+        The directory of the docstr launch cache. When given, the parsed
+        config, tokens, and parser are loaded from the cache if the config and
+        its modules are unchanged, and saved to it otherwise.
+    cap_namespace : NestedNamespace = None
+        The config already reformatted by
+        `prototype_hack_reformat_yaml_dict_unnested_cap()`, if any, to avoid
+        reading the config again when it is not cached.
+    lazy : bool = False
+        If True, only the sections of the config that are args of the
+        program's tokens are constructed, while the rest of the program's
+        section is constructed on first access of its LazyMapping `config`.
+
+    Returns
+    -------
+    (NestedNamespace, docstr.configargparse.ProgramParser)
+        The reformatted config namespace from
+        `prototype_hack_reformat_yaml_dict_unnested_cap()` and the program's
+        parser with the config's args as its config.
+    """
+    if cache_dir is None:
+        launch_cache = None
+        cache_entry = None
+    else:
+        launch_cache = LaunchCache(cache_dir)
+        cache_entry = launch_cache.load(config)
+
+    if cache_entry is None:
+        # Parse the yaml config into the format for docstr prototype w/ CAP
+        if cap_namespace is None:
+            cap_namespace = prototype_hack_reformat_yaml_dict_unnested_cap(
+                config,
+                lazy,
+            )
 
-    if known_args:
-        args = prog_cap.parse_known_args(
-            args=prog_args,
-            namespace=NestedNamespace(),
-            config_file_contents=yaml.dump(
-                getattr(cap_namespace, cap_namespace.docstr.prog_name).args
+        # TODO pass the docstr cap to the parse_config() or parse()
+        #   Want docstr cap to handle config path, given file stream, & dict.
+        tokens = parse_config(
+            cap_namespace.docstr,
+            getattr(cap_namespace, cap_namespace.docstr.prog_name),
+        )
+
+        # TODO parsing of docstrings finished, get the CAP form those tokens
+        # The parser is only built once used, e.g. given command line args.
+        prog_parser = ProgramParser(
+            tokens,
+            config_file_parser=get_config_file_parser(
+                cap_namespace.docstr.configs
             ),
-        )[0]
+        )
+
+        set_lazy_config_args(config, cap_namespace, prog_parser)
+
+        if launch_cache is not None:
+            launch_cache.save(
+                config,
+                cap_namespace,
+                tokens,
+                prog_parser.parser,
+            )
     else:
-        args = prog_cap.parse_args(
-            args=prog_args,
-            namespace=NestedNamespace(),
-            config_file_contents=yaml.dump(
-                getattr(cap_namespace, cap_namespace.docstr.prog_name).args
+        # Repeat launch: skip the config, docstring, and parser generation.
+        cap_namespace = cache_entry.cap_namespace
+        prog_parser = ProgramParser(
+            cache_entry.tokens,
+            config_file_parser=get_config_file_parser(
+                cap_namespace.docstr.configs
             ),
+            parser_spec=cache_entry.parser_spec,
         )
-    #setattr(cap_namespace, cap_namespace.docstr.prog_name, args)
 
-    prog_ready = init_prog(args)
+    unused = cap_namespace.docstr.namespace.unused()
+    if unused:
+        logging.info(
+            'Unused `from import` objects of `%s`, which were not imported: '
+            '%s',
+            config,
+            ', '.join(unused),
+        )
 
-    if return_prog:
-        return prog_ready
+    prog_parser.config = getattr(
+        cap_namespace,
+        cap_namespace.docstr.prog_name,
+    ).args
+    return cap_namespace, prog_parser
 
+
+def run_main(prog_ready, docstr_args):
+    """Runs the main of the initialized program given the docstr config.
+
+    Args
+    ----
+    prog_ready : object
+        The initialized entry object of the program from `init_prog()`.
+    docstr_args : NestedNamespace
+        The docstr section of the config with the `main` and `entry_obj`.
+
+    Returns
+    -------
+    object
+        The result of the program's main.
+    """
     # Based on cap_namespace.docstr main and entry_obj, run the init prog.
-    if cap_namespace.docstr.main == cap_namespace.docstr.entry_obj.__name__:
+    if docstr_args.main == docstr_args.entry_obj.__name__:
         logging.warning(
             'Entry object was run during init. :/ '
             'This needs fixed after prototype.'
@@ -388,7 +1189,225 @@ def docstr_cap(config=None, known_args=False, return_prog=False):
 
 
     # Is a class with main being a method on it to be called to run
-    return getattr(prog_ready, cap_namespace.docstr.main)()
+    return getattr(prog_ready, docstr_args.main)()
+
+
+def run_config(
+    config,
+    prog_args=None,
+    known_args=False,
+    return_prog=False,
+    cache_dir=None,
+    init_jobs=None,
+    share=False,
+    unshared=None,
+    lazy=False,
+    lazy_config=False,
+):
+    """Runs the python program of the given config using docstr.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program to run.
+    prog_args : [str] = None
+        The arguments for the python program that override its config.
+    known_args : bool = False
+        If True, ignores unknown arguments rather than raising an error.
+    return_prog : bool = False
+        If True, returns the initialized program rather than running it.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+    init_jobs : int = None
+        If given, the number of threads that initialize the program's objects
+        in parallel. See `init_prog()`.
+    share : bool = False
+        If True, identical nested objects are initialized once and shared.
+        See `init_prog()`.
+    unshared : set = None
+        The types, or their fully qualified names, that are never shared.
+    lazy : bool = False
+        If True, nested objects are initialized on their first use. See
+        `init_prog()`.
+    lazy_config : bool = False
+        If True, only the sections of the config that are the program's args
+        are constructed. See `load_program()`.
+
+    Returns
+    -------
+    object
+        The result of the program's main, or the initialized program if
+        `return_prog` is True.
+    """
+    # NOTE Does note need to be a sys_argv, can be a str positional in CAP.
+    ext = os.path.splitext(config)[-1]
+    if ext != '.yaml':
+        raise NotImplementedError('Currently only yaml configs are supported.')
+
+    cap_namespace, prog_parser = load_program(
+        config,
+        cache_dir,
+        lazy=lazy_config,
+    )
+    return run_program(
+        cap_namespace,
+        prog_parser,
+        prog_args,
+        known_args,
+        return_prog,
+        init_jobs,
+        share,
+        unshared,
+        lazy,
+    )
+
+
+def run_program(
+    cap_namespace,
+    prog_parser,
+    prog_args=None,
+    known_args=False,
+    return_prog=False,
+    init_jobs=None,
+    share=False,
+    unshared=None,
+    lazy=False,
+):
+    """Runs the loaded python program given its arguments.
+
+    Args
+    ----
+    cap_namespace : NestedNamespace
+        The reformatted config namespace from `load_program()`.
+    prog_parser : docstr.configargparse.ProgramParser
+        The program's parser from `load_program()`.
+    prog_args : [str] = None
+        The arguments for the python program that override its config.
+    known_args : bool = False
+        If True, ignores unknown arguments rather than raising an error.
+    return_prog : bool = False
+        If True, returns the initialized program rather than running it.
+    init_jobs : int = None
+        If given, the number of threads that initialize the program's objects
+        in parallel. See `init_prog()`.
+    share : bool = False
+        If True, identical nested objects are initialized once and shared.
+    unshared : set = None
+        The types, or their fully qualified names, that are never shared.
+    lazy : bool = False
+        If True, nested objects are initialized on their first use.
+
+    Returns
+    -------
+    object
+        The result of the program's main, or the initialized program if
+        `return_prog` is True.
+    """
+    # TODO run the program with the parsed tokens and aligned CAP values
+    #getattr(**prog_cap.parse_args(args.prog_args), docstr_args.main)()
+
+    args = prog_parser.parse(prog_args, known_args=known_args)
+    #setattr(cap_namespace, cap_namespace.docstr.prog_name, args)
+
+    if init_jobs is None and not (share or lazy):
+        # The program's compiled InitPlan is reused by any later runs.
+        prog_ready = prog_parser.init_prog(args)
+    elif init_jobs is None:
+        prog_ready = init_prog(
+            args,
+            share=share,
+            unshared=unshared,
+            lazy=lazy,
+        )
+    else:
+        with ThreadPoolExecutor(init_jobs) as executor:
+            prog_ready = init_prog(args, executor, share, unshared)
+
+    if return_prog:
+        return prog_ready
+    return run_main(prog_ready, cap_namespace.docstr)
+
+
+# The docstr subcommands to the functions that add their subparsers.
+DOCSTR_COMMANDS = {
+    'run': run_cap,
+    'check': check_cap,
+    'sweep': sweep_cap,
+    'worker': worker_cap,
+    'serve': serve_cap,
+    'complete': complete_cap,
+}
+
+
+def get_docstr_cap():
+    """Returns the docstr ConfigArgParser with all of its subcommands."""
+    root_cap = cap.ArgumentParser(
+        prog='docstr',
+        description='Python docstring parsing for write once design.',
+        # TODO want to be able to support any config file format CAP supports.
+    )
+
+    # TODO Implement docstr CAP (arg group), after prototype
+
+    subcaps = root_cap.add_subparsers(help='subcommand help', dest='command')
+    for add_subcap in DOCSTR_COMMANDS.values():
+        add_subcap(subcaps)
+    #parse_cap(subcaps)
+    #compile_cap(subcaps)
+
+    return root_cap
+
+
+def docstr_cap(
+    config=None,
+    known_args=False,
+    return_prog=False,
+    cache_dir=None,
+):
+    """The docstr main ConfigArgParser.
+
+    Args
+    ----
+    config : str = None
+        The path to the yaml config of the python program to run. Defaults to
+        the command line arguments, which are either a docstr subcommand and
+        its arguments, or the config followed by the program's arguments.
+    known_args : bool = False
+        If True, ignores unknown arguments rather than raising an error.
+    return_prog : bool = False
+        If True, returns the initialized program rather than running it.
+    cache_dir : str = None
+        The directory of the docstr launch cache. When given, the parsed
+        config, tokens, and parser are loaded from the cache if the config and
+        its modules are unchanged, and saved to it otherwise. Defaults to the
+        `DOCSTR_CACHE_DIR` environment variable when run from the command line,
+        where the cache is not used if that is unset.
+    """
+    if config is None:
+        from sys import argv as sys_argv
+
+        if len(sys_argv) > 1 and sys_argv[1] in DOCSTR_COMMANDS:
+            args, prog_args = get_docstr_cap().parse_known_args(
+                sys_argv[1:],
+                namespace=NestedNamespace(),
+            )
+            return args.docstr_command(args, prog_args)
+
+        config = sys_argv[1]
+
+        if len(sys_argv) > 2 :
+            prog_args = sys_argv[2:]
+        else:
+            prog_args = []
+
+        if cache_dir is None:
+            cache_dir = os.environ.get('DOCSTR_CACHE_DIR', None)
+    else:
+        # Same as ConfigArgParse's default of parsing sys.argv when no args.
+        from sys import argv as sys_argv
+        prog_args = sys_argv[1:]
+
+    return run_config(config, prog_args, known_args, return_prog, cache_dir)
 
 
 if __name__ == '__main__':
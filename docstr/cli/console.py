@@ -0,0 +1,33 @@
+"""The `docstr` console script, which dispatches `docstr complete` and single
+runs of `docstr run --docstr.via_daemon` before importing docstr's docstring
+parsing, sphinx, or docutils. This module only imports the standard library at
+the module level.
+"""
+import sys
+
+
+def main():
+    """The entry point of the `docstr` console script.
+
+    Returns
+    -------
+    object
+        The return of `docstr.completion.main()` for `docstr complete`, the
+        exit status of `docstr.daemon.run_via_daemon()` for a single run
+        through the daemon, else the return of `docstr.cli.cli.docstr_cap()`.
+    """
+    if sys.argv[1:2] == ['complete']:
+        from docstr.completion import main as complete_main
+        return complete_main(sys.argv[2:])
+    if sys.argv[1:2] == ['run'] and '--docstr.via_daemon' in sys.argv:
+        from docstr.daemon import get_client_args, run_via_daemon
+        client_args = get_client_args(sys.argv[2:])
+        if client_args is not None:
+            return run_via_daemon(*client_args)
+
+    from docstr.cli.cli import docstr_cap
+    return docstr_cap()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
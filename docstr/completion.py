@@ -0,0 +1,209 @@
+"""Shell completion of a docstr program's arguments from the compact
+completion index written alongside its launch cache entry, such that
+completing `docstr run config.yaml --very_useful_class.a ...` neither imports
+the program nor parses its docstrings.
+
+This module only imports the standard library at the module level, and the
+`docstr` console script, `docstr.cli.console.main()`, dispatches to it before
+importing docstr's docstring parsing, sphinx, or docutils, which take most of
+the half second of `import docstr.cli.cli`. Calling
+`docstr.cli.cli.docstr_cap()` directly still imports them. Enable completion
+in bash with:
+
+    _docstr() {
+        if [[ ${COMP_WORDS[1]} == run && $COMP_CWORD -gt 2 ]]; then
+            COMPREPLY=($(docstr complete "${COMP_WORDS[2]}" -- \\
+                "${COMP_WORDS[@]:3:$((COMP_CWORD - 2))}"))
+        fi
+    }
+    complete -o default -F _docstr docstr
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+
+def get_cache_dir(cache_dir=None):
+    """Returns the launch cache directory, defaulting to the
+    `DOCSTR_CACHE_DIR` environment variable, then `~/.cache/docstr`.
+    """
+    if cache_dir is not None:
+        return cache_dir
+    return os.environ.get('DOCSTR_CACHE_DIR', os.path.join(
+        os.path.expanduser('~'),
+        '.cache',
+        'docstr',
+    ))
+
+
+def get_cache_key(config, config_hash):
+    """Returns the launch cache key of the config, the sha256 hex digest of
+    its absolute path and its content hash, such that identical configs in
+    different directories, whose relative includes differ, have their own
+    entries.
+    """
+    key = f'{os.path.abspath(config)}\0{config_hash}'
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_index_path(cache_dir, cache_key):
+    """Returns the file path of the completion index of the cache key."""
+    return os.path.join(cache_dir, f'{cache_key}.complete.json')
+
+
+def save_index(path, index):
+    """Writes the completion index as compact JSON, replacing any existing
+    one atomically.
+
+    Args
+    ----
+    path : str
+        The file path of the index. See `get_index_path()`.
+    index : dict
+        The program's name, `prog`, and its `args` as the dotted argument
+        names to their `type`, `choices`, `default`, and `help`.
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as openf:
+        json.dump(index, openf, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_index(config, cache_dir=None):
+    """Loads the completion index of the config's current contents.
+
+    Args
+    ----
+    config : str
+        The path to the docstr yaml config of the program.
+    cache_dir : str = None
+        The launch cache directory. See `get_cache_dir()`.
+
+    Returns
+    -------
+    dict | None
+        The completion index, or None if the config has not been run with
+        the launch cache since it last changed.
+    """
+    # The same digest as docstr.cache.hash_file(), without importing it.
+    sha = hashlib.sha256()
+    try:
+        with open(config, 'rb') as openf:
+            for chunk in iter(lambda: openf.read(1 << 16), b''):
+                sha.update(chunk)
+        path = get_index_path(
+            get_cache_dir(cache_dir),
+            get_cache_key(config, sha.hexdigest()),
+        )
+        with open(path, 'r') as openf:
+            return json.load(openf)
+    except (OSError, ValueError):
+        return None
+
+
+def complete(index, words, describe=False):
+    """Returns the completions of the last word given the program's index.
+
+    Args
+    ----
+    index : dict
+        The program's completion index. See `save_index()`.
+    words : [str]
+        The program's arguments up to and including the word being
+        completed, which is the empty str if nothing is typed yet.
+    describe : bool = False
+        If True, each option is followed by a tab and its type and help, as
+        the completion of shells like zsh and fish display.
+
+    Returns
+    -------
+    [str]
+        The options or choices starting with the word being completed.
+    """
+    args = index['args']
+    current = words[-1] if words else ''
+    previous = words[-2] if len(words) > 1 else ''
+
+    if current.startswith('--') and '=' in current:
+        name, _, value = current[2:].partition('=')
+        choices = args.get(name, {}).get('choices') or []
+        return [
+            f'--{name}={choice}' for choice in choices
+            if choice.startswith(value)
+        ]
+
+    if previous.startswith('--') and not current.startswith('-'):
+        name = previous[2:]
+        if name in args:
+            choices = args[name].get('choices') or []
+            return [choice for choice in choices if choice.startswith(current)]
+
+    if current and not current.startswith('-'):
+        return []
+
+    completions = []
+    for name, arg in args.items():
+        option = f'--{name}'
+        if not option.startswith(current):
+            continue
+        if describe:
+            description = f"({arg['type']}) {arg.get('help') or ''}"
+            option = f"{option}\t{' '.join(description.split())}"
+        completions.append(option)
+    return completions
+
+
+def main(argv=None):
+    """The `docstr complete` command, printing a completion per line given
+    the args `config -- [words ...]`, where the words are the program's
+    arguments up to and including the word being completed.
+
+    Returns
+    -------
+    int
+        0, as no completions is not an error.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    # argparse assigns no words before reaching `--`, so split them here.
+    if '--' in argv:
+        split = argv.index('--')
+        argv, words = argv[:split], argv[split + 1:]
+    else:
+        words = []
+
+    parser = argparse.ArgumentParser(
+        prog='docstr complete',
+        usage='%(prog)s [options] config -- [words ...]',
+        description=' '.join([
+            "Complete the program's arguments of the config from its",
+            'completion index, written when the config is run with the',
+            'launch cache.',
+        ]),
+    )
+    parser.add_argument('config', help='The config file of the program.')
+    parser.add_argument(
+        '--docstr.cache_dir',
+        dest='cache_dir',
+        default=None,
+        help=' '.join([
+            'The directory of the docstr launch cache. Defaults to the',
+            '`DOCSTR_CACHE_DIR` environment variable, then',
+            '`~/.cache/docstr`.',
+        ]),
+    )
+    parser.add_argument(
+        '--docstr.describe',
+        dest='describe',
+        action='store_true',
+        help='Follow each option by a tab and its type and help.',
+    )
+    args = parser.parse_args(argv)
+
+    index = load_index(args.config, args.cache_dir)
+    if index is not None:
+        for completion in complete(index, words, args.describe):
+            print(completion)
+    return 0
@@ -1,6 +1,15 @@
 """ConfigArgParse specific extentions or utils for docstr."""
-from collections import OrderedDict
+from collections import ChainMap, OrderedDict
+from collections.abc import ItemsView, KeysView, Mapping, ValuesView
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager, nullcontext
+from copy import copy
+from dataclasses import dataclass
 from functools import partial
+from io import StringIO
+import os
+import sys
+import threading
 import yaml
 
 import configargparse as cap
@@ -11,6 +20,7 @@ from docstr.docstring import (
     Docstring,
     ClassDocstring,
     FuncDocstring,
+    get_full_qual_name,
 )
 # TODO should handle Callable, etcs in parsing the tokens?
 #from docstr.parsing import get_namespace_obj, get_module_object
@@ -36,6 +46,168 @@ from docstr.docstring import (
 # inherently nested.
 
 
+class NestedParsers(object):
+    """The nested argument groups of an ArgumentParser that are only added to
+    it once a parse or its help uses them, such that a program of many
+    optional objects only builds the arguments that a run configures.
+
+    Attributes
+    ----------
+    tokens : ClassDocstring | FuncDocstring
+        The root of the parsed tokens the parser was generated from.
+    pending : OrderedDict({str: callable})
+        The dotted prefixes of the nested groups not yet added to the parser,
+        to the callables that add them, which may add nested groups of their
+        own as pending.
+    complete : bool
+        True once every nested group is added, after which parses no longer
+        count themselves, as the parser no longer changes.
+    lock : threading.Condition
+        Held while adding nested groups, which waits for the parses in
+        progress, as the shallow copies of the parser used by threads share
+        their actions. Parses only hold it to count themselves.
+    parses : int
+        The number of parses in progress, which run at once unless they use a
+        pending nested group.
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pending = OrderedDict()
+        self.complete = True
+        self.lock = threading.Condition(threading.RLock())
+        self.parses = 0
+        self._adding = 0
+        self._local = threading.local()
+        self._binder = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock'], state['_local']
+        state['parses'] = state['_adding'] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Condition(threading.RLock())
+        self._local = threading.local()
+
+    @property
+    def binder(self):
+        """The ConfigBinder of the whole program, whose args are in the order
+        of the parser with every nested group added.
+        """
+        if self._binder is None:
+            self._binder = ConfigBinder.from_tokens(self.tokens)
+        return self._binder
+
+    def add_parser(self, prefix, build):
+        """Adds the nested group of the prefix as pending until it is used.
+
+        Args
+        ----
+        prefix : str
+            The dotted prefix of the nested group's args, e.g. `nested.obj`.
+        build : callable
+            Adds the nested group's args to the parser when called.
+        """
+        self.pending[prefix] = build
+        self.complete = False
+
+    @contextmanager
+    def _adding_groups(self):
+        """Holds the lock once no parse is in progress, and keeps new parses
+        waiting until the nested groups are added.
+        """
+        with self.lock:
+            if getattr(self._local, 'parsing', False):
+                # This thread's own parse, e.g. formatting the usage of its
+                # error, would otherwise wait on itself.
+                self._end_parse()
+            self._adding += 1
+            try:
+                self.lock.wait_for(lambda: not self.parses)
+                yield
+            finally:
+                self._adding -= 1
+                self.complete = not self.pending
+                self.lock.notify_all()
+
+    def _end_parse(self):
+        """Stops counting this thread's parse as in progress."""
+        self._local.parsing = False
+        self.parses -= 1
+        self.lock.notify_all()
+
+    def touches(self, names):
+        """Returns True if any of the dotted argument names are within a
+        pending nested group.
+        """
+        for name in names:
+            parts = name.split('.')
+            for i in range(1, len(parts) + 1):
+                if '.'.join(parts[:i]) in self.pending:
+                    return True
+        return False
+
+    def register(self, prefix):
+        """Adds the pending nested group of the prefix to the parser."""
+        with self.lock:
+            if prefix not in self.pending:
+                return
+            with self._adding_groups():
+                build = self.pending.pop(prefix, None)
+                if build is not None:
+                    build()
+
+    def register_touched(self, names):
+        """Adds every pending nested group that any of the dotted argument
+        names are within, including the nested groups within those.
+        """
+        names = [name.split('.') for name in names]
+        with self.lock:
+            registered = True
+            while registered and self.pending:
+                registered = False
+                for parts in names:
+                    for i in range(1, len(parts) + 1):
+                        prefix = '.'.join(parts[:i])
+                        if prefix in self.pending:
+                            self.register(prefix)
+                            registered = True
+
+    def register_all(self):
+        """Adds every pending nested group to the parser."""
+        with self.lock:
+            while self.pending:
+                self.register(next(iter(self.pending)))
+
+    @contextmanager
+    def parsing(self, names=None):
+        """Adds the pending nested groups that any of the dotted argument
+        names are within, or every one if no names are given, then counts
+        the parse as in progress until the context exits.
+
+        Args
+        ----
+        names : [str] = None
+            The dotted argument names used by the parse.
+        """
+        with self.lock:
+            if names is None:
+                self.register_all()
+            elif self.touches(names):
+                self.register_touched(names)
+            self.lock.wait_for(lambda: not self._adding)
+            self.parses += 1
+            self._local.parsing = True
+        try:
+            yield
+        finally:
+            with self.lock:
+                if getattr(self._local, 'parsing', False):
+                    self._end_parse()
+
+
 class ArgumentParser(cap.ArgumentParser):
     """An extention to the [config]argparser.ArgumentParser to support nesting
     ArgumentParsers.
@@ -43,8 +215,8 @@ class ArgumentParser(cap.ArgumentParser):
     Attributes
     ----------
     see cap.ArgumentParser
-    nested_parsers :
-        Nested parsers are subparsers that ...
+    nested_parsers : NestedParsers = None
+        The nested argument groups of the parser that are added once used.
 
     Notes
     -----
@@ -56,65 +228,147 @@ class ArgumentParser(cap.ArgumentParser):
         self._nested_parsers = None
         super().__init__(*args, **kwargs)
 
-    #def add_nested_group(self, title, object_name, description):
+    @property
+    def nested_parsers(self):
+        return self._nested_parsers
 
-    def add_nested_parsers(self, **kwargs):
-        """ Cannot be too similar to add subparsers due to needing NOT mutual
-        exculsivity.
+    def add_nested_parsers(self, tokens):
+        """Adds the nested parsers of this parser, whose argument groups are
+        registered only when a parse's args or config file contents are
+        within their prefix, or when the help is formatted.
 
-        This method functions similarly to `add_subparsers()`, except that any
-        required argmuments within the nested parsers are also required by the
-        parent parser. This allows the nested parsers to operate as a subparser
-        does, independently of the parent, as well as extend the parent parser
-        to group required arguments as add_argument_group does. The nested
-        arguments are accessed by the name of the nested_parser from the parent
-        argument parser.
+        Unlike `add_subparsers()`, the nested parsers are not mutually
+        exclusive, and the args of the nested groups that are not registered
+        by a parse still get their defaults in the parsed namespace. A nested
+        group with any required args is to be added to the parser directly,
+        such that argparse reports them when missing.
+
+        Args
+        ----
+        tokens : ClassDocstring | FuncDocstring
+            The root of the parsed tokens this parser is generated from.
 
         Returns
         -------
-        None | ArgumentParser | ArgumentParserGroup
+        NestedParsers
         """
-        raise NotImplementedError("""
-            The ideal would be that we do not have to always access the setting
-            of an argument using `--nested_1.nested_2.nested_3.nested_3_arg
-            VALUE`. And rather could have a nice indentation (if indented over
-            multiple lines) and have something like:
-            ```
-            python argparserino
-            ```
-        """)
         if self._nested_parsers is not None:
-            self.error(_('cannot have multiple nested parser arguments'))
-
-        # Add the parser class to the arguments if it's not present
-        kwargs.setdefault('parser_class', type(self))
-
-        # TODO perhaps keep nested parsers under subparsers, but include set of
-        # ids or dict of name to the subparsers that are nested parsers? want
-        # to preserve subparser functionality entirely and only add more to it.
-        if 'title' in kwargs or 'description' in kwargs:
-            title = _(kwargs.pop('title', 'nested command groups'))
-            description = _(kwargs.pop('description', None))
-            self._nested_parsers = self.add_argument_group(title, description)
+            self.error('cannot have multiple nested parser arguments')
+        self._nested_parsers = NestedParsers(tokens)
+        return self._nested_parsers
+
+    def register_nested(self, names=None):
+        """Adds the pending nested groups the dotted argument names are
+        within to this parser, or every one if no names are given.
+        """
+        if self._nested_parsers is None:
+            return
+        if names is None:
+            self._nested_parsers.register_all()
         else:
-            self._subparsers = self._positionals
+            self._nested_parsers.register_touched(names)
+
+    def format_usage(self):
+        self.register_nested()
+        return super().format_usage()
+
+    def format_help(self):
+        self.register_nested()
+        return super().format_help()
+
+    def parse_known_args(
+        self,
+        args=None,
+        namespace=None,
+        config_file_contents=None,
+        env_vars=os.environ,
+        ignore_help_args=False,
+    ):
+        """Registers the nested groups used by the args or config file
+        contents and parses as ConfigArgParse does. See
+        `cap.ArgumentParser.parse_known_args()`.
+
+        The namespace's args are set to their defaults in the order of the
+        program's tokens, including those of the nested groups left pending.
+        """
+        nested = self._nested_parsers
+        if nested is None:
+            return super().parse_known_args(
+                args,
+                namespace,
+                config_file_contents,
+                env_vars,
+                ignore_help_args,
+            )
 
-        # TODO prog defaults to the usage message of this parser, skipping
-        # optional arguments and with no "usage:" prefix
-        if kwargs.get('prog') is None:
-            formatter = self._get_formatter()
-            positionals = self._get_positional_actions()
-            groups = self._mutually_exclusive_groups
-            formatter.add_usage(self.usage, positionals, groups, '')
-            kwargs['prog'] = formatter.format_help().strip()
+        if args is None:
+            args = sys.argv[1:]
+        elif isinstance(args, str):
+            args = args.split()
+        else:
+            args = list(args)
 
-        # TODO create the parsers action and add it to the positionals list
-        parsers_class = self._pop_action_class(kwargs, 'parsers')
-        action = parsers_class(option_strings=[], **kwargs)
-        self._subparsers._add_action(action)
+        # Once every nested group is registered, the parser no longer changes.
+        if nested.complete:
+            parsing = nullcontext()
+        else:
+            parsing = nested.parsing(
+                self._get_used_names(args, config_file_contents)
+            )
+        with parsing:
+            if namespace is None:
+                namespace = cap.argparse.Namespace()
+            self._set_nested_defaults(namespace)
+            return super().parse_known_args(
+                args,
+                namespace,
+                config_file_contents,
+                env_vars,
+                ignore_help_args,
+            )
+
+    def _get_used_names(self, args, config_file_contents=None):
+        """Returns the dotted names of the args' options and the config file
+        contents' keys, or None if the help is requested, which uses every
+        nested group.
+        """
+        if '-h' in args or '--help' in args:
+            return None
+        names = [
+            arg[2:].partition('=')[0] for arg in args if arg.startswith('--')
+        ]
+        if config_file_contents is not None:
+            try:
+                names += list(self._config_file_parser.parse(
+                    StringIO(config_file_contents)
+                ))
+            except cap.ConfigFileParserException:
+                # ConfigArgParse reports the error when parsing.
+                pass
+        return names
 
-        # Return the created parsers action
-        return action
+    def _set_nested_defaults(self, namespace):
+        """Sets the namespace's missing args to their defaults in the order of
+        the program's tokens, regardless of the order the nested groups were
+        registered in, casting those of the pending nested groups, which
+        argparse is unaware of.
+        """
+        for dest, spec in self._nested_parsers.binder.args.items():
+            if hasattr(namespace, dest):
+                continue
+            action = self._option_string_actions.get(f'--{dest}')
+            if action is not None:
+                # Left as the action's default such that argparse casts it.
+                if action.default is not cap.argparse.SUPPRESS:
+                    setattr(namespace, dest, action.default)
+                continue
+            value = spec.default
+            if isinstance(value, str):
+                try:
+                    value = self._nested_parsers.binder.cast(spec, value)
+                except ConfigBindError as e:
+                    self.error(str(e))
+            setattr(namespace, dest, value)
 
 
 class NestedNamespace(cap.Namespace):
@@ -144,11 +398,12 @@ class NestedNamespace(cap.Namespace):
             try:
                 namespace = self.__dict__[group]
             except KeyError:
-                raise AttributeError
+                raise AttributeError(group)
 
             return getattr(namespace, name)
-        else:
-            getattr(super(NestedNamespace, self), name)
+        raise AttributeError(
+            f'{type(self).__name__!r} object has no attribute {name!r}'
+        )
 
     def pre_init(self):
         """This readies the NestedNamespace for initialization in run().
@@ -180,6 +435,268 @@ class NestedNamespace(cap.Namespace):
         return pre_nn
 
 
+class OverlayNamespace(NestedNamespace):
+    """A copy-on-write view of a shared base NestedNamespace that only stores
+    the values of its overridden dotted paths.
+
+    The base is never modified, so many overlays may share one base, e.g. the
+    trials of a sweep sharing the program's parsed config. Creating an overlay
+    and setting its overrides costs time and memory proportional to the number
+    of overrides and their depth, not to the size of the base. A nested
+    namespace of the base is wrapped in its own overlay when it is first
+    accessed, so the overrides of its children are also copy-on-write.
+
+    Attributes
+    ----------
+    base : NestedNamespace
+        The shared namespace treated as frozen by the overlay.
+    overrides : dict = None
+        The dotted paths to their values that override the base's values.
+    """
+    def __init__(self, base, overrides=None):
+        self.__dict__['_base'] = base
+        self.__dict__['_overrides'] = {}
+        if overrides:
+            for name, value in overrides.items():
+                setattr(self, name, value)
+
+    def __setattr__(self, name, value):
+        if '.' in name:
+            group, _, name = name.partition('.')
+            setattr(self._get_group(group), name, value)
+        else:
+            self._overrides[name] = value
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in {'_base', '_overrides'}:
+            raise AttributeError(name)
+        if '.' in name:
+            group, _, name = name.partition('.')
+            try:
+                namespace = self._get_item(group)
+            except KeyError:
+                raise AttributeError(group)
+            return getattr(namespace, name)
+        try:
+            return self._get_item(name)
+        except KeyError:
+            raise AttributeError(name)
+
+    def __delattr__(self, name):
+        raise TypeError('OverlayNamespace does not support deleting args.')
+
+    def __contains__(self, name):
+        return name in self._overrides or name in vars(self._base)
+
+    def __eq__(self, other):
+        if not isinstance(other, cap.Namespace):
+            return NotImplemented
+        return dict(namespace_items(self)) == dict(namespace_items(other))
+
+    def _get_kwargs(self):
+        return namespace_items(self)
+
+    def _get_item(self, name):
+        """Returns the arg's value, wrapping nested base namespaces."""
+        if name in self._overrides:
+            return self._overrides[name]
+        value = vars(self._base)[name]
+        if isinstance(value, NestedNamespace):
+            # Copy on write: overrides of its children stay in this overlay.
+            value = OverlayNamespace(value)
+            self._overrides[name] = value
+        return value
+
+    def _get_group(self, group):
+        """Returns the nested namespace of the group, creating it if missing.
+        """
+        try:
+            namespace = self._get_item(group)
+        except KeyError:
+            namespace = NestedNamespace()
+            self._overrides[group] = namespace
+        if not isinstance(namespace, NestedNamespace):
+            raise TypeError(
+                f'Unable to set a nested arg of `{group}`, as it is not a '
+                'NestedNamespace.'
+            )
+        return namespace
+
+    def overlay_items(self):
+        """Returns the (name, value) pairs of the base updated by the
+        overrides, where new args follow the base's args in insertion order.
+        """
+        items = [
+            (name, self._overrides.get(name, value))
+            for name, value in vars(self._base).items()
+        ]
+        items += [
+            (name, value) for name, value in self._overrides.items()
+            if name not in vars(self._base)
+        ]
+        return items
+
+    def pre_init(self):
+        """Readies the overlay for initialization as NestedNamespace.pre_init
+        does. Nested namespaces that are not overridden are the base's.
+        """
+        merged = NestedNamespace()
+        merged.__dict__.update(self.overlay_items())
+        return merged.pre_init()
+
+
+class IndexedNamespace(NestedNamespace):
+    """A NestedNamespace that also indexes every arg by its full dotted path,
+    such that getting a dotted arg is a single dict lookup regardless of its
+    depth.
+
+    The index is kept by the root namespace and shared with its nested
+    namespaces, which are IndexedNamespaces that know their path within the
+    root. Setting an arg through any of them updates the index. Setting a
+    NestedNamespace as an arg's value copies it into an IndexedNamespace of
+    the same root. This is a drop-in for NestedNamespace, including as the
+    `namespace` of `parser.parse_args()`.
+
+    Notes
+    -----
+    The index is stored in slots, not `__dict__`, so `vars()` only contains
+    the args, as with NestedNamespace.
+    """
+    __slots__ = ('_index', '_root', '_prefix')
+
+    def __init__(self, **kwargs):
+        object.__setattr__(self, '_index', {})
+        object.__setattr__(self, '_root', self)
+        object.__setattr__(self, '_prefix', '')
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def __getstate__(self):
+        return self.__dict__, self._index, self._root, self._prefix
+
+    def __setstate__(self, state):
+        args, index, root, prefix = state
+        self.__dict__.update(args)
+        object.__setattr__(self, '_index', index)
+        object.__setattr__(self, '_root', root)
+        object.__setattr__(self, '_prefix', prefix)
+
+    def __setattr__(self, name, value):
+        namespace = self
+        if '.' in name:
+            group, _, name = name.rpartition('.')
+            namespace = self._get_group(group)
+        namespace._set(name, value)
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in IndexedNamespace.__slots__:
+            raise AttributeError(name)
+        try:
+            return self._root._index[self._prefix + name]
+        except KeyError:
+            raise AttributeError(
+                f'{type(self).__name__!r} object has no attribute {name!r}'
+            ) from None
+
+    def __delattr__(self, name):
+        namespace = self
+        if '.' in name:
+            group, _, name = name.rpartition('.')
+            namespace = getattr(self, group)
+            if not isinstance(namespace, IndexedNamespace):
+                raise AttributeError(group)
+        if name not in namespace.__dict__:
+            raise AttributeError(name)
+        namespace._unindex(name)
+        del namespace.__dict__[name]
+
+    def __contains__(self, name):
+        return self._prefix + name in self._root._index
+
+    def _new_group(self, name):
+        """Returns an empty IndexedNamespace of this root for the nested arg.
+        """
+        group = IndexedNamespace.__new__(IndexedNamespace)
+        object.__setattr__(group, '_index', None)
+        object.__setattr__(group, '_root', self._root)
+        object.__setattr__(group, '_prefix', f'{self._prefix}{name}.')
+        return group
+
+    def _get_group(self, group):
+        """Returns the nested namespace at the dotted path of the group,
+        creating any that are missing.
+        """
+        namespace = self._root._index.get(self._prefix + group)
+        if isinstance(namespace, IndexedNamespace):
+            return namespace
+        namespace = self
+        for name in group.split('.'):
+            child = namespace.__dict__.get(name)
+            if not isinstance(child, IndexedNamespace):
+                child = namespace._new_group(name)
+                namespace._set(name, child)
+            namespace = child
+        return namespace
+
+    def _set(self, name, value):
+        """Sets the non-dotted arg of this namespace and indexes it."""
+        path = self._prefix + name
+        if name in self.__dict__ and self.__dict__[name] is not value:
+            self._unindex(name)
+
+        if isinstance(value, NestedNamespace) and not (
+            isinstance(value, IndexedNamespace)
+            and value._root is self._root
+            and value._prefix == path + '.'
+        ):
+            group = self._new_group(name)
+            self.__dict__[name] = group
+            self._root._index[path] = group
+            for key, val in namespace_items(value):
+                group._set(key, val)
+            return
+
+        self.__dict__[name] = value
+        self._root._index[path] = value
+
+    def _unindex(self, name):
+        """Removes the arg of this namespace and its nested args from the
+        index.
+        """
+        value = self.__dict__[name]
+        if isinstance(value, IndexedNamespace):
+            for key in list(vars(value)):
+                value._unindex(key)
+        self._root._index.pop(self._prefix + name, None)
+
+    def update(self, args):
+        """Sets every arg of the flat dict of dotted paths to values."""
+        for name, value in args.items():
+            setattr(self, name, value)
+
+    def leaves(self):
+        """Yields the (dotted path, value) pairs of the args of this namespace
+        that are not namespaces, in the order they were first set. The paths
+        are relative to this namespace.
+        """
+        start = len(self._prefix)
+        for path, value in self._root._index.items():
+            if (
+                path.startswith(self._prefix)
+                and not isinstance(value, IndexedNamespace)
+            ):
+                yield path[start:], value
+
+
+def namespace_items(namespace):
+    """Returns the (name, value) pairs of the args of the namespace, whether
+    it is a NestedNamespace or an OverlayNamespace.
+    """
+    if isinstance(namespace, OverlayNamespace):
+        return namespace.overlay_items()
+    return list(vars(namespace).items())
+
+
 # TODO str conversion into objects of expected types
 #   This is already supported for "common built-in types and functions".
 #   TODO get object from a string of the fully qualified name in python.
@@ -244,16 +761,191 @@ def recursive_dict_update(dest, src, copy=True):
         return dest
 
 
+class DefaultsDict(dict):
+    """A dict of the overrides of a default mapping that reads through to the
+    defaults for every other key, so the defaults are shared, not copied.
+
+    The dict itself only stores the overrides, while every dict method reads
+    and writes the merged mapping in the order of `recursive_dict_update()`,
+    the default keys and then the new keys. Writes never modify the defaults.
+    Pickling or copying with the copy module gives a plain dict, and yaml
+    dumps it as a mapping.
+
+    Attributes
+    ----------
+    defaults : Mapping
+        The mapping treated as read-only that is read through.
+    """
+    __slots__ = ('defaults', '_deleted')
+
+    def __init__(self, defaults, overrides=()):
+        super().__init__(overrides)
+        self.defaults = defaults
+        # The default keys deleted from this dict.
+        self._deleted = set()
+
+    def _has_default(self, key):
+        return key in self.defaults and key not in self._deleted
+
+    def __getitem__(self, key):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        if self._has_default(key):
+            return self.defaults[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or self._has_default(key)
+
+    def __iter__(self):
+        for key in self.defaults:
+            if key not in self._deleted:
+                yield key
+        for key in dict.__iter__(self):
+            if key not in self.defaults:
+                yield key
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __len__(self):
+        return len(self.defaults) - len(self._deleted) + sum(
+            1 for key in dict.__iter__(self) if key not in self.defaults
+        )
+
+    def __setitem__(self, key, value):
+        self._deleted.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if dict.__contains__(self, key):
+            dict.__delitem__(self, key)
+        if key in self.defaults:
+            self._deleted.add(key)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+    def __or__(self, other):
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        for key in reversed(self):
+            return key, self.pop(key)
+        raise KeyError('popitem(): dictionary is empty')
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        dict.clear(self)
+        self._deleted = set(self.defaults)
+
+    def copy(self):
+        """Returns a DefaultsDict of the same defaults and a copy of the
+        overrides.
+        """
+        copied = DefaultsDict(self.defaults, dict.items(self))
+        copied._deleted = set(self._deleted)
+        return copied
+
+
+for _representer in (
+    yaml.representer.SafeRepresenter,
+    yaml.representer.Representer,
+):
+    _representer.add_representer(
+        DefaultsDict,
+        yaml.representer.SafeRepresenter.represent_dict,
+    )
+del _representer
+
+
+def merge_mappings(base, src):
+    """Recursively updates the base mapping by the source mapping without
+    modifying or copying either, as recursive_dict_update(copy=True) does.
+
+    Only the keys of the source are stored in the result, while the base and
+    every nested mapping of it that the source does not change are read
+    through. This takes time proportional to the size of the source, not the
+    base.
+
+    Args
+    ----
+    base : Mapping
+        The mapping to be updated, which must not be modified afterwards.
+    src : Mapping
+        The mapping whose values update the base.
+
+    Returns
+    -------
+    DefaultsDict
+        The dict of the base updated by the source.
+    """
+    overrides = {}
+    for key, value in src.items():
+        if isinstance(value, Mapping):
+            dest_value = base.get(key)
+            if isinstance(dest_value, Mapping):
+                value = merge_mappings(dest_value, value)
+        overrides[key] = value
+    return DefaultsDict(base, overrides)
+
+
 def default_mapping_constructor(
     loader: yaml.SafeLoader,
     node: yaml.nodes.MappingNode,
     default_map: dict
 ) -> dict:
-    return recursive_dict_update(
-        default_map,
-        loader.construct_mapping(node, True),
-        copy=True,
-    )
+    # The default mapping is shared by every tagged node, not copied.
+    return merge_mappings(default_map, loader.construct_mapping(node, True))
 
 
 def add_default_mappings(loader, configs):
@@ -339,12 +1031,86 @@ def cast_bool_str(obj):
     )
 
 
+def cast_list_str(obj):
+    """Casts the yaml flow sequence of a list arg, e.g. `[1, {a: 2}]`, where
+    a config's list, e.g. of component configs, is given as is.
+    """
+    if isinstance(obj, list):
+        return obj
+    if isinstance(obj, str):
+        value = yaml.safe_load(obj)
+        if isinstance(value, list):
+            return value
+    raise ValueError(
+        'Docstr ConfigArgParse expected a list arg to be a list or the str of '
+        f'a yaml sequence, but was given: `{obj!r}`'
+    )
+
+
+def get_docstring_args(docstring):
+    """Returns the configurable arguments of the given parsed docstring.
+
+    Args
+    ----
+    docstring : ClassDocstring | FuncDocstring
+        The parsed tokens whose arguments are to be configured.
+
+    Returns
+    -------
+    OrderedDict
+        The mapping of argument names to their `ArgDoc`. For classes this is
+        the init's args, or the attributes if there is no init method.
+    """
+    if isinstance(docstring, ClassDocstring):
+        # TODO store the object in type to recreate the object post CAP parse
+        if docstring.init is None or docstring.init.args is None:
+            # This is a type of class w/o an init method, thus uses attributes.
+            return docstring.attributes
+        return docstring.init.args
+    if isinstance(docstring, FuncDocstring):
+        # TODO store the object in type to recreate the object post CAP parse
+        return docstring.args
+    if isinstance(docstring, Docstring):
+        raise TypeError(' '.join([
+            '`docstring` is an unsupported subclass of `docstr.Docstring`.',
+            f'Expected ClassDocstring or FuncDocstring, not: {type(docstring)}'
+        ]))
+    raise TypeError(f'Unexpected `docstring` type: {type(docstring)}')
+
+
+def has_required_args(docstring):
+    """Returns True if the docstring or any nested within its args has an arg
+    without a default.
+    """
+    stack = [docstring]
+    while stack:
+        for arg in get_docstring_args(stack.pop()).values():
+            if isinstance(arg.type, (ClassDocstring, FuncDocstring)):
+                stack.append(arg.type)
+            elif arg.default is ValueExists.false:
+                return True
+    return False
+
+
+def get_config_file_parser_class(config_file_parser='yaml'):
+    """Returns the ConfigArgParse config file parser class given its name."""
+    if config_file_parser == 'yaml':
+        return cap.YAMLConfigFileParser
+    if config_file_parser == 'ini':
+        return cap.ConfigparserConfigFileParser
+    if isinstance(config_file_parser, partial):
+        return config_file_parser
+    raise ValueError(f'Unexpected `config_file` value: {config_file_parser}')
+
+
 def get_configargparser(
     docstring,
     nested_prefix='',
     parser=None,
     nested_positionals=False,
     config_file_parser='yaml',
+    lazy_nested=False,
+    nested_parsers=None,
 ):
     """Creates the ConfigArgParser from contents in the given docstr.Docstring.
 
@@ -362,48 +1128,33 @@ def get_configargparser(
         arguments instead of keyword required arguments. The default is
         False, meaning any required argument is made as a required keyword
         argument, non-positional.
+    lazy_nested : bool = False
+        If True and no parser is given, the argument groups of nested objects
+        without any required args are registered by the parser only once a
+        parse or its help uses them. See `ArgumentParser.add_nested_parsers()`.
+    nested_parsers : NestedParsers = None
+        The root parser's nested parsers to add this docstring's nested
+        argument groups to as pending. Defaults to adding them immediately.
 
     Returns
     -------
-    configargparse.ArgumentParser | argparse._ArgumentGroup
+    ArgumentParser | argparse._ArgumentGroup
     """
     # Type checking of docstring and setting up: args, description, etc.
-    if isinstance(docstring, ClassDocstring):
-        description = docstring.description
-            #f'{docstring.description}\n __init__: \n{docstring.init.description}'
-        # TODO store the object in type to recreate the object post CAP parse
-        if docstring.init is None or docstring.init.args is None:
-            # This is a type of class w/o an init method, thus uses attributes.
-            args = docstring.attributes
-        else:
-            args = docstring.init.args
-    elif isinstance(docstring, FuncDocstring):
-        description = docstring.description
-        # TODO store the object in type to recreate the object post CAP parse
-        args = docstring.args
-    elif isinstance(docstring, Docstring):
-        raise TypeError(' '.join([
-            '`docstring` is an unsupported subclass of `docstr.Docstring`.',
-            f'Expected ClassDocstring or FuncDocstring, not: {type(docstring)}'
-        ]))
-    else:
-        raise TypeError(f'Unexpected `docstring` type: {type(docstring)}')
+    args = get_docstring_args(docstring)
+    description = docstring.description
 
     # Setup the nested parser / argument_group
     if parser is None:
-        if config_file_parser == 'yaml':
-            config_file_parser = cap.YAMLConfigFileParser
-        elif config_file_parser == 'ini':
-            config_file_parser = cap.ConfigparserConfigFileParser
-        elif not isinstance(config_file_parser, partial):
-            raise ValueError(
-                f'Unexpected `config_file` value: {config_file_parser}'
-            )
-        nested_parser = cap.ArgumentParser(
+        nested_parser = ArgumentParser(
             prog=docstring.name,
             description=description,
-            config_file_parser_class=config_file_parser,
+            config_file_parser_class=get_config_file_parser_class(
+                config_file_parser
+            ),
         )
+        if lazy_nested:
+            nested_parsers = nested_parser.add_nested_parsers(docstring)
     elif isinstance(parser, (cap.ArgParser, cap.argparse._ArgumentGroup)):
         # Create the subparsers and pass that down any recursive get_cap()
         # TODO Once a Nested Parser is supported, replace this w/ that
@@ -474,6 +1225,8 @@ def get_configargparser(
         # Handle boolean args' casting as they are a special case.
         if arg.type is bool:
             arg.type = cast_bool_str
+        elif arg.type is list:
+            arg.type = cast_list_str
 
         nested_parser.add_argument(
             f'--{name}',
@@ -483,18 +1236,511 @@ def get_configargparser(
             **arg_kwargs,
         )
 
-    # TODO this begs for trivial parallelization, possibly async creation
     for rec_args, rec_arg_parts in recursive_args.items():
-        get_configargparser(
+        build = partial(
+            get_configargparser,
             rec_arg_parts['type'],
             rec_arg_parts['name'],
             nested_parser,
             nested_positionals,
+            nested_parsers=nested_parsers,
         )
+        if nested_parsers is None or has_required_args(rec_arg_parts['type']):
+            # Missing required args are only reported by registered groups.
+            build()
+        else:
+            nested_parsers.add_parser(rec_arg_parts['name'], build)
 
     return nested_parser
 
 
+@dataclass
+class ArgumentSpec:
+    """The arguments of a single `add_argument()` call of a docstr generated
+    ConfigArgParser, recorded to rebuild the parser without the tokens.
+
+    Attributes
+    ----------
+    option_strings : [str]
+        The option strings of the argument, e.g. `['--nested.arg']`.
+    dest : str
+        The dotted destination of the argument in the NestedNamespace.
+    type : object = None
+    default : object = None
+    help : str = None
+    required : bool = False
+    choices : tuple = None
+    group : str = None
+        The title of the argument group this argument belongs to, None if
+        added directly to the parser.
+    """
+    option_strings : list
+    dest : str
+    type : object = None
+    default : object = None
+    help : str = None
+    required : bool = False
+    choices : tuple = None
+    group : str = None
+
+
+@dataclass
+class ParserSpec:
+    """The recorded structure of a docstr generated ConfigArgParser.
+
+    Attributes
+    ----------
+    prog : str
+    description : str = None
+    groups : OrderedDict({str: str}) = None
+        The argument group titles to their descriptions in order of creation.
+    args : [ArgumentSpec] = None
+    """
+    prog : str
+    description : str = None
+    groups : OrderedDict = None
+    args : list = None
+
+
+def get_parser_spec(parser):
+    """Records the arguments and groups of the given parser as a ParserSpec.
+
+    Args
+    ----
+    parser : configargparse.ArgumentParser
+        The parser whose arguments are to be recorded, typically the result of
+        `get_configargparser()`.
+
+    Returns
+    -------
+    ParserSpec
+        The picklable spec able to rebuild an equivalent parser through
+        `parser_from_spec()`.
+
+    Notes
+    -----
+    Nested argument groups are flattened into groups of the root parser, which
+    only changes the `--help` layout and not the parsed values. Any pending
+    nested groups are registered first, so the spec has every argument.
+    """
+    spec = ParserSpec(
+        prog=parser.prog,
+        description=parser.description,
+        groups=OrderedDict(),
+        args=[],
+    )
+
+    # argparse's default groups are not docstr nested argument groups.
+    default_titles = {'positional arguments', 'optional arguments', 'options'}
+    if isinstance(parser, ArgumentParser):
+        parser.register_nested()
+
+    group_stack = [(None, group) for group in reversed(parser._action_groups)]
+    while group_stack:
+        parent_title, group = group_stack.pop()
+        if group.title in default_titles:
+            title = parent_title
+        else:
+            title = group.title
+            spec.groups[title] = group.description
+
+        for action in group._group_actions:
+            if isinstance(action, cap.argparse._HelpAction):
+                continue
+            spec.args.append(ArgumentSpec(
+                option_strings=list(action.option_strings),
+                dest=action.dest,
+                type=action.type,
+                default=action.default,
+                help=action.help,
+                required=action.required,
+                choices=action.choices,
+                group=title,
+            ))
+        group_stack += [
+            (title, nested) for nested in reversed(group._action_groups)
+        ]
+    return spec
+
+
+def parser_from_spec(spec, config_file_parser='yaml'):
+    """Rebuilds the ConfigArgParser recorded in the given ParserSpec.
+
+    Args
+    ----
+    spec : ParserSpec
+        The recorded parser structure from `get_parser_spec()`.
+    config_file_parser : 'yaml' | 'ini' | functools.partial = 'yaml'
+        The config file parser used by the rebuilt parser.
+
+    Returns
+    -------
+    configargparse.ArgumentParser
+    """
+    parser = cap.ArgumentParser(
+        prog=spec.prog,
+        description=spec.description,
+        config_file_parser_class=get_config_file_parser_class(
+            config_file_parser
+        ),
+    )
+    groups = {
+        title: parser.add_argument_group(title, description)
+        for title, description in spec.groups.items()
+    }
+    for arg in spec.args:
+        arg_kwargs = {}
+        if arg.required:
+            arg_kwargs['required'] = True
+        if arg.choices is not None:
+            arg_kwargs['choices'] = arg.choices
+
+        container = parser if arg.group is None else groups[arg.group]
+        container.add_argument(
+            *arg.option_strings,
+            dest=arg.dest,
+            type=arg.type,
+            help=arg.help,
+            default=arg.default,
+            **arg_kwargs,
+        )
+    return parser
+
+
+class ConfigBindError(ValueError):
+    """A config the ConfigBinder does not bind, e.g. with a missing required
+    arg, which is then parsed by argparse to report its error.
+    """
+
+
+class ConfigBinder(object):
+    """Binds a program's flattened config directly into the namespace that
+    parsing it with the program's ConfigArgParser and no command line args
+    would return, without building nor walking the argparse parser.
+
+    Attributes
+    ----------
+    args : OrderedDict({str: ArgumentSpec})
+        The dotted dests of the program's args, including the `docstr_type`
+        of every configurable object, in the order of the program's parser
+        to the types, defaults, `required`, and choices of their ArgDocs.
+
+    Notes
+    -----
+    The config's values are cast from their strs, as ConfigArgParse passes
+    config file values to argparse, where null values leave the default and
+    str defaults are cast as well. Lists, unknown args, missing required args,
+    and values that fail their cast or choices raise ConfigBindError.
+    """
+    def __init__(self, args):
+        self.args = args
+
+    @classmethod
+    def from_tokens(cls, tokens, prefix=''):
+        """Returns the ConfigBinder of the args the ConfigArgParser of
+        `get_configargparser()` would have given the tokens.
+
+        Args
+        ----
+        tokens : ClassDocstring | FuncDocstring
+            The root of the parsed tokens of the python program.
+        prefix : str = ''
+            The dotted prefix of the tokens' args when they are nested.
+
+        Returns
+        -------
+        ConfigBinder
+        """
+        args = OrderedDict()
+        stack = [(prefix, tokens)]
+        while stack:
+            prefix, docstring = stack.pop()
+            dest = f'{prefix}.docstr_type' if prefix else 'docstr_type'
+            args[dest] = ArgumentSpec(
+                [f'--{dest}'],
+                dest,
+                type,
+                docstring.type,
+            )
+
+            nested = []
+            for arg in get_docstring_args(docstring).values():
+                dest = f'{prefix}.{arg.name}' if prefix else arg.name
+                if isinstance(arg.type, (ClassDocstring, FuncDocstring)):
+                    nested.append((dest, arg.type))
+                    continue
+
+                arg_type = arg.type
+                choices = None
+                if isinstance(arg_type, MultiType) and all(
+                    not isinstance(t, type) for t in arg_type
+                ):
+                    choices = arg_type
+                elif arg_type is bool:
+                    arg_type = cast_bool_str
+                elif arg_type is list:
+                    arg_type = cast_list_str
+
+                args[dest] = ArgumentSpec(
+                    [f'--{dest}'],
+                    dest,
+                    arg_type,
+                    None if arg.default is ValueExists.false else arg.default,
+                    required=arg.default is ValueExists.false,
+                    choices=choices,
+                )
+            # Nested objects' args follow their parent's, as in the parser.
+            stack += reversed(nested)
+        return cls(args)
+
+    def cast(self, spec, value):
+        """Returns the str value cast by the arg's type and checks its choices.
+        """
+        if spec.type is not None:
+            try:
+                value = spec.type(value)
+            except (TypeError, ValueError, cap.argparse.ArgumentTypeError):
+                raise ConfigBindError(
+                    f'Invalid {spec.type} value of `{spec.dest}`: {value!r}'
+                ) from None
+        if spec.choices is not None and value not in spec.choices:
+            raise ConfigBindError(
+                f'`{spec.dest}` value {value!r} is not one of the choices: '
+                f'{spec.choices}'
+            )
+        return value
+
+    def bind(self, config, known_args=False):
+        """Binds the flat config into a new IndexedNamespace.
+
+        Args
+        ----
+        config : dict
+            The flat dict of dotted argument names to values.
+        known_args : bool = False
+            If True, ignores unknown args rather than raising an error.
+
+        Returns
+        -------
+        IndexedNamespace
+            The program's resulting arguments ready for `init_prog()`.
+        """
+        if not known_args:
+            for name in config:
+                if name not in self.args:
+                    raise ConfigBindError(f'Unrecognized argument: `{name}`')
+
+        namespace = IndexedNamespace()
+        for dest, spec in self.args.items():
+            value = config.get(dest)
+            if value is None:
+                if spec.required:
+                    raise ConfigBindError(f'Missing required arg: `{dest}`')
+                value = spec.default
+                if isinstance(value, str):
+                    value = self.cast(spec, value)
+            elif isinstance(value, list):
+                if spec.type is not cast_list_str:
+                    raise ConfigBindError(f'`{dest}` is unable to be a list')
+            else:
+                value = self.cast(spec, str(value))
+            setattr(namespace, dest, value)
+        return namespace
+
+
+class ProgramParser(object):
+    """The ConfigArgParser and parsed tokens of a docstr program, built once
+    to parse many sets of arguments into fresh NestedNamespaces.
+
+    Attributes
+    ----------
+    tokens : ClassDocstring | FuncDocstring
+        The parsed tokens of the python program's docstrings.
+    parser : configargparse.ArgumentParser
+        The program's ConfigArgParser generated from the tokens, or rebuilt
+        from `parser_spec`, when it is first used.
+    binder : ConfigBinder
+        The binder of the program's configs generated from the tokens, used
+        instead of the parser when there are no command line arguments.
+    config : dict = None
+        The program's config as a flat dict of dotted argument names to
+        values, e.g. the `args` of the program from
+        `prototype_hack_reformat_yaml_dict_unnested_cap()`. This is the config
+        that the configs given to `parse()` update.
+
+    Notes
+    -----
+    `parse()` is safe to call from multiple threads at once. ConfigArgParse
+    stores the state of the current parse on the parser itself, so each thread
+    parses with its own shallow copy of the parser, which shares the actions
+    and groups, and thus nothing is rebuilt.
+    """
+    def __init__(
+        self,
+        tokens,
+        parser=None,
+        config=None,
+        config_file_parser='yaml',
+        parser_spec=None,
+    ):
+        """
+        Args
+        ----
+        tokens : see self
+        parser : see self
+            Defaults to the parser generated by `get_configargparser()`.
+        config : see self
+        config_file_parser : 'yaml' | 'ini' | functools.partial = 'yaml'
+            The config file parser used when generating the parser.
+        parser_spec : ParserSpec = None
+            The recorded parser to rebuild through `parser_from_spec()` rather
+            than generating it from the tokens, if `parser` is not given.
+        """
+        self.tokens = tokens
+        self.config = {} if config is None else config
+        self.config_file_parser = config_file_parser
+        self.parser_spec = parser_spec
+        # The parser and binder built on first use, shared by `with_config()`.
+        self._built = {} if parser is None else {'parser': parser}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock'], state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def parser(self):
+        parser = self._built.get('parser')
+        if parser is None:
+            with self._lock:
+                parser = self._built.get('parser')
+                if parser is None and self.parser_spec is not None:
+                    parser = parser_from_spec(
+                        self.parser_spec,
+                        self.config_file_parser,
+                    )
+                elif parser is None:
+                    parser = get_configargparser(
+                        self.tokens,
+                        config_file_parser=self.config_file_parser,
+                        lazy_nested=True,
+                    )
+                self._built['parser'] = parser
+        return parser
+
+    @property
+    def binder(self):
+        binder = self._built.get('binder')
+        if binder is None:
+            with self._lock:
+                binder = self._built.get('binder')
+                if binder is None:
+                    binder = ConfigBinder.from_tokens(self.tokens)
+                    self._built['binder'] = binder
+        return binder
+
+    def with_config(self, config):
+        """Returns the ProgramParser of the same program with another config,
+        sharing this one's parser and binder, even if built later.
+        """
+        prog_parser = copy(self)
+        prog_parser.config = config
+        prog_parser._local = threading.local()
+        return prog_parser
+
+    def get_parser(self):
+        """Returns this thread's copy of the parser for parsing."""
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = copy(self.parser)
+            self._local.parser = parser
+        return parser
+
+    def parse(self, args=None, config=None, known_args=False):
+        """Parses the arguments and config into a new IndexedNamespace.
+
+        Args
+        ----
+        args : [str] = None
+            The command line arguments that override the config, e.g.
+            `['--nested.arg', 'value']`. Defaults to no arguments.
+        config : dict = None
+            The flat dict of dotted argument names to values that updates this
+            program's config.
+        known_args : bool = False
+            If True, ignores unknown arguments rather than raising an error.
+
+        Returns
+        -------
+        IndexedNamespace
+            The program's resulting arguments ready for `init_prog()`.
+        """
+        if config:
+            prog_config = self.config.copy()
+            prog_config.update(config)
+        else:
+            prog_config = self.config
+
+        if not args:
+            try:
+                return self.binder.bind(prog_config, known_args)
+            except ConfigBindError:
+                # The parser reports the error as it does for any args.
+                pass
+
+        # The config file parser only gives lists to args of many values, so
+        # the list args are given as yaml sequences cast by cast_list_str().
+        prog_config = {
+            key: yaml.safe_dump(value, default_flow_style=True).strip()
+            if isinstance(value, list) and key in self.binder.args
+            and self.binder.args[key].type is cast_list_str
+            else value
+            for key, value in prog_config.items()
+        }
+        parse_kwargs = dict(
+            args=[] if args is None else args,
+            namespace=IndexedNamespace(),
+            config_file_contents=yaml.dump(prog_config),
+        )
+        if known_args:
+            return self.get_parser().parse_known_args(**parse_kwargs)[0]
+        return self.get_parser().parse_args(**parse_kwargs)
+
+    def init_prog(self, prog_args):
+        """Initializes the program of the parsed args with the program's
+        InitPlan, which is compiled on first use and shared by
+        `with_config()`, as the program's namespaces have the same shape.
+
+        Args
+        ----
+        prog_args : NestedNamespace
+            The program's parsed args, e.g. from `parse()`.
+
+        Returns
+        -------
+        object
+            The initialized entry object of the program, as from
+            `init_prog()`.
+        """
+        plan = self._built.get('init_plan')
+        if plan is not None:
+            try:
+                return plan.init(prog_args)
+            except InitPlanError:
+                # Compiled again for the namespace's shape below.
+                pass
+        plan = InitPlan.compile(prog_args)
+        self._built['init_plan'] = plan
+        return plan.init(prog_args)
+
+
 # TODO Either here or docstr/cli make ConfigArgParser for hardware & logging
 #   the hardware and logging can inform what parallelization docstr may use, or
 #   could be used to inform how to run the python program, possibly. The latter
@@ -503,17 +1749,214 @@ def get_configargparser(
 #   it can use the configs, then it can if desired.
 
 
-def init_prog(prog_args):
+def _freeze(value):
+    """Returns a hashable key of the arg value, where objects other than
+    primitives and containers are keyed by their identity.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return (type(value), tuple(_freeze(val) for val in value))
+    if value is None or isinstance(value, (str, bytes, bool, int, float)):
+        return (type(value), value)
+    return (id, id(value))
+
+
+class _SharedInstances(object):
+    """The objects initialized from identical namespace subtrees.
+
+    A subtree is keyed by its `docstr_type` and its resolved args, where its
+    nested objects are already initialized, so identical nested subtrees are
+    the same shared object and thus their parents' keys are equal as well.
+
+    Attributes
+    ----------
+    unshared : set = None
+        The types, or their fully qualified names, that are never shared.
+    """
+    def __init__(self, unshared=None):
+        self.unshared = set() if unshared is None else set(unshared)
+        # The args are kept so the ids in the keys are never reused.
+        self._instances = {}
+
+    def get_key(self, cap_init):
+        """Returns the key of the pre_init namespace, or None if unshared."""
+        docstr_type = cap_init.docstr_type
+        if (
+            docstr_type in self.unshared
+            or get_full_qual_name(docstr_type) in self.unshared
+        ):
+            return None
+        return (docstr_type, _freeze(cap_init.docstr_args))
+
+    def __contains__(self, key):
+        """Returns True if the key has a shared object, which may be None."""
+        return key is not None and key in self._instances
+
+    def get(self, key):
+        """Returns the shared object of the key, which must be contained."""
+        return self._instances[key][0]
+
+    def add(self, key, obj, cap_init):
+        """Adds the object initialized from the pre_init namespace as shared.
+        """
+        if key is not None:
+            self._instances[key] = (obj, cap_init.docstr_args)
+
+
+class LazyProxy(object):
+    """A stand-in for the object of a nested namespace that initializes the
+    object, and its own nested objects lazily, on first use.
+
+    Any attribute access, call, item access, iteration, or length of the proxy
+    initializes the object and forwards to it. `isinstance()` checks the
+    namespace's `docstr_type` without initializing the object. Use
+    `resolve_lazy()` to get the initialized object itself.
+
+    Attributes
+    ----------
+    namespace : NestedNamespace
+        The namespace of the object's args, with its `docstr_type`.
+    """
+    __slots__ = ('_namespace', '_obj', '_lock')
+
+    def __init__(self, namespace):
+        object.__setattr__(self, '_namespace', namespace)
+        object.__setattr__(self, '_obj', _UNINITIALIZED)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _get_obj(self):
+        """Returns the object, initializing it once if not yet initialized."""
+        if object.__getattribute__(self, '_obj') is _UNINITIALIZED:
+            with object.__getattribute__(self, '_lock'):
+                if object.__getattribute__(self, '_obj') is _UNINITIALIZED:
+                    obj = init_prog(
+                        object.__getattribute__(self, '_namespace'),
+                        lazy=True,
+                    )
+                    object.__setattr__(self, '_obj', obj)
+                    object.__setattr__(self, '_namespace', None)
+        return object.__getattribute__(self, '_obj')
+
+    @property
+    def __class__(self):
+        obj = object.__getattribute__(self, '_obj')
+        if obj is _UNINITIALIZED:
+            return object.__getattribute__(self, '_namespace').docstr_type
+        return type(obj)
+
+    def __getattr__(self, name):
+        return getattr(self._get_obj(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get_obj(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._get_obj(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._get_obj()(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return self._get_obj()[key]
+
+    def __setitem__(self, key, value):
+        self._get_obj()[key] = value
+
+    def __iter__(self):
+        return iter(self._get_obj())
+
+    def __len__(self):
+        return len(self._get_obj())
+
+    def __contains__(self, item):
+        return item in self._get_obj()
+
+    def __bool__(self):
+        return bool(self._get_obj())
+
+    def __str__(self):
+        return str(self._get_obj())
+
+    def __repr__(self):
+        obj = object.__getattribute__(self, '_obj')
+        if obj is _UNINITIALIZED:
+            docstr_type = object.__getattribute__(
+                self,
+                '_namespace',
+            ).docstr_type
+            return f'LazyProxy({get_full_qual_name(docstr_type)})'
+        return repr(obj)
+
+
+# Marks a LazyProxy whose object is not initialized yet.
+_UNINITIALIZED = object()
+
+
+def resolve_lazy(obj):
+    """Returns the initialized object of a LazyProxy, initializing it if
+    necessary, or the given object if it is not a LazyProxy.
+    """
+    if type(obj) is LazyProxy:
+        return obj._get_obj()
+    return obj
+
+
+def is_initialized(obj):
+    """True if the object is not a LazyProxy or its object is initialized."""
+    return (
+        type(obj) is not LazyProxy
+        or object.__getattribute__(obj, '_obj') is not _UNINITIALIZED
+    )
+
+
+def init_prog(
+    prog_args,
+    executor=None,
+    share=False,
+    unshared=None,
+    lazy=False,
+):
     """Run the program given parsed tokens and the ConfigArgParser arguments.
 
     Args
     ----
-    tokens : ClassDocstring | FuncDocstring
-        The parsed tokens of the python program's docstrings.
-    cap_args : NestedNamespace
+    prog_args : NestedNamespace
         The resulting argument values in a nested namespace from running the
         configargparse.ArgumentParser for the python program.
+    executor : concurrent.futures.Executor = None
+        If given, the objects are initialized in parallel on the executor,
+        where independent siblings are constructed concurrently and a parent
+        is constructed once all of its nested objects are. A
+        ProcessPoolExecutor requires the types and args to be picklable.
+        Defaults to initializing one object at a time in this thread.
+    share : bool = False
+        If True, nested namespaces with the same `docstr_type` and identical
+        args, including identical nested namespaces, are initialized once and
+        the object is shared by all of their parents, such that the program's
+        objects form a DAG rather than a tree.
+    unshared : set = None
+        The types, or their fully qualified names, that are initialized for
+        every nested namespace even when sharing, e.g. stateful components.
+    lazy : bool = False
+        If True, only the entry object is initialized, and every nested
+        namespace is given to its parent as a LazyProxy, which initializes its
+        object on first use. Unsupported with an executor or sharing.
     """
+    if lazy:
+        if executor is not None or share:
+            raise ValueError(
+                'Lazy initialization does not support an executor or sharing.'
+            )
+        cap_init = prog_args.pre_init()
+        for key, val in cap_init.docstr_nested_args.items():
+            cap_init.docstr_args[key] = LazyProxy(val)
+        return cap_init.docstr_type(**cap_init.docstr_args)
+
+    shared = _SharedInstances(unshared) if share else None
+    if executor is not None:
+        return _init_prog_parallel(prog_args, executor, shared)
+
     # TODO Need to initialize the leaves first and work the way down, which
     # involves a depth first traversal to do so if do not have the leaf objects
     # already.
@@ -532,7 +1975,250 @@ def init_prog(prog_args):
             # Reasign this NestedNamespace to its initialized object
             cap_init = cap_stack.pop()
             if cap_stack:
+                if shared is None:
+                    obj = cap_init.docstr_type(**cap_init.docstr_args)
+                else:
+                    share_key = shared.get_key(cap_init)
+                    if share_key in shared:
+                        obj = shared.get(share_key)
+                    else:
+                        obj = cap_init.docstr_type(**cap_init.docstr_args)
+                        shared.add(share_key, obj, cap_init)
                 cap_stack[-1].docstr_args[cap_stack[-1].docstr_waiting_arg] = \
-                    cap_init.docstr_type(**cap_init.docstr_args)
+                    obj
             #else: cap_init is the entry object
     return cap_init.docstr_type(**cap_init.docstr_args)
+
+
+def _init_prog_parallel(prog_args, executor, shared=None):
+    """Initializes the program's objects in parallel on the executor.
+
+    The tree of pre_init namespaces is built first, then every leaf is
+    submitted, and each parent is submitted once its last child finishes.
+    When sharing, a namespace identical to one already submitted waits on
+    that one's future rather than being submitted again.
+    """
+    root = prog_args.pre_init()
+    ready = []
+    cap_stack = [root]
+    while cap_stack:
+        cap_init = cap_stack.pop()
+        cap_init.docstr_pending = len(cap_init.docstr_nested_args)
+        if not cap_init.docstr_pending:
+            ready.append(cap_init)
+        for key, val in cap_init.docstr_nested_args.items():
+            child = val.pre_init()
+            child.docstr_parent = cap_init
+            child.docstr_waiting_arg = key
+            cap_stack.append(child)
+
+    # The futures to the pre_init namespaces waiting on their objects.
+    futures = {}
+
+    def submit(cap_init):
+        if shared is None or cap_init is root:
+            share_key = None
+        else:
+            share_key = shared.get_key(cap_init)
+        if shared is not None and share_key in shared:
+            future = shared.get(share_key)
+        else:
+            future = executor.submit(
+                cap_init.docstr_type,
+                **cap_init.docstr_args,
+            )
+            if shared is not None:
+                shared.add(share_key, future, cap_init)
+        futures.setdefault(future, []).append(cap_init)
+
+    for cap_init in ready:
+        submit(cap_init)
+
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            for cap_init in futures.pop(future):
+                if cap_init is root:
+                    return future.result()
+
+                parent = cap_init.docstr_parent
+                parent.docstr_args[cap_init.docstr_waiting_arg] = \
+                    future.result()
+                parent.docstr_pending -= 1
+                if not parent.docstr_pending:
+                    submit(parent)
+
+
+class InitPlanError(ValueError):
+    """The namespace given to an InitPlan is not of the shape it was compiled
+    from, e.g. with a different arg or nested namespace.
+    """
+
+
+@dataclass
+class InitStep:
+    """The construction of one object of a compiled InitPlan.
+
+    Attributes
+    ----------
+    key : str = None
+        The arg of the parent's namespace that is this object's namespace,
+        None for the entry object.
+    parent : int = None
+        The index of the step constructing the parent of this object.
+    num_args : int = 0
+        The number of args of this object's namespace, including its
+        `docstr_type` and nested namespaces.
+    arg_keys : tuple = ()
+        The args of the namespace given as is to the object's `docstr_type`.
+    nested : tuple = ()
+        The (arg, step index) pairs of the nested objects given to the
+        object's `docstr_type`.
+    """
+    key : str = None
+    parent : int = None
+    num_args : int = 0
+    arg_keys : tuple = ()
+    nested : tuple = ()
+
+
+def _get_namespace_args(namespace):
+    """Returns the mapping of the namespace's arg names to values and the
+    number of its args, without copying the args of a NestedNamespace.
+    """
+    if isinstance(namespace, OverlayNamespace):
+        base = vars(namespace._base)
+        overrides = namespace._overrides
+        num_args = len(base) + sum(name not in base for name in overrides)
+        return ChainMap(overrides, base), num_args
+    if not isinstance(namespace, NestedNamespace):
+        raise InitPlanError(f'Expected a NestedNamespace, not: {namespace!r}')
+    args = vars(namespace)
+    return args, len(args)
+
+
+class InitPlan(object):
+    """The initialization of a program compiled from the shape of its parsed
+    namespace, i.e. its args and nested namespaces, to initialize many
+    namespaces of the same shape without walking nor copying them as
+    `init_prog()` does for each.
+
+    Attributes
+    ----------
+    steps : [InitStep]
+        The objects in the order `init_prog()` constructs them, where each
+        nested object precedes its parent and the entry object is last.
+
+    Notes
+    -----
+    Args are checked to be the compiled ones by their names and count, not
+    by whether their values are nested namespaces, which is fixed by the
+    program's parser.
+    """
+    def __init__(self, steps):
+        self.steps = steps
+
+    @classmethod
+    def compile(cls, prog_args):
+        """Returns the plan of initializing the namespace's program.
+
+        Args
+        ----
+        prog_args : NestedNamespace
+            The parsed args of the program whose shape is compiled.
+
+        Returns
+        -------
+        InitPlan
+        """
+        def get_frame(key, namespace):
+            args = namespace_items(namespace)
+            return {
+                'step': InitStep(
+                    key=key,
+                    num_args=len(args),
+                    arg_keys=tuple(
+                        name for name, value in args
+                        if name != 'docstr_type'
+                        and not isinstance(value, NestedNamespace)
+                    ),
+                ),
+                'waiting': [
+                    (name, value) for name, value in args
+                    if name != 'docstr_type'
+                    and isinstance(value, NestedNamespace)
+                ],
+                'nested': [],
+            }
+
+        # Mirrors the stack of init_prog(), which pops the last nested first.
+        steps = []
+        stack = [get_frame(None, prog_args)]
+        while stack:
+            if stack[-1]['waiting']:
+                stack.append(get_frame(*stack[-1]['waiting'].pop()))
+                continue
+            frame = stack.pop()
+            step = frame['step']
+            step.nested = tuple(frame['nested'])
+            for _, child in step.nested:
+                steps[child].parent = len(steps)
+            if stack:
+                stack[-1]['nested'].append((step.key, len(steps)))
+            steps.append(step)
+        return cls(steps)
+
+    def init(self, prog_args):
+        """Initializes the program of the namespace following the plan.
+
+        Args
+        ----
+        prog_args : NestedNamespace
+            The parsed args of the program, of the compiled shape.
+
+        Returns
+        -------
+        object
+            The initialized entry object of the program.
+
+        Raises
+        ------
+        InitPlanError
+            If the namespace is not of the compiled shape, which is checked
+            before any object is constructed.
+        """
+        steps = self.steps
+        types = [None] * len(steps)
+        kwargs = [None] * len(steps)
+
+        # The namespaces' args are resolved from the entry object's down.
+        namespace_args = [None] * len(steps)
+        for index in range(len(steps) - 1, -1, -1):
+            step = steps[index]
+            try:
+                if step.parent is None:
+                    namespace = prog_args
+                else:
+                    namespace = namespace_args[step.parent][step.key]
+                args, num_args = _get_namespace_args(namespace)
+                if num_args != step.num_args:
+                    raise InitPlanError(
+                        f'Expected {step.num_args} args, not {num_args}, in '
+                        f'the namespace of `{step.key or "docstr_type"}`.'
+                    )
+                types[index] = args['docstr_type']
+                kwargs[index] = {key: args[key] for key in step.arg_keys}
+            except KeyError as e:
+                raise InitPlanError(
+                    f'Missing the arg {e} in the namespace of '
+                    f'`{step.key or "docstr_type"}`.'
+                ) from None
+            namespace_args[index] = args
+
+        objs = [None] * len(steps)
+        for index, step in enumerate(steps):
+            step_kwargs = kwargs[index]
+            for key, child in step.nested:
+                step_kwargs[key] = objs[child]
+            objs[index] = types[index](**step_kwargs)
+        return objs[-1]
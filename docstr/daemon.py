@@ -0,0 +1,447 @@
+"""A warm docstr daemon, `docstr serve`, that keeps docstr, the programs'
+modules, and their parsed docstrings loaded, and forks a worker per
+`docstr run --docstr.via_daemon` request whose output is streamed back to the
+client over a Unix socket.
+
+This module only imports the standard library at the module level, as the
+`docstr` console script, `docstr.cli.console.main()`, sends single runs to the
+daemon before importing docstr's docstring parsing, sphinx, or docutils.
+"""
+from dataclasses import dataclass
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import threading
+import traceback
+
+# The frames sent over the socket are a kind byte and the length of the data.
+FRAME_HEADER = struct.Struct('!cI')
+REQUEST = b'r'
+STDOUT = b'o'
+STDERR = b'e'
+EXIT = b'x'
+
+
+def get_socket_path(socket_path=None):
+    """Returns the daemon's socket path, defaulting to the `DOCSTR_SOCKET`
+    environment variable, then `~/.cache/docstr/daemon.sock`.
+    """
+    if socket_path is not None:
+        return socket_path
+    return os.environ.get('DOCSTR_SOCKET', os.path.join(
+        os.path.expanduser('~'),
+        '.cache',
+        'docstr',
+        'daemon.sock',
+    ))
+
+
+def send_frame(sock, kind, data):
+    """Sends the bytes as a frame of the given kind."""
+    sock.sendall(FRAME_HEADER.pack(kind, len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def recv_frame(sock):
+    """Returns the (kind, data) of the next frame, or None if disconnected."""
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    kind, size = FRAME_HEADER.unpack(header)
+    data = _recv_exact(sock, size)
+    if data is None:
+        return None
+    return kind, data
+
+
+def _write(stream, data):
+    """Writes the bytes to the text stream, through its buffer if it has one.
+    """
+    buffer = getattr(stream, 'buffer', None)
+    if buffer is None:
+        stream.write(data.decode(errors='replace'))
+    else:
+        stream.flush()
+        buffer.write(data)
+        buffer.flush()
+
+
+def run_via_daemon(
+    config,
+    prog_args=None,
+    socket_path=None,
+    options=None,
+    stdout=None,
+    stderr=None,
+    lazy_config=False,
+):
+    """Runs the config's program in a worker forked by the docstr daemon.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    prog_args : [str] = None
+        The arguments for the python program that override its config.
+    socket_path : str = None
+        The path of the daemon's Unix socket. See `get_socket_path()`.
+    options : dict = None
+        The keyword arguments of `docstr.cli.cli.run_program()`, e.g.
+        `init_jobs`, for running the program.
+    stdout : file = sys.stdout
+        The stream the worker's stdout is written to as it is received.
+    stderr : file = sys.stderr
+        The stream the worker's stderr is written to as it is received.
+    lazy_config : bool = False
+        If True, the daemon loads the config's program with only the
+        sections of the config that are the program's args constructed. See
+        `docstr.cli.cli.load_program()`.
+
+    Returns
+    -------
+    int
+        The exit status of the program.
+    """
+    if stdout is None:
+        stdout = sys.stdout
+    if stderr is None:
+        stderr = sys.stderr
+
+    request = {
+        'config': os.path.abspath(config),
+        'prog_args': [] if prog_args is None else list(prog_args),
+        'cwd': os.getcwd(),
+        'options': {} if options is None else options,
+        'lazy_config': lazy_config,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(get_socket_path(socket_path))
+        send_frame(sock, REQUEST, json.dumps(request).encode())
+        while True:
+            frame = recv_frame(sock)
+            if frame is None:
+                print(
+                    'The docstr daemon disconnected before the run finished.',
+                    file=stderr,
+                )
+                return 1
+            kind, data = frame
+            if kind == STDOUT:
+                _write(stdout, data)
+            elif kind == STDERR:
+                _write(stderr, data)
+            elif kind == EXIT:
+                return int(data)
+
+
+def _get_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class WarmProgram:
+    """A loaded program of the daemon and the files it was loaded from.
+
+    Attributes
+    ----------
+    cap_namespace : NestedNamespace
+        The reformatted config namespace from `load_program()`.
+    prog_parser : docstr.configargparse.ProgramParser
+    files : {str: (int, int)}
+        The config and its included files to their mtime and size.
+    modules : {str: (str, (int, int))}
+        The modules of the program to their source file and its mtime and
+        size.
+    """
+    cap_namespace : object
+    prog_parser : object
+    files : dict
+    modules : dict
+
+    def get_stale_modules(self):
+        """Returns the names of the modules whose source files changed."""
+        return {
+            name for name, (path, stamp) in self.modules.items()
+            if _get_stamp(path) != stamp
+        }
+
+    def is_stale(self):
+        """Returns True if the config, its includes, or modules changed."""
+        return bool(self.get_stale_modules()) or any(
+            _get_stamp(path) != stamp for path, stamp in self.files.items()
+        )
+
+
+class DocstrDaemon(object):
+    """A server of warm docstr programs over a Unix socket.
+
+    Attributes
+    ----------
+    socket_path : str = None
+        The path of the Unix socket. See `get_socket_path()`.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+
+    Notes
+    -----
+    Programs are loaded in the daemon's process, one request at a time, so
+    every later request of the same config skips loading it, while the
+    programs themselves run concurrently in forked workers. When a module's
+    source file changes, it is removed from `sys.modules` and every program
+    that uses it is loaded again, importing the module anew.
+    """
+    def __init__(self, socket_path=None, cache_dir=None):
+        self.socket_path = get_socket_path(socket_path)
+        self.cache_dir = cache_dir
+        self.programs = {}
+        self._sock = None
+
+    def load(self, config, lazy_config=False):
+        """Returns the WarmProgram of the config, loading it if it is missing
+        or stale, where lazily composed configs are loaded separately. See
+        `docstr.cli.cli.load_program()`.
+        """
+        # Imported here, so the client never imports docstr's parsing.
+        from docstr.cache import get_token_modules
+        from docstr.cli.cli import load_program
+
+        warm = self.programs.get((config, lazy_config))
+        if warm is not None:
+            stale_modules = warm.get_stale_modules()
+            if stale_modules:
+                for name in stale_modules:
+                    sys.modules.pop(name, None)
+                self.programs = {
+                    key: program for key, program in self.programs.items()
+                    if not stale_modules & program.modules.keys()
+                }
+                warm = None
+            elif warm.is_stale():
+                warm = None
+
+        if warm is None:
+            cap_namespace, prog_parser = load_program(
+                config,
+                self.cache_dir,
+                lazy=lazy_config,
+            )
+            namespace = cap_namespace.docstr.namespace
+            module_names = get_token_modules(prog_parser.tokens)
+            module_names.update(
+                namespace[name].__module__ for name in namespace.used()
+            )
+
+            modules = {}
+            for name in module_names:
+                path = getattr(sys.modules.get(name), '__file__', None)
+                if path is not None:
+                    modules[name] = (path, _get_stamp(path))
+
+            files = {config: _get_stamp(config)}
+            for path in cap_namespace.docstr.includes:
+                files[path] = _get_stamp(path)
+
+            warm = WarmProgram(cap_namespace, prog_parser, files, modules)
+            self.programs[config, lazy_config] = warm
+        return warm
+
+    def serve_forever(self):
+        """Serves requests until interrupted, then removes the socket."""
+        if os.path.exists(self.socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX) as sock:
+                    sock.connect(self.socket_path)
+            except OSError:
+                # A stale socket of a daemon that did not exit cleanly.
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError(
+                    f'A docstr daemon is already serving `{self.socket_path}`'
+                )
+
+        dirname = os.path.dirname(self.socket_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        # Workers are reaped automatically.
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # Only the user may connect, from the moment the socket exists.
+            umask = os.umask(0o177)
+            try:
+                self._sock.bind(self.socket_path)
+            finally:
+                os.umask(umask)
+            self._sock.listen()
+            logging.info('docstr daemon serving `%s`', self.socket_path)
+            while True:
+                conn, _ = self._sock.accept()
+                with conn:
+                    self.handle(conn)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._sock.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def handle(self, conn):
+        """Loads the requested program and forks a worker to run it."""
+        frame = recv_frame(conn)
+        if frame is None or frame[0] != REQUEST:
+            return
+        request = json.loads(frame[1])
+
+        try:
+            warm = self.load(
+                request['config'],
+                request.get('lazy_config', False),
+            )
+        except BaseException as e:
+            if isinstance(e, KeyboardInterrupt):
+                raise
+            send_frame(conn, STDERR, traceback.format_exc().encode())
+            send_frame(conn, EXIT, b'1')
+            return
+
+        if os.fork() == 0:
+            # The worker: never return into the daemon's loop.
+            exit_status = 1
+            try:
+                self._sock.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                exit_status = run_worker(conn, request, warm)
+            finally:
+                os._exit(exit_status)
+
+
+def _relay(conn, fds):
+    """Sends the output read from the file descriptors until they close."""
+    selector = selectors.DefaultSelector()
+    for fd, kind in fds.items():
+        selector.register(fd, selectors.EVENT_READ, kind)
+    while selector.get_map():
+        for key, _ in selector.select():
+            data = os.read(key.fd, 1 << 16)
+            if data:
+                send_frame(conn, key.data, data)
+            else:
+                selector.unregister(key.fd)
+                os.close(key.fd)
+
+
+def run_worker(conn, request, warm):
+    """Runs the requested program in this forked worker, streaming its stdout
+    and stderr over the connection, then sends its exit status.
+
+    Returns
+    -------
+    int
+        The exit status of the program.
+    """
+    from docstr.cli.batch import get_exit_status
+    from docstr.cli.cli import run_program
+
+    out_read, out_write = os.pipe()
+    err_read, err_write = os.pipe()
+    relay = threading.Thread(
+        target=_relay,
+        args=(conn, {out_read: STDOUT, err_read: STDERR}),
+    )
+    relay.start()
+
+    # Redirect at the file descriptors, so output of C code is streamed too.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(out_write, 1)
+    os.dup2(err_write, 2)
+    os.close(out_write)
+    os.close(err_write)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    try:
+        os.chdir(request['cwd'])
+        run_program(
+            warm.cap_namespace,
+            warm.prog_parser,
+            request['prog_args'],
+            **request['options'],
+        )
+        exit_status = 0
+    except SystemExit as e:
+        exit_status = get_exit_status(e)
+        if not (e.code is None or isinstance(e.code, int)):
+            print(e.code, file=sys.stderr)
+    except BaseException:
+        traceback.print_exc()
+        exit_status = 1
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.close(1)
+    os.close(2)
+    relay.join()
+    send_frame(conn, EXIT, str(exit_status).encode())
+    return exit_status
+
+
+def serve(socket_path=None, cache_dir=None):
+    """Runs the docstr daemon until interrupted. See DocstrDaemon."""
+    # Warm up docstr's docstring parsing and sphinx before any request.
+    import docstr.cli.cli
+
+    DocstrDaemon(socket_path, cache_dir).serve_forever()
+
+
+def get_client_args(argv):
+    """Returns the (config, prog_args, socket_path) of the arguments of
+    `docstr run --docstr.via_daemon`, or None if any other docstr argument is
+    given, which the full docstr parser then handles.
+    """
+    config = None
+    socket_path = None
+    prog_args = []
+    args = iter(argv)
+    for arg in args:
+        if arg == '--docstr.via_daemon':
+            continue
+        if arg == '--docstr.socket':
+            socket_path = next(args, None)
+        elif arg.startswith('--docstr.socket='):
+            socket_path = arg.partition('=')[2]
+        elif arg.startswith('--docstr.') or arg in {'-j', '-h', '--help'}:
+            return None
+        elif config is None and not arg.startswith('-'):
+            config = arg
+        elif arg.endswith('.yaml'):
+            # Possibly multiple configs, which the full docstr parser handles.
+            return None
+        else:
+            prog_args.append(arg)
+    if config is None or not config.endswith('.yaml'):
+        return None
+    return config, prog_args, socket_path
@@ -0,0 +1,153 @@
+"""Lazy resolution of the objects listed under `docstr: from import` in a
+config, such that a module is only imported once the program refers to one of
+its objects, e.g. as the entry object, a configurable object's key in the
+config, or the type of an arg in the parsed docstrings.
+"""
+from collections.abc import Mapping
+from importlib import import_module
+from operator import attrgetter
+import threading
+
+from docstr.docstring import get_full_qual_name
+
+
+class LazyImports(Mapping):
+    """The names of the `from import` objects to the objects, where an object
+    is imported on its first access.
+
+    Membership, iteration, and length only use the names, so they import
+    nothing.
+
+    Attributes
+    ----------
+    from_import : dict
+        The modules to the name, or list of names, of the objects imported
+        from them, as in the `docstr: from import` config.
+    """
+    def __init__(self, from_import):
+        self.from_import = from_import
+        self._modules = {}
+        for module, objs in from_import.items():
+            if isinstance(objs, str):
+                objs = [objs]
+            elif not isinstance(objs, list):
+                raise TypeError(
+                    f'Unexpected module mapped value type: {type(objs)}'
+                )
+            for obj in objs: # NOTE does not support `from import as`
+                self._modules[obj] = module
+
+        self._objects = {}
+        self._used = set()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Objects are imported again on access, but stay marked as used.
+        return {'from_import': self.from_import, 'used': self._used}
+
+    def __setstate__(self, state):
+        self.__init__(state['from_import'])
+        self._used.update(state['used'])
+
+    def __getitem__(self, name):
+        try:
+            return self._objects[name]
+        except KeyError:
+            pass
+        module = self._modules[name]
+        with self._lock:
+            if name not in self._objects:
+                self._objects[name] = attrgetter(name)(import_module(module))
+                self._used.add(name)
+        return self._objects[name]
+
+    def __contains__(self, name):
+        return name in self._modules
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __len__(self):
+        return len(self._modules)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyImports):
+            return self._modules == other._modules
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return ''.join([
+            f'{type(self).__name__}({len(self)} objects, ',
+            f'{len(self._used)} used)',
+        ])
+
+    def get_module(self, name):
+        """Returns the name of the module the object is imported from."""
+        return self._modules[name]
+
+    def is_used(self, name):
+        """Returns True if the object was accessed."""
+        return name in self._used
+
+    def used(self):
+        """Returns the names of the accessed objects in the config's order."""
+        return [name for name in self._modules if name in self._used]
+
+    def unused(self):
+        """Returns the names of the objects that were never accessed."""
+        return [name for name in self._modules if name not in self._used]
+
+
+class LazyWhitelist(set):
+    """The fully qualified names of the `from import` objects of LazyImports,
+    for `docstr.parsing.DocstringParser`'s whitelist, resolving only the
+    objects whose name matches a queried qualified name.
+
+    Attributes
+    ----------
+    imports : LazyImports
+
+    Notes
+    -----
+    An object is found by the last part of its name in the config, which is
+    expected to be the last part of its `__qualname__`, so an alias of an
+    object under a different name is only found once it is otherwise used.
+    Iterating resolves every object.
+    """
+    def __init__(self, imports):
+        super().__init__()
+        self.imports = imports
+
+    def __reduce__(self):
+        return LazyWhitelist, (self.imports,)
+
+    def __contains__(self, qname):
+        if super().__contains__(qname):
+            return True
+        if not isinstance(qname, str):
+            return False
+
+        last = qname.rpartition('.')[2]
+        for name in self.imports:
+            if name.rpartition('.')[2] == last:
+                self.add(get_full_qual_name(self.imports[name]))
+        for name in self.imports.used():
+            self.add(get_full_qual_name(self.imports[name]))
+        return super().__contains__(qname)
+
+    def __iter__(self):
+        for name in self.imports:
+            self.add(get_full_qual_name(self.imports[name]))
+        return super().__iter__()
+
+    def __len__(self):
+        return len(self.imports)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyWhitelist):
+            return self.imports == other.imports
+        return set(iter(self)) == other
+
+    __hash__ = None
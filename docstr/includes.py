@@ -0,0 +1,201 @@
+"""Linking of yaml config files through the `!docstr.include` tag, where every
+included file is parsed once per process and shared by every config that
+includes it, until the file changes.
+
+A config links to another config file, or a section of it, by:
+```
+model: !docstr.include shared/model.yaml
+optimizer: !docstr.include shared/training.yaml#optimizer.adam
+```
+where relative paths are relative to the including file's directory.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+import hashlib
+import os
+import threading
+
+import yaml
+
+
+@dataclass
+class IncludeEntry:
+    """A parsed config file cached for including it again.
+
+    Attributes
+    ----------
+    stamp : (int, int)
+        The modification time in nanoseconds and the size of the file when it
+        was parsed or last found unchanged.
+    digest : str
+        The sha256 hex digest of the file's contents.
+    data : object
+        The parsed yaml of the file, which must be treated as read-only.
+    includes : {str: str}
+        The paths of every file included by the file, directly or not, to
+        their digest when the file was parsed.
+    """
+    stamp : tuple
+    digest : str
+    data : object
+    includes : dict
+
+
+_INCLUDE_CACHE = {}
+_INCLUDE_LOCK = threading.RLock()
+_include_state = threading.local()
+
+
+def _get_frames():
+    """Returns the (path, includes) of the files being loaded by this thread.
+    """
+    if not hasattr(_include_state, 'frames'):
+        _include_state.frames = []
+    return _include_state.frames
+
+
+def _get_stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_cached(path, loader):
+    """Returns the cached entry of the file if neither it nor its includes
+    changed, otherwise None.
+    """
+    with _INCLUDE_LOCK:
+        entry = _INCLUDE_CACHE.get((path, loader))
+    if entry is None:
+        return None
+
+    try:
+        stamp = _get_stamp(path)
+    except OSError:
+        return None
+    if stamp != entry.stamp:
+        # Only the content matters, e.g. a touched file is still unchanged.
+        with open(path, 'rb') as openf:
+            if hashlib.sha256(openf.read()).hexdigest() != entry.digest:
+                return None
+        entry.stamp = stamp
+
+    for include, digest in entry.includes.items():
+        included = _get_cached(include, loader)
+        if included is None or included.digest != digest:
+            return None
+    return entry
+
+
+def clear_include_cache():
+    """Removes every parsed config file from the include cache."""
+    with _INCLUDE_LOCK:
+        _INCLUDE_CACHE.clear()
+
+
+@contextmanager
+def track_includes(path):
+    """Records the files included while loading the yaml config at path.
+
+    Args
+    ----
+    path : str
+        The path of the config being loaded, such that including it from one
+        of its includes is detected as a cycle.
+
+    Yields
+    ------
+    {str: str}
+        The absolute paths of every file included by the config, directly or
+        not, to their sha256 hex digest, filled in as the config is loaded.
+    """
+    includes = {}
+    frames = _get_frames()
+    frames.append((os.path.abspath(path), includes))
+    try:
+        yield includes
+    finally:
+        frames.pop()
+
+
+def load_include(path, loader=yaml.SafeLoader):
+    """Loads the yaml config file, parsing it only if it is not cached or if
+    it or any file it includes changed since it was parsed.
+
+    Args
+    ----
+    path : str
+        The path of the yaml config file.
+    loader : yaml.SafeLoader = yaml.SafeLoader
+        The loader class used to parse the file and its includes.
+
+    Returns
+    -------
+    object
+        The parsed yaml, which is shared by every config that includes the
+        file and so must not be modified.
+
+    Raises
+    ------
+    ValueError
+        If the file is being loaded already, i.e. the includes are cyclic.
+    """
+    path = os.path.abspath(path)
+    frames = _get_frames()
+    chain = [frame_path for frame_path, _ in frames]
+    if path in chain:
+        raise ValueError(' '.join([
+            'Cyclic docstr config includes:',
+            ' -> '.join(chain[chain.index(path):] + [path]),
+        ]))
+
+    entry = _get_cached(path, loader)
+    if entry is None:
+        stamp = _get_stamp(path)
+        with open(path, 'rb') as openf:
+            content = openf.read()
+
+        with track_includes(path) as includes:
+            data = yaml.load(content, Loader=loader)
+
+        entry = IncludeEntry(
+            stamp=stamp,
+            digest=hashlib.sha256(content).hexdigest(),
+            data=data,
+            includes=includes,
+        )
+        with _INCLUDE_LOCK:
+            _INCLUDE_CACHE[(path, loader)] = entry
+
+    for _, includes in frames:
+        includes[path] = entry.digest
+        includes.update(entry.includes)
+    return entry.data
+
+
+def include_constructor(loader, node):
+    """Constructs the yaml of the `!docstr.include path[#dotted.key]` tag."""
+    path, _, key = loader.construct_scalar(node).partition('#')
+
+    frames = _get_frames()
+    parent = frames[-1][0] if frames else os.path.abspath(loader.name)
+    path = os.path.join(
+        os.path.dirname(parent),
+        os.path.expanduser(path.strip()),
+    )
+
+    data = load_include(path, type(loader))
+    if key:
+        for name in key.split('.'):
+            try:
+                data = data[name]
+            except (KeyError, TypeError):
+                raise ValueError(
+                    f'The included config `{path}` has no `{key}`.'
+                )
+    return data
+
+
+def add_includes(loader):
+    """Adds the `!docstr.include` tag to the yaml loader class."""
+    loader.add_constructor('!docstr.include', include_constructor)
+    return loader
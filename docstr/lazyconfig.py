@@ -0,0 +1,150 @@
+"""Lazily constructed yaml configs, where the yaml is composed into nodes and
+each mapping's values are only constructed into python objects when they are
+first accessed, such that large unused sections of a config cost no more than
+parsing their text.
+"""
+from collections.abc import Mapping
+import threading
+
+import yaml
+
+MAP_TAG = 'tag:yaml.org,2002:map'
+
+
+class LazyMapping(Mapping):
+    """A read-only mapping of a composed yaml MappingNode whose values are
+    constructed on first access.
+
+    Untagged nested mappings are LazyMappings themselves, while any other
+    value, including tagged mappings, is fully constructed by the loader when
+    it is first accessed. The keys are constructed when the LazyMapping is
+    created.
+
+    Attributes
+    ----------
+    loader : yaml.SafeLoader
+        The loader instance that composed the node, used to construct values.
+    node : yaml.MappingNode
+        The composed node of the mapping.
+
+    Notes
+    -----
+    Pickling a LazyMapping pickles the yaml text of its node, not its values.
+    """
+    __slots__ = ('_loader', '_node', '_nodes', '_values', '_lock')
+
+    def __init__(self, loader, node, lock=None):
+        self._loader = loader
+        self._node = node
+        self._lock = threading.RLock() if lock is None else lock
+
+        with self._lock:
+            # Resolves yaml merge keys, `<<`, into the node's values.
+            loader.flatten_mapping(node)
+            self._nodes = {}
+            for key_node, value_node in node.value:
+                key = loader.construct_object(key_node, deep=True)
+                self._nodes[key] = value_node
+        self._values = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value_node = self._nodes[key]
+        with self._lock:
+            if key not in self._values:
+                if (
+                    isinstance(value_node, yaml.MappingNode)
+                    and value_node.tag == MAP_TAG
+                ):
+                    value = LazyMapping(self._loader, value_node, self._lock)
+                else:
+                    value = self._loader.construct_object(
+                        value_node,
+                        deep=True,
+                    )
+                self._values[key] = value
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._nodes
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __repr__(self):
+        constructed = sum(key in self._values for key in self._nodes)
+        return ''.join([
+            f'<{type(self).__name__} of {len(self)} keys, ',
+            f'{constructed} constructed>',
+        ])
+
+    def __reduce__(self):
+        # Pickles the yaml of the node, so unpickling stays lazy.
+        return load_lazy, (
+            yaml.serialize(self._node, Dumper=yaml.SafeDumper),
+            type(self._loader),
+            self._loader.name,
+        )
+
+    def is_mapping(self, key):
+        """Returns True if the key's value is a LazyMapping, without
+        constructing it.
+        """
+        value_node = self._nodes[key]
+        return (
+            isinstance(value_node, yaml.MappingNode)
+            and value_node.tag == MAP_TAG
+        )
+
+    def is_constructed(self, key):
+        """Returns True if the key's value was constructed already."""
+        return key in self._values
+
+    def to_dict(self):
+        """Returns the mapping as a dict, constructing every value."""
+        return {
+            key: value.to_dict() if isinstance(value, LazyMapping) else value
+            for key, value in self.items()
+        }
+
+
+def load_lazy(stream, loader=yaml.SafeLoader, name=None):
+    """Composes the yaml stream into nodes without constructing them.
+
+    Args
+    ----
+    stream : str | file
+        The yaml text or an open file of it.
+    loader : yaml.SafeLoader | yaml.CSafeLoader = yaml.SafeLoader
+        The loader class used to compose and later construct the yaml.
+    name : str = None
+        The path of the yaml file, if the stream is not an open file of it,
+        which relative `!docstr.include` paths are relative to.
+
+    Returns
+    -------
+    LazyMapping | object
+        The LazyMapping of the document if it is an untagged mapping,
+        otherwise the fully constructed document.
+    """
+    loader_obj = loader(stream)
+    if name is None:
+        # The C loaders, e.g. yaml.CSafeLoader, do not name their stream.
+        name = getattr(loader_obj, 'name', None) or getattr(
+            stream,
+            'name',
+            '<unicode string>',
+        )
+    loader_obj.name = name
+    node = loader_obj.get_single_node()
+    if node is None:
+        return None
+    if isinstance(node, yaml.MappingNode) and node.tag == MAP_TAG:
+        return LazyMapping(loader_obj, node)
+    return loader_obj.construct_document(node)
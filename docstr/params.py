@@ -1,19 +1,1119 @@
 """Parameter iteration and searching to specify either multiple models to run
 or to perform a parameter search over models, recording the results as desired.
 """
+from collections import OrderedDict
+from contextlib import redirect_stderr
+from dataclasses import dataclass
+from functools import reduce
+import hashlib
+from io import StringIO
+import json
+import math
+from operator import mul
+import random
+from types import BuiltinFunctionType, FunctionType
+
+from docstr.cli.batch import pool_imap, run_captured
+from docstr.cli.cli import load_program, run_main
+from docstr.configargparse import (
+    NestedNamespace,
+    OverlayNamespace,
+    cast_bool_str,
+    get_docstring_args,
+    namespace_items,
+)
+from docstr.docstring import (
+    ValueExists,
+    MultiType,
+    ClassDocstring,
+    FuncDocstring,
+    get_full_qual_name,
+)
+from docstr.results import (
+    ResultsStore,
+    TrialRecord,
+    get_config_hash,
+    to_json_value,
+)
 
 # TODO python primitives
 # TODO numpy dtypes
 # TODO PyTorch dtypes
 # TODO Tensorflow dtypes
 
-# TODO Generic Discrete param handling (lists)
 # TODO Hierarchial / Structured param handling (vectors, tensors, ragged arrays)
-# TODO Generic conintuous param handling (ranges)
 
-# TODO Iteration (discrete)
 # TODO Search
-#   grid search
 #   binary search
 #   alternating param search (using pyrameter or SHADHO probably begins here,
 #   for uncertainty and priority of which params get searched?)
+
+@dataclass
+class Trial:
+    """A single configuration of a program within a parameter search.
+
+    Attributes
+    ----------
+    index : int
+        The position of this trial within its search.
+    args : dict
+        The flat dict of dotted argument names to the values that update the
+        program's config for this trial.
+    config_hash : str = None
+        The canonical hash of the trial's resolved config, if it has been
+        hashed. See `get_canonical_hash()`.
+    """
+    index : int
+    args : dict
+    config_hash : str = None
+
+
+def get_arg_doc(tokens, name):
+    """Returns the ArgDoc of the dotted argument name within the tokens.
+
+    Args
+    ----
+    tokens : ClassDocstring | FuncDocstring
+        The root of the parsed tokens of the python program.
+    name : str
+        The dotted argument name as in the program's flattened config, e.g.
+        `very_useful_class.x`.
+
+    Returns
+    -------
+    docstr.docstring.ArgDoc
+    """
+    docstring = tokens
+    parts = name.split('.')
+    for i, part in enumerate(parts):
+        args = get_docstring_args(docstring)
+        if part not in args:
+            raise KeyError(
+                f'`{name}` is not an argument of the program, as `{part}` is '
+                f'not an argument of `{docstring.name}`.'
+            )
+        arg = args[part]
+        if i < len(parts) - 1:
+            if not isinstance(arg.type, (ClassDocstring, FuncDocstring)):
+                raise KeyError(
+                    f'`{name}` is not an argument of the program, as '
+                    f'`{part}` is not a configurable object.'
+                )
+            docstring = arg.type
+    return arg
+
+
+def is_literal_multitype(arg_type):
+    """True if the type is a MultiType of only literals, i.e. choices."""
+    return isinstance(arg_type, MultiType) and all(
+        not isinstance(t, type) for t in arg_type
+    )
+
+
+def get_arg_cast(arg):
+    """Returns the callable that casts an argument's str values as the
+    program's ConfigArgParser does.
+    """
+    if arg.type is bool or arg.type is cast_bool_str:
+        return cast_bool_str
+    if arg.type is ValueExists.false:
+        return str
+    return arg.type
+
+
+def get_param_values(arg, spec):
+    """Expands the search space spec of an argument into its values.
+
+    Args
+    ----
+    arg : docstr.docstring.ArgDoc
+        The argument whose values are searched over.
+    spec : None | list | dict | object
+        The values of the argument to search over. None is all choices of a
+        literal MultiType or bool. A list is the values themselves. A dict is
+        a range of numbers with the keys `start`, `stop` (exclusive) and
+        `step`, where `start` defaults to the argument's default and `step` to
+        1. Any other object is the single value of the argument.
+
+    Returns
+    -------
+    list | range
+        The values of the argument to search over.
+    """
+    if isinstance(arg.type, (ClassDocstring, FuncDocstring)):
+        raise TypeError(
+            f'Unable to search over the configurable object `{arg.name}`, '
+            'search over its arguments instead.'
+        )
+
+    if spec is None:
+        if is_literal_multitype(arg.type):
+            return list(arg.type)
+        if arg.type is bool or arg.type is cast_bool_str:
+            return [False, True]
+        raise ValueError(
+            f'The values of `{arg.name}` must be given, as only a literal '
+            f'MultiType or bool is able to be enumerated, not {arg.type}.'
+        )
+
+    if isinstance(spec, list):
+        return spec
+
+    if isinstance(spec, dict):
+        unexpected = spec.keys() - {'start', 'stop', 'step'}
+        if unexpected or 'stop' not in spec:
+            raise ValueError(
+                f'The range of `{arg.name}` expects the keys `stop` and '
+                f'optionally `start` and `step`, but was given: {spec}'
+            )
+        start = spec.get('start', arg.default)
+        if start is ValueExists.false:
+            raise ValueError(
+                f'The range of `{arg.name}` must be given a `start` as the '
+                'argument has no default.'
+            )
+        stop = spec['stop']
+        step = spec.get('step', 1)
+
+        if all(isinstance(x, int) for x in (start, stop, step)):
+            return range(start, stop, step)
+        num = max(math.ceil((stop - start) / step), 0)
+        return [start + i * step for i in range(num)]
+
+    return [spec]
+
+
+def validate_param_values(arg, values):
+    """Returns the errors of the values not castable to the argument's type or
+    not within the choices of its literal MultiType.
+    """
+    cast = get_arg_cast(arg)
+    choices = arg.type if is_literal_multitype(arg.type) else None
+
+    errors = []
+    for value in values:
+        # None uses the default and lists are passed to the parser as is.
+        if value is None or isinstance(value, list):
+            continue
+        try:
+            cast_value = cast(str(value))
+        except (TypeError, ValueError) as e:
+            errors.append(
+                f'`{arg.name}` value `{value}` is not castable to '
+                f'{arg.type}: {e}'
+            )
+            continue
+        if choices is not None and cast_value not in choices:
+            errors.append(
+                f'`{arg.name}` value `{value}` is not one of the choices: '
+                f'{choices}'
+            )
+    return errors
+
+
+def get_search_space(tokens, space):
+    """Expands and validates the search space against the program's tokens.
+
+    Args
+    ----
+    tokens : ClassDocstring | FuncDocstring
+        The root of the parsed tokens of the python program.
+    space : dict
+        The dotted argument names to their search space spec as in the
+        program's config under `docstr: sweep:`. See `get_param_values()`.
+
+    Returns
+    -------
+    OrderedDict({str: list | range})
+        The dotted argument names to their values to search over.
+
+    Raises
+    ------
+    ValueError
+        With every invalid argument name and value in the search space, such
+        that all are reported before any trial starts.
+    """
+    search_space = OrderedDict()
+    errors = []
+    for name, spec in space.items():
+        try:
+            arg = get_arg_doc(tokens, name)
+            values = get_param_values(arg, spec)
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append(str(e).strip('"\''))
+            continue
+
+        value_errors = validate_param_values(arg, values)
+        if value_errors:
+            errors += value_errors
+        elif len(values) < 1:
+            errors.append(f'`{name}` has no values to search over.')
+        else:
+            search_space[name] = values
+
+    if errors:
+        raise ValueError('Invalid search space:\n' + '\n'.join(errors))
+    return search_space
+
+
+def normalize_value(arg, value):
+    """Returns the value cast by the argument's type as if parsed from a str,
+    or the value as is if it is not a primitive or is not castable.
+    """
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        return value
+    try:
+        return get_arg_cast(arg)(str(value))
+    except (TypeError, ValueError):
+        return value
+
+
+def to_canonical_value(value):
+    """Returns the value as json, using qualified names for objects."""
+    if isinstance(value, (type, FunctionType, BuiltinFunctionType)):
+        return get_full_qual_name(value)
+    return to_json_value(value)
+
+
+def get_canonical_config(namespace, tokens):
+    """Returns the canonical form of the program's fully resolved namespace.
+
+    Args
+    ----
+    namespace : NestedNamespace
+        The namespace of the program's args from parsing its config and
+        arguments, with the `!docstr.configs` and docstring defaults applied.
+    tokens : ClassDocstring | FuncDocstring
+        The parsed tokens of the python program the namespace is for.
+
+    Returns
+    -------
+    dict
+        The flat dict of dotted argument names to their values sorted by name,
+        where every value is normalized through its argument's type, objects
+        are their qualified names, and values equal to their argument's
+        default are dropped, such that configs resolving to the same program
+        are equal.
+    """
+    canonical = {}
+    stack = [('', namespace, tokens)]
+    while stack:
+        prefix, nested, docstring = stack.pop()
+        args = {} if docstring is None else get_docstring_args(docstring)
+        for key, value in namespace_items(nested):
+            name = prefix + key
+            if key == 'docstr_type':
+                if docstring is None or value is not docstring.type:
+                    canonical[name] = to_canonical_value(value)
+                continue
+
+            arg = args.get(key, None)
+            if isinstance(value, NestedNamespace):
+                stack.append((
+                    f'{name}.',
+                    value,
+                    arg.type if arg is not None else None,
+                ))
+                continue
+
+            if arg is not None:
+                value = normalize_value(arg, value)
+                if (
+                    arg.default is not ValueExists.false
+                    and value == normalize_value(arg, arg.default)
+                ):
+                    continue
+            canonical[name] = to_canonical_value(value)
+    return dict(sorted(canonical.items()))
+
+
+def get_canonical_hash(namespace, tokens):
+    """Returns the sha256 hex digest of the namespace's canonical config.
+
+    See `get_canonical_config()`.
+    """
+    return hashlib.sha256(json.dumps(
+        get_canonical_config(namespace, tokens),
+        sort_keys=True,
+    ).encode()).hexdigest()
+
+
+def get_base_namespace(prog_parser, prog_args=None):
+    """Returns the program's namespace parsed from its config and arguments
+    to be shared by the overlays of its trials, or None if it fails to parse.
+    """
+    try:
+        with redirect_stderr(StringIO()):
+            return prog_parser.parse(prog_args)
+    except SystemExit:
+        return None
+
+
+def get_trial_overrides(prog_parser, args, prog_args=None):
+    """Returns the trial's args cast as the program's parser would cast them.
+
+    Args
+    ----
+    prog_parser : docstr.configargparse.ProgramParser
+        The parser of the program the trial is of.
+    args : dict
+        The flat dict of dotted argument names to the trial's values.
+    prog_args : [str] = None
+        The arguments for the python program, whose args are not overridden,
+        as they override the config the trial's args update.
+
+    Returns
+    -------
+    dict
+        The dotted argument names to their cast values.
+
+    Raises
+    ------
+    KeyError | TypeError | ValueError
+        If an arg is not of the program, or its value is not valid.
+    """
+    # The program's option strings are `--` followed by the arg's dest.
+    prog_dests = set()
+    for prog_arg in [] if prog_args is None else prog_args:
+        option = prog_arg.partition('=')[0]
+        if option.startswith('--') and option[2:] in prog_parser.binder.args:
+            prog_dests.add(option[2:])
+
+    overrides = {}
+    for name, value in args.items():
+        if name in prog_dests:
+            continue
+        arg = get_arg_doc(prog_parser.tokens, name)
+        if value is None:
+            # A null value in a config is the argument's default.
+            if arg.default is ValueExists.false:
+                raise ValueError(f'`{name}` is required but was null.')
+            value = arg.default
+        elif not isinstance(value, list):
+            value = get_arg_cast(arg)(str(value))
+            if is_literal_multitype(arg.type) and value not in arg.type:
+                raise ValueError(
+                    f'`{name}` value `{value}` is not one of the choices: '
+                    f'{arg.type}'
+                )
+        overrides[name] = value
+    return overrides
+
+
+def get_trial_namespace(prog_parser, trial, prog_args=None, base=None):
+    """Returns the resolved namespace of the trial's config.
+
+    Args
+    ----
+    prog_parser : docstr.configargparse.ProgramParser
+        The parser of the program the trial is of.
+    trial : Trial
+        The trial whose args update the program's config.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        trial's args.
+    base : NestedNamespace = None
+        The program's namespace from `get_base_namespace()`. When given, the
+        trial's namespace is an OverlayNamespace of only the trial's args on
+        top of the shared base, rather than parsing the entire config again.
+
+    Returns
+    -------
+    NestedNamespace | OverlayNamespace
+    """
+    if base is not None:
+        try:
+            return OverlayNamespace(
+                base,
+                get_trial_overrides(prog_parser, trial.args, prog_args),
+            )
+        except (KeyError, TypeError, ValueError):
+            # Parse the trial's config to report the error as argparse does.
+            pass
+    return prog_parser.parse(prog_args, trial.args)
+
+
+def hash_trial(prog_parser, trial, prog_args=None, base=None):
+    """Returns the canonical hash of the trial's resolved config.
+
+    Args
+    ----
+    prog_parser : docstr.configargparse.ProgramParser
+        The parser of the program the trial is of.
+    trial : Trial
+        The trial whose args update the program's config.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        trial's args.
+    base : NestedNamespace = None
+        The program's namespace shared by the trials. See
+        `get_trial_namespace()`.
+
+    Returns
+    -------
+    str | None
+        The canonical hash, or None if the trial's config fails to parse, such
+        that running the trial reports the error.
+    """
+    try:
+        with redirect_stderr(StringIO()):
+            namespace = get_trial_namespace(
+                prog_parser,
+                trial,
+                prog_args,
+                base,
+            )
+    except SystemExit:
+        return None
+    return get_canonical_hash(namespace, prog_parser.tokens)
+
+
+def dedup_trials(trials, prog_parser, prog_args=None, completed=None):
+    """Yields the trials whose resolved configs have not been seen, setting
+    their canonical config hash.
+
+    Args
+    ----
+    trials : iterable(Trial)
+        The trials to be deduplicated.
+    prog_parser : docstr.configargparse.ProgramParser
+        The parser of the program the trials are of.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        trials' args.
+    completed : set = None
+        The canonical hashes of the trials that already succeeded, e.g. from
+        `ResultsStore.get_completed()`, which are skipped.
+
+    Yields
+    ------
+    Trial
+        The first trial of every resolved config not completed. Trials that
+        fail to parse are always yielded with a config hash of None.
+    """
+    seen = set() if completed is None else set(completed)
+    base = get_base_namespace(prog_parser, prog_args)
+    for trial in trials:
+        config_hash = hash_trial(prog_parser, trial, prog_args, base)
+        if config_hash is not None:
+            if config_hash in seen:
+                continue
+            seen.add(config_hash)
+        yield Trial(trial.index, trial.args, config_hash)
+
+
+def skip_completed(
+    trials,
+    prog_parser,
+    prog_args=None,
+    completed=None,
+    dedup=True,
+):
+    """Filters out the trials that already succeeded, e.g. in a ResultsStore,
+    by either their config hash or their canonical hash.
+
+    Args
+    ----
+    trials : iterable(Trial)
+        The trials to be filtered.
+    prog_parser : docstr.configargparse.ProgramParser
+        The parser of the program the trials are of.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        trials' args.
+    completed : set = None
+        The config hashes and canonical hashes of the trials that already
+        succeeded, e.g. from `ResultsStore.get_completed()`.
+    dedup : bool = True
+        If True, the trials are deduplicated as well. See `dedup_trials()`.
+
+    Returns
+    -------
+    iterable(Trial)
+        The lazy iterable of the trials not completed.
+    """
+    if completed:
+        trials = (
+            trial for trial in trials
+            if get_config_hash(
+                {**prog_parser.config, **trial.args},
+                prog_args,
+            ) not in completed
+        )
+    if dedup:
+        trials = dedup_trials(trials, prog_parser, prog_args, completed)
+    return trials
+
+
+class ParamSpace(object):
+    """The lazy cartesian product of the values of a program's arguments.
+
+    The k-th trial is computed by mixed-radix indexing, where each argument is
+    a digit whose radix is its number of values and the last argument is the
+    least significant digit. No grid of trials is ever built, so the space may
+    be far larger than what fits in memory.
+
+    Attributes
+    ----------
+    names : [str]
+        The dotted argument names in the order of their digits.
+    values : [list | range]
+        The values of each argument to search over.
+    radices : [int]
+        The number of values of each argument.
+    size : int
+        The number of trials in the space. Unlike `len()`, this is not bound
+        by `sys.maxsize`.
+    """
+    def __init__(self, search_space):
+        """
+        Args
+        ----
+        search_space : OrderedDict({str: list | range})
+            The dotted argument names to their values to search over, as
+            returned by `get_search_space()`.
+        """
+        self.names = list(search_space)
+        self.values = list(search_space.values())
+        self.radices = [len(values) for values in self.values]
+        self.size = reduce(mul, self.radices, 1)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.iterate()
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(
+                f'Trial index out of range of the space of size {self.size}.'
+            )
+        return self.get_trial(index, self.get_digits(index))
+
+    def get_digits(self, index):
+        """Returns the mixed-radix digits of the trial index."""
+        digits = [0] * len(self.radices)
+        for i in reversed(range(len(self.radices))):
+            index, digits[i] = divmod(index, self.radices[i])
+        return digits
+
+    def get_trial(self, index, digits):
+        """Returns the trial of the index given its mixed-radix digits."""
+        return Trial(index, {
+            name: values[digit]
+            for name, values, digit in zip(self.names, self.values, digits)
+        })
+
+    def get_shard(self, shard, num_shards):
+        """Returns the start and stop indices of the shard of the space.
+
+        Args
+        ----
+        shard : int
+            The index of the shard, from 0 to `num_shards - 1`.
+        num_shards : int
+            The number of contiguous shards the space is split into, whose
+            sizes differ by at most one trial.
+
+        Returns
+        -------
+        (int, int)
+            The start index and exclusive stop index of the shard.
+        """
+        if num_shards < 1 or not 0 <= shard < num_shards:
+            raise ValueError(
+                f'Expected shard to be in [0, {num_shards}) of a positive '
+                f'number of shards, but was given shard {shard}.'
+            )
+        return (
+            shard * self.size // num_shards,
+            (shard + 1) * self.size // num_shards,
+        )
+
+    def iterate(self, start=0, stop=None, shard=0, num_shards=1):
+        """Lazily yields the trials of the space in order of their index.
+
+        Args
+        ----
+        start : int = 0
+            The trial index to resume from, e.g. a checkpoint of the number of
+            trials completed, within the shard.
+        stop : int = None
+            The exclusive trial index to stop at. Defaults to the end of the
+            shard.
+        shard : int = 0
+            The shard of the space to iterate over. See `get_shard()`.
+        num_shards : int = 1
+            The number of shards the space is split into.
+
+        Yields
+        ------
+        Trial
+            The trials of the shard from start to stop, where stepping to the
+            next trial increments the digits in amortized constant time.
+        """
+        shard_start, shard_stop = self.get_shard(shard, num_shards)
+        start = max(start, shard_start)
+        stop = shard_stop if stop is None else min(stop, shard_stop)
+        if start >= stop:
+            return
+
+        digits = self.get_digits(start)
+        for index in range(start, stop):
+            yield self.get_trial(index, digits)
+
+            # Increment the least significant digit, carrying as needed.
+            for i in reversed(range(len(digits))):
+                digits[i] += 1
+                if digits[i] < self.radices[i]:
+                    break
+                digits[i] = 0
+
+
+def _run_trial(context, trial):
+    """Runs the trial of the program in the sweep's context."""
+    def run():
+        args = get_trial_namespace(
+            context['prog_parser'],
+            trial,
+            context['prog_args'],
+            context['base_namespace'],
+        )
+        return run_main(
+            context['prog_parser'].init_prog(args),
+            context['docstr_args'],
+        )
+
+    return trial, run_captured(context['config'], run)
+
+
+def load_sweep(config, space=None, prog_args=None, cache_dir=None):
+    """Loads the program and its validated parameter space, returning the
+    context inherited by the workers that run its trials.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    space : dict = None
+        The dotted argument names to their search space spec. Defaults to the
+        config's `docstr: sweep:` section. See `get_param_values()`.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        search space's values for every trial.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+
+    Returns
+    -------
+    (ParamSpace, dict)
+        The parameter space and the sweep's context shared by every trial,
+        which has the program's parser as its `prog_parser`.
+    """
+    cap_namespace, prog_parser = load_program(config, cache_dir)
+    if space is None:
+        space = cap_namespace.docstr.sweep
+    if not space:
+        raise ValueError(
+            f'No search space was given nor under `docstr: sweep:` in {config}'
+        )
+
+    # Validate the entire search space before any trial starts.
+    param_space = ParamSpace(get_search_space(prog_parser.tokens, space))
+
+    prog_args = [] if prog_args is None else list(prog_args)
+    context = dict(
+        config=config,
+        docstr_args=cap_namespace.docstr,
+        prog_parser=prog_parser,
+        prog_args=prog_args,
+        # Every trial overlays its args on the config parsed once here.
+        base_namespace=get_base_namespace(prog_parser, prog_args),
+    )
+
+    return param_space, context
+
+
+def iterate_sweep(
+    config,
+    space=None,
+    prog_args=None,
+    jobs=None,
+    cache_dir=None,
+    start=0,
+    shard=0,
+    num_shards=1,
+    results=None,
+    fsync_interval=1.0,
+    dedup=True,
+):
+    """Lazily runs a grid search over the search space of the program's
+    config, yielding each trial's outcome as it finishes.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    space : dict = None
+        The dotted argument names to their search space spec. Defaults to the
+        config's `docstr: sweep:` section. See `get_param_values()`.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        search space's values for every trial.
+    jobs : int = None
+        The number of worker processes. Defaults to the number of CPUs.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+    start : int = 0
+        The trial index to resume the sweep from. See `ParamSpace.iterate()`.
+    shard : int = 0
+        The shard of the trials run by this sweep, e.g. when the sweep is
+        split across machines.
+    num_shards : int = 1
+        The number of shards the trials are split into.
+    results : str = None
+        The path of the JSON lines ResultsStore the trials' records are
+        appended to. Trials whose config hash, or canonical hash, already
+        succeeded in the store are skipped, so an interrupted sweep resumes
+        where it stopped.
+    fsync_interval : float = 1.0
+        The seconds between writing the buffered records to the results.
+    dedup : bool = True
+        If True, trials whose resolved configs are identical to an earlier
+        trial's, or to a successful trial's in the results, are skipped. The
+        identity of a config is its canonical hash, see
+        `get_canonical_hash()`. If False, only the trials whose args and
+        program arguments match a successful trial in the results, by their
+        config hash, are skipped.
+
+    Yields
+    ------
+    (Trial, docstr.cli.batch.RunResult)
+        Every trial that was run and its outcome in the order of the trials.
+    """
+    param_space, context = load_sweep(config, space, prog_args, cache_dir)
+    trials = param_space.iterate(start, shard=shard, num_shards=num_shards)
+    prog_parser = context['prog_parser']
+    prog_args = context['prog_args']
+
+    if results is None:
+        store = None
+        completed = None
+    else:
+        store = ResultsStore(results, fsync_interval)
+        completed = store.get_completed()
+    trials = skip_completed(
+        trials,
+        prog_parser,
+        prog_args,
+        completed,
+        dedup,
+    )
+
+    try:
+        for trial, result in pool_imap(
+            _run_trial,
+            trials,
+            jobs,
+            context=context,
+        ):
+            if store is not None:
+                args = {**prog_parser.config, **trial.args}
+                store.append(TrialRecord.from_result(
+                    get_config_hash(args, prog_args),
+                    args,
+                    result,
+                    trial.index,
+                    trial.config_hash,
+                ))
+            yield trial, result
+    finally:
+        if store is not None:
+            store.close()
+
+
+def run_sweep(*args, **kwargs):
+    """Runs a grid search over the search space of the program's config.
+
+    Args
+    ----
+    See `iterate_sweep()`.
+
+    Returns
+    -------
+    [(Trial, docstr.cli.batch.RunResult)]
+        Every trial that was run and its outcome in the order of the trials.
+    """
+    return list(iterate_sweep(*args, **kwargs))
+
+
+def get_score(result, mode='min'):
+    """Returns the score of the trial's result to be minimized.
+
+    Args
+    ----
+    result : docstr.cli.batch.RunResult
+        The outcome of the trial, whose main returned its metric.
+    mode : 'min' | 'max' = 'min'
+        Whether the metric returned by the program's main is minimized or
+        maximized.
+
+    Returns
+    -------
+    float
+        The metric, negated if maximized, or infinity if the trial failed or
+        did not return a number.
+    """
+    if (
+        result.exit_status != 0
+        or isinstance(result.returned, bool)
+        or not isinstance(result.returned, (int, float))
+        or math.isnan(result.returned)
+    ):
+        return math.inf
+    return result.returned if mode == 'min' else -result.returned
+
+
+def get_rung_budgets(min_budget, max_budget, eta=3):
+    """Returns the increasing budgets of the rungs of successive halving.
+
+    Args
+    ----
+    min_budget : int | float
+        The budget of the first rung.
+    max_budget : int | float
+        The largest budget of any rung.
+    eta : int = 3
+        The factor the budget grows by, and the number of trials shrinks by,
+        from one rung to the next.
+
+    Returns
+    -------
+    [int | float]
+        The budgets `min_budget * eta**i` no larger than `max_budget`.
+    """
+    if eta < 2:
+        raise ValueError(f'Expected eta to be at least 2, but was {eta}.')
+    if not 0 < min_budget <= max_budget:
+        raise ValueError(
+            f'Expected 0 < min_budget <= max_budget, but was given '
+            f'{min_budget} and {max_budget}.'
+        )
+    budgets = [min_budget]
+    while budgets[-1] * eta <= max_budget:
+        budgets.append(budgets[-1] * eta)
+    return budgets
+
+
+def successive_halving(
+    context,
+    trials,
+    budget_arg,
+    budgets,
+    eta=3,
+    mode='min',
+    jobs=None,
+):
+    """Runs the trials in the sweep's context on increasing budgets, keeping
+    the best 1 / eta of the trials from one rung to the next.
+
+    Args
+    ----
+    context : dict
+        The sweep's context, see `load_sweep()`.
+    trials : [Trial]
+        The trials to start with on the first rung.
+    budget_arg : str
+        The dotted name of the program's argument that is its budget.
+    budgets : [int | float]
+        The budget of each rung. See `get_rung_budgets()`.
+    eta : int = 3
+        The inverse of the fraction of trials promoted to the next rung.
+    mode : 'min' | 'max' = 'min'
+        Whether the metric returned by the program's main is minimized or
+        maximized.
+    jobs : int = None
+        The number of worker processes that concurrently run a rung's trials.
+
+    Returns
+    -------
+    [(Trial, docstr.cli.batch.RunResult)]
+        Every trial run, with the budget in its args, rung by rung.
+    """
+    runs = []
+    for rung, budget in enumerate(budgets):
+        rung_runs = list(pool_imap(
+            _run_trial,
+            [
+                Trial(trial.index, {**trial.args, budget_arg: budget})
+                for trial in trials
+            ],
+            jobs,
+            context=context,
+        ))
+        runs += rung_runs
+
+        if rung < len(budgets) - 1:
+            # The sort is stable, so ties promote the earlier trials.
+            ranked = sorted(
+                zip(trials, rung_runs),
+                key=lambda pair: get_score(pair[1][1], mode),
+            )
+            trials = [
+                trial for trial, _ in ranked[:max(len(trials) // eta, 1)]
+            ]
+    return runs
+
+
+def run_successive_halving(
+    config,
+    budget_arg,
+    min_budget,
+    max_budget,
+    eta=3,
+    num_trials=None,
+    hyperband=False,
+    mode='min',
+    seed=None,
+    space=None,
+    prog_args=None,
+    jobs=None,
+    cache_dir=None,
+):
+    """Runs an early-stopping search over the search space of the program's
+    config by successive halving, or by Hyperband's brackets of it.
+
+    Every trial reuses the same docstring tokens and parser, parsed once in
+    this process before the workers are forked.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    budget_arg : str
+        The dotted name of the program's argument that is its budget, e.g.
+        epochs. Must be an int or float argument not in the search space.
+    min_budget : int | float
+        The budget of every trial on the first rung.
+    max_budget : int | float
+        The largest budget a trial is run with.
+    eta : int = 3
+        The factor the budget grows by, and the number of trials shrinks by,
+        from one rung to the next.
+    num_trials : int = None
+        The number of trials sampled from the space for successive halving.
+        Defaults to every trial in the space. Unused by Hyperband, which
+        samples as many as each of its brackets needs.
+    hyperband : bool = False
+        If True, runs Hyperband's brackets of successive halving, each trading
+        off the number of trials against their starting budget.
+    mode : 'min' | 'max' = 'min'
+        Whether the metric returned by the program's main is minimized or
+        maximized.
+    seed : int = None
+        The seed of the random sampling of trials from the space.
+    space : dict = None
+        The dotted argument names to their search space spec. Defaults to the
+        config's `docstr: sweep:` section. See `get_param_values()`.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        search space's values for every trial.
+    jobs : int = None
+        The number of worker processes. Defaults to the number of CPUs.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+
+    Returns
+    -------
+    [(Trial, docstr.cli.batch.RunResult)]
+        Every trial run, with the budget in its args, in the order run.
+    """
+    if mode not in {'min', 'max'}:
+        raise ValueError(f"Expected mode to be 'min' or 'max', not {mode}")
+    param_space, context = load_sweep(config, space, prog_args, cache_dir)
+
+    if budget_arg in param_space.names:
+        raise ValueError(
+            f'The budget `{budget_arg}` must not be in the search space.'
+        )
+    budget_type = get_arg_doc(context['prog_parser'].tokens, budget_arg).type
+    if budget_type not in {int, float}:
+        raise TypeError(
+            f'The budget `{budget_arg}` must be an int or float argument, '
+            f'not {budget_type}.'
+        )
+    budgets = [
+        budget_type(budget)
+        for budget in get_rung_budgets(min_budget, max_budget, eta)
+    ]
+
+    rand = random.Random(seed)
+
+    def sample(num):
+        """Samples the number of trials from the space, in index order."""
+        if num >= param_space.size:
+            return list(param_space)
+        indices = rand.sample(range(param_space.size), num)
+        return [param_space[index] for index in sorted(indices)]
+
+    if not hyperband:
+        trials = sample(
+            param_space.size if num_trials is None else num_trials
+        )
+        return successive_halving(
+            context,
+            trials,
+            budget_arg,
+            budgets,
+            eta,
+            mode,
+            jobs,
+        )
+
+    # Each bracket starts s rungs from the end with its own trials.
+    runs = []
+    max_rung = len(budgets) - 1
+    for s in reversed(range(max_rung + 1)):
+        num = math.ceil((max_rung + 1) / (s + 1) * eta ** s)
+        runs += successive_halving(
+            context,
+            sample(num),
+            budget_arg,
+            budgets[max_rung - s:],
+            eta,
+            mode,
+            jobs,
+        )
+    return runs
+
+
+def get_best(runs, mode='min', budget_arg=None):
+    """Returns the best trial run on the largest budget.
+
+    Args
+    ----
+    runs : [(Trial, docstr.cli.batch.RunResult)]
+        The trials run by `run_successive_halving()`, or any sweep.
+    mode : 'min' | 'max' = 'min'
+        Whether the metric returned by the program's main is minimized or
+        maximized.
+    budget_arg : str = None
+        The dotted name of the program's argument that is its budget. If
+        given, only the runs on the largest budget are compared, which is the
+        last rung of every Hyperband bracket. Otherwise, every run is.
+
+    Returns
+    -------
+    (Trial, docstr.cli.batch.RunResult)
+        The run with the best score, preferring the later runs among ties.
+    """
+    if budget_arg is not None:
+        max_budget = max(trial.args[budget_arg] for trial, _ in runs)
+        runs = [
+            (trial, result) for trial, result in runs
+            if trial.args[budget_arg] == max_budget
+        ]
+    return min(reversed(runs), key=lambda pair: get_score(pair[1], mode))
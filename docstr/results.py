@@ -0,0 +1,229 @@
+"""Append-only store of the results of a program's trials, such that a crashed
+or interrupted parameter sweep resumes without repeating finished trials.
+"""
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import logging
+import os
+import time
+
+
+def get_config_hash(args, prog_args=None):
+    """Returns the sha256 hex digest identifying a configuration of a program.
+
+    Args
+    ----
+    args : dict
+        The flat dict of dotted argument names to values of the program's
+        config, as in `prototype_hack_reformat_yaml_dict_unnested_cap()`.
+    prog_args : [str] = None
+        The command line arguments that override the config, if any.
+
+    Returns
+    -------
+    str
+    """
+    return hashlib.sha256(json.dumps(
+        [args, [] if prog_args is None else list(prog_args)],
+        sort_keys=True,
+        default=repr,
+    ).encode()).hexdigest()
+
+
+def to_json_value(value):
+    """Returns the value if it is serializable as json, otherwise its repr."""
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return repr(value)
+    return value
+
+
+@dataclass
+class TrialRecord:
+    """A record of running a single trial of a program.
+
+    Attributes
+    ----------
+    config_hash : str
+        The hash of the trial's configuration. See `get_config_hash()`.
+    args : dict
+        The flat dict of dotted argument names to values of the trial's
+        config.
+    returned : object
+        The object returned by the program's main, or its repr if it is not
+        serializable as json.
+    wall_time : float
+        The wall clock seconds spent initializing and running the program.
+    cpu_time : float
+        The CPU seconds of the process spent initializing and running the
+        program.
+    status : str
+        'success' if the program's exit status was 0, otherwise 'failed'.
+    exit_status : int = 0
+    index : int = None
+        The index of the trial within its parameter space.
+    error : str = None
+        The traceback of the exception raised by the program, if any.
+    canonical_hash : str = None
+        The hash of the trial's resolved config, if it was deduplicated. See
+        `docstr.params.get_canonical_hash()`.
+    """
+    config_hash : str
+    args : dict
+    returned : object
+    wall_time : float
+    cpu_time : float
+    status : str
+    exit_status : int = 0
+    index : int = None
+    error : str = None
+    canonical_hash : str = None
+
+    @staticmethod
+    def from_result(
+        config_hash,
+        args,
+        result,
+        index=None,
+        canonical_hash=None,
+    ):
+        """Creates the record of a docstr.cli.batch.RunResult."""
+        return TrialRecord(
+            config_hash=config_hash,
+            args={key: to_json_value(value) for key, value in args.items()},
+            returned=to_json_value(result.returned),
+            wall_time=result.wall_time,
+            cpu_time=result.cpu_time,
+            status='success' if result.exit_status == 0 else 'failed',
+            exit_status=result.exit_status,
+            index=index,
+            error=result.error,
+            canonical_hash=canonical_hash,
+        )
+
+
+class ResultsStore(object):
+    """An append-only JSON lines file of TrialRecords.
+
+    Records are buffered and written in batches, where the file is flushed
+    and fsync'd at most once per `fsync_interval` seconds, or as soon as
+    `batch_size` records are buffered.
+
+    Attributes
+    ----------
+    path : str
+        The path of the JSON lines file, which is created if it is missing.
+    fsync_interval : float = 1.0
+        The seconds between writing the buffered records to disk. If 0, every
+        record is written and fsync'd as soon as it is appended.
+    batch_size : int = 1000
+        The number of buffered records that are written regardless of the
+        time since the last write.
+
+    Notes
+    -----
+    A crash loses at most the buffered records. A partially written last line
+    is ignored when loading and terminated before appending.
+    """
+    def __init__(self, path, fsync_interval=1.0, batch_size=1000):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+
+        self._buffer = []
+        self._last_sync = time.monotonic()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def load(self):
+        """Loads the records written to the store.
+
+        Returns
+        -------
+        [TrialRecord]
+            The records in the order they were written, skipping any line that
+            is unreadable, e.g. the partial line of a crash.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path, 'r') as openf:
+            for line_num, line in enumerate(openf, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(TrialRecord(**json.loads(line)))
+                except (TypeError, ValueError) as e:
+                    logging.warning(
+                        'Skipping unreadable record on line %d of `%s`: %s',
+                        line_num,
+                        self.path,
+                        e,
+                    )
+        return records
+
+    def get_completed(self):
+        """Returns the config hashes and canonical hashes of the successful
+        trials in the store.
+        """
+        completed = set()
+        for record in self.load():
+            if record.status == 'success':
+                completed.add(record.config_hash)
+                if record.canonical_hash is not None:
+                    completed.add(record.canonical_hash)
+        return completed
+
+    def open(self):
+        """Opens the store's file for appending, terminating a partial line.
+        """
+        if self._file is not None:
+            return
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._file = open(self.path, 'a+')
+
+        # Terminate the partial line of a crash, so new records are readable.
+        if self._file.tell() > 0:
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != '\n':
+                self._file.write('\n')
+
+    def append(self, record):
+        """Buffers the record, writing the buffer if it is due to be written.
+        """
+        self._buffer.append(record)
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records to the file and fsyncs it."""
+        self._last_sync = time.monotonic()
+        if not self._buffer:
+            return
+        self.open()
+        self._file.write(''.join(
+            json.dumps(asdict(record)) + '\n' for record in self._buffer
+        ))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer = []
+
+    def close(self):
+        """Writes the buffered records and closes the store's file."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,308 @@
+"""A filesystem work queue of a program's trials, such that sweeps scale across
+nodes sharing a disk without a job broker. Every node runs
+`docstr worker <queue_dir>`, which claims trials by atomic rename.
+"""
+from dataclasses import asdict
+import json
+import os
+import socket
+
+from docstr.cli.batch import run_captured
+from docstr.cli.cli import load_program, run_main
+from docstr.params import (
+    ParamSpace,
+    Trial,
+    get_base_namespace,
+    get_search_space,
+    get_trial_namespace,
+    skip_completed,
+)
+from docstr.results import (
+    ResultsStore,
+    TrialRecord,
+    get_config_hash,
+    to_json_value,
+)
+
+
+class WorkQueue(object):
+    """A directory of trials that are pending, claimed, and done.
+
+    Attributes
+    ----------
+    queue_dir : str
+        The directory of the queue, containing `queue.json` with the program's
+        config and arguments, and the subdirectories `pending`, `claimed`,
+        `done`, and `tmp` of the trials' json files.
+
+    Notes
+    -----
+    Every file is written in `tmp` and renamed into place, and a trial is
+    claimed by renaming it from `pending` to `claimed`, which only one worker
+    succeeds at as rename is atomic, including on NFS. A claimed trial whose
+    worker died is returned to `pending` by `requeue()`.
+    """
+    def __init__(self, queue_dir):
+        self.queue_dir = queue_dir
+
+    def path(self, *names):
+        """Returns the path of the names joined within the queue directory."""
+        return os.path.join(self.queue_dir, *names)
+
+    def _write_json(self, obj, *names):
+        """Writes the object as json, then renames it into place atomically."""
+        tmp_path = self.path('tmp', f'{names[-1]}.{os.getpid()}')
+        with open(tmp_path, 'w') as openf:
+            json.dump(obj, openf)
+        os.replace(tmp_path, self.path(*names))
+
+    def _read_json(self, *names):
+        with open(self.path(*names), 'r') as openf:
+            return json.load(openf)
+
+    def submit(self, config, trials, prog_args=None):
+        """Writes the program and its trials into the queue.
+
+        Args
+        ----
+        config : str
+            The path to the yaml config of the python program, which must be
+            readable from every node.
+        trials : iterable(Trial)
+            The trials to be run by the workers.
+        prog_args : [str] = None
+            The arguments for the python program that override its config and
+            the trials' args.
+
+        Returns
+        -------
+        int
+            The number of trials submitted.
+        """
+        for subdir in ('pending', 'claimed', 'done', 'tmp'):
+            os.makedirs(self.path(subdir), exist_ok=True)
+
+        self._write_json(
+            {
+                'config': os.path.abspath(config),
+                'prog_args': [] if prog_args is None else list(prog_args),
+            },
+            'queue.json',
+        )
+
+        count = 0
+        for trial in trials:
+            self._write_json(
+                {
+                    'index': trial.index,
+                    'args': {
+                        key: to_json_value(value)
+                        for key, value in trial.args.items()
+                    },
+                    'config_hash': trial.config_hash,
+                },
+                'pending',
+                f'{trial.index:012d}.json',
+            )
+            count += 1
+        return count
+
+    def load_spec(self):
+        """Returns the program's config path and arguments of the queue."""
+        spec = self._read_json('queue.json')
+        return spec['config'], spec['prog_args']
+
+    def claim(self):
+        """Yields the trials claimed by this process until none are pending.
+
+        Yields
+        ------
+        (str, Trial)
+            The name of the claimed trial's file and the trial.
+        """
+        worker_id = f'{socket.gethostname()}.{os.getpid()}'
+        while True:
+            names = sorted(os.listdir(self.path('pending')))
+            if not names:
+                return
+            for name in names:
+                claimed = f'{name}.{worker_id}'
+                try:
+                    os.rename(
+                        self.path('pending', name),
+                        self.path('claimed', claimed),
+                    )
+                except FileNotFoundError:
+                    # Another worker claimed it first.
+                    continue
+                trial = self._read_json('claimed', claimed)
+                yield claimed, Trial(**trial)
+
+    def complete(self, claimed, record):
+        """Writes the record of the claimed trial as done."""
+        name = claimed.partition('.json')[0]
+        self._write_json(asdict(record), 'done', f'{name}.json')
+        os.remove(self.path('claimed', claimed))
+
+    def requeue(self):
+        """Returns the claimed trials that are not done to pending.
+
+        Only call this when no worker is running, as the claims of running
+        workers are indistinguishable from those of dead workers.
+
+        Returns
+        -------
+        int
+            The number of trials returned to pending.
+        """
+        count = 0
+        for claimed in os.listdir(self.path('claimed')):
+            name = claimed.partition('.json')[0] + '.json'
+            if os.path.exists(self.path('done', name)):
+                os.remove(self.path('claimed', claimed))
+            else:
+                os.rename(
+                    self.path('claimed', claimed),
+                    self.path('pending', name),
+                )
+                count += 1
+        return count
+
+    def get_completed(self):
+        """Returns the config hashes and canonical hashes of the successful
+        trials that are done, as `ResultsStore.get_completed()` does.
+        """
+        if not os.path.isdir(self.path('done')):
+            return set()
+        completed = set()
+        for record in self.results():
+            if record.status == 'success':
+                completed.add(record.config_hash)
+                if record.canonical_hash is not None:
+                    completed.add(record.canonical_hash)
+        return completed
+
+    def results(self):
+        """Returns the records of the done trials in the order of the trials.
+        """
+        return [
+            TrialRecord(**self._read_json('done', name))
+            for name in sorted(os.listdir(self.path('done')))
+        ]
+
+
+def submit_sweep(
+    config,
+    queue_dir,
+    space=None,
+    prog_args=None,
+    cache_dir=None,
+    start=0,
+    shard=0,
+    num_shards=1,
+    results=None,
+):
+    """Writes the trials of the grid search of the program's config into the
+    work queue, validating the search space first and skipping the trials
+    whose resolved configs duplicate an earlier trial's, or that already
+    succeeded in the queue or the results.
+
+    Args
+    ----
+    config : str
+        The path to the yaml config of the python program.
+    queue_dir : str
+        The directory of the WorkQueue, created if missing.
+    space : dict = None
+        The dotted argument names to their search space spec. Defaults to the
+        config's `docstr: sweep:` section. See `get_param_values()`.
+    prog_args : [str] = None
+        The arguments for the python program that override its config and the
+        search space's values for every trial.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+    start : int = 0
+        The trial index to start from. See `ParamSpace.iterate()`.
+    shard : int = 0
+        The shard of the trials submitted.
+    num_shards : int = 1
+        The number of shards the trials are split into.
+    results : str = None
+        The path of a JSON lines ResultsStore whose successful trials are not
+        submitted, as in `iterate_sweep()`.
+
+    Returns
+    -------
+    int
+        The number of trials submitted.
+    """
+    cap_namespace, prog_parser = load_program(config, cache_dir)
+    if space is None:
+        space = cap_namespace.docstr.sweep
+    if not space:
+        raise ValueError(
+            f'No search space was given nor under `docstr: sweep:` in {config}'
+        )
+    param_space = ParamSpace(get_search_space(prog_parser.tokens, space))
+
+    work_queue = WorkQueue(queue_dir)
+    completed = work_queue.get_completed()
+    if results is not None:
+        completed |= ResultsStore(results).get_completed()
+
+    # Only submit the first trial of every resolved config not completed.
+    return work_queue.submit(
+        config,
+        skip_completed(
+            param_space.iterate(start, shard=shard, num_shards=num_shards),
+            prog_parser,
+            prog_args,
+            completed,
+        ),
+        prog_args,
+    )
+
+
+def run_worker(queue_dir, cache_dir=None):
+    """Runs the trials of the work queue until none are pending.
+
+    The program's config, docstring tokens, parser, and imported modules are
+    loaded once and kept warm for every trial this worker claims.
+
+    Args
+    ----
+    queue_dir : str
+        The directory of the WorkQueue.
+    cache_dir : str = None
+        The directory of the docstr launch cache. See `load_program()`.
+
+    Returns
+    -------
+    int
+        The number of trials this worker ran.
+    """
+    work_queue = WorkQueue(queue_dir)
+    config, prog_args = work_queue.load_spec()
+    cap_namespace, prog_parser = load_program(config, cache_dir)
+    base = get_base_namespace(prog_parser, prog_args)
+
+    count = 0
+    for claimed, trial in work_queue.claim():
+        def run():
+            args = get_trial_namespace(prog_parser, trial, prog_args, base)
+            return run_main(
+                prog_parser.init_prog(args),
+                cap_namespace.docstr,
+            )
+
+        result = run_captured(config, run)
+        args = {**prog_parser.config, **trial.args}
+        work_queue.complete(claimed, TrialRecord.from_result(
+            get_config_hash(args, prog_args),
+            args,
+            result,
+            trial.index,
+            trial.config_hash,
+        ))
+        count += 1
+    return count
@@ -41,6 +41,6 @@ setup(
     ],
     # scripts
     entry_points={
-        'console_scripts': [f'{project_name}={project_name}.cli.cli:docstr_cap']
+        'console_scripts': [f'{project_name}={project_name}.cli.console:main']
     },
 )
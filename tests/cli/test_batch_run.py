@@ -0,0 +1,138 @@
+"""Tests `docstr run` of many configs on a process pool."""
+import sys
+
+import yaml
+
+import pytest
+
+from docstr.cli import cli
+from docstr.cli import batch
+from docstr.cli.batch import RunResult, run_batch, run_captured
+
+
+def write_configs(tmp_path, values):
+    """Writes a copy of the numpy example config per value of `x`."""
+    with open('tests/numpy_example_config.yaml', 'r') as openf:
+        config = yaml.safe_load(openf)
+
+    paths = []
+    for i, x in enumerate(values):
+        config['NumpyDocClassRecursiveParse']['very_useful_class'][
+            'NumpyDocClass'
+        ]['x'] = x
+        path = tmp_path / f'config_{i}.yaml'
+        with open(path, 'w') as openf:
+            yaml.safe_dump(config, openf, sort_keys=False)
+        paths.append(str(path))
+    return paths
+
+
+class TestBatchRun:
+    """Tests the batch run of configs sharing the same program."""
+    def test_run_captured(self):
+        def prints_and_exits():
+            print('hello')
+            sys.exit(3)
+
+        result = run_captured('config.yaml', prints_and_exits)
+        assert isinstance(result, RunResult)
+        assert result.stdout == 'hello\n'
+        assert result.exit_status == 3
+        assert result.wall_time >= 0
+
+        result = run_captured('config.yaml', lambda: 1 / 0)
+        assert result.exit_status == 1
+        assert 'ZeroDivisionError' in result.error
+
+        # A returned int, e.g. a metric or count, is not an exit status.
+        for returned in [3, True, 0.5]:
+            result = run_captured('config.yaml', lambda: returned)
+            assert result.exit_status == 0
+            assert result.returned == returned
+            assert result.error is None
+
+        result = run_captured('config.yaml', sys.exit, 'failed')
+        assert result.exit_status == 1
+        assert result.error == 'failed'
+
+    def test_run_batch(self, tmp_path):
+        configs = write_configs(tmp_path, [1, 2, 3, 'not_a_number'])
+        results = run_batch(configs, jobs=2)
+
+        assert [result.config for result in results] == configs
+        for result in results[:3]:
+            assert result.exit_status == 0
+            assert result.returned == 'foobar'
+        # argparse exits with status 2 given an invalid value.
+        assert results[3].exit_status == 2
+
+    def test_run_batch_load_error(self, tmp_path):
+        configs = write_configs(tmp_path, [1, 2])
+        broken = tmp_path / 'broken.yaml'
+        broken.write_text('docstr: [unclosed\n')
+        configs.insert(1, str(broken))
+
+        results = run_batch(configs, jobs=2)
+        assert [result.config for result in results] == configs
+        assert results[1].exit_status == 1
+        assert 'yaml' in results[1].error.lower()
+        for result in results[::2]:
+            assert result.exit_status == 0
+            assert result.returned == 'foobar'
+
+    def test_run_batch_options(self, tmp_path, monkeypatch):
+        configs = write_configs(tmp_path, [1, 2])
+        options = []
+        batch_run_program = batch.run_program
+
+        def run_program(*args, **kwargs):
+            options.append(kwargs)
+            return batch_run_program(*args, **kwargs)
+
+        monkeypatch.setattr(batch, 'run_program', run_program)
+        results = run_batch(
+            configs,
+            jobs=1,
+            init_jobs=2,
+            share=True,
+            unshared=['tests.numpy_example_docstrings.NumpyDocClass'],
+            lazy_config=True,
+        )
+        assert [result.returned for result in results] == ['foobar'] * 2
+        assert options == [dict(
+            init_jobs=2,
+            share=True,
+            unshared=['tests.numpy_example_docstrings.NumpyDocClass'],
+            lazy=False,
+        )] * 2
+
+    def test_cli_run_dir(self, tmp_path, monkeypatch, capsys):
+        configs = write_configs(tmp_path, [1, 2])
+        monkeypatch.setattr(
+            sys,
+            'argv',
+            [
+                'docstr',
+                'run',
+                str(tmp_path),
+                '-j',
+                '2',
+                '--very_useful_class.y',
+                '5',
+            ],
+        )
+        assert cli.docstr_cap() == 0
+
+        out = capsys.readouterr().out
+        for config in configs:
+            assert f'==> {config} <== exit status 0' in out
+
+    def test_cli_run_single(self, monkeypatch):
+        monkeypatch.setattr(
+            sys,
+            'argv',
+            ['docstr', 'run', 'tests/numpy_example_config.yaml'],
+        )
+        # The result of main, 'foobar', is not the exit status.
+        assert cli.docstr_cap() == 0
+        assert cli.run_config('tests/numpy_example_config.yaml') == 'foobar'
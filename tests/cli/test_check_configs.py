@@ -0,0 +1,96 @@
+"""Tests `docstr check` of many configs without running their programs."""
+import sys
+
+import yaml
+
+from docstr.cli import cli
+from docstr.cli.check import CheckResult, check_configs
+
+
+def write_config(path, **nested):
+    """Writes the numpy example config with the nested class's args updated.
+    """
+    with open('tests/numpy_example_config.yaml', 'r') as openf:
+        config = yaml.safe_load(openf)
+    args = config['NumpyDocClassRecursiveParse']['very_useful_class'][
+        'NumpyDocClass'
+    ]
+    for key, value in nested.items():
+        if value is None:
+            del args[key]
+        else:
+            args[key] = value
+    with open(path, 'w') as openf:
+        yaml.safe_dump(config, openf, sort_keys=False)
+    return str(path)
+
+
+class TestCheckConfigs:
+    """Tests checking configs reports every error of each config."""
+    def test_check_configs(self, tmp_path):
+        configs = [
+            write_config(tmp_path / 'valid.yaml'),
+            write_config(
+                tmp_path / 'invalid.yaml',
+                name=None,
+                a='not_a_number',
+                x=[1, 2],
+                ok='maybe',
+                unknown=1,
+            ),
+            write_config(tmp_path / 'valid_2.yaml', b=2),
+        ]
+        broken = tmp_path / 'broken.yaml'
+        broken.write_text('docstr: [unclosed')
+        configs.append(str(broken))
+
+        results = list(check_configs(configs, jobs=2))
+        assert [result.config for result in results] == configs
+        assert all(isinstance(result, CheckResult) for result in results)
+        assert results[0].errors == []
+        assert results[2].errors == []
+
+        errors = results[1].errors
+        assert len(errors) == 5
+        assert 'very_useful_class.a' in errors[0]
+        assert 'not_a_number' in errors[0]
+        assert 'very_useful_class.x' in errors[1]
+        assert "'maybe'" in errors[2]
+        assert errors[3] == \
+            'unrecognized argument: --very_useful_class.unknown'
+        assert errors[4] == \
+            'the argument --very_useful_class.name is required'
+
+        assert len(results[3].errors) == 1
+        assert 'Error' in results[3].errors[0]
+
+    def test_check_prog_args(self, tmp_path):
+        config = write_config(tmp_path / 'config.yaml', name=None)
+        result = next(check_configs([config], ['--very_useful_class.name=a']))
+        assert result.errors == []
+
+        result = next(check_configs([config], ['--very_useful_class.b', 'c']))
+        assert len(result.errors) == 1
+        assert 'very_useful_class.name' in result.errors[0]
+
+        result = next(check_configs(
+            [config],
+            ['--very_useful_class.name', 'a', '--very_useful_class.b', 'c'],
+        ))
+        assert len(result.errors) == 1
+        assert 'very_useful_class.b' in result.errors[0]
+
+    def test_cli_check(self, tmp_path, monkeypatch, capsys):
+        valid = write_config(tmp_path / 'valid.yaml')
+        invalid = write_config(tmp_path / 'invalid.yaml', b='c')
+        monkeypatch.setattr(
+            sys,
+            'argv',
+            ['docstr', 'check', str(tmp_path), '-j', '2'],
+        )
+        assert cli.docstr_cap() == 1
+
+        out = capsys.readouterr().out
+        assert f'==> {invalid} <== 1 errors' in out
+        assert valid not in out
+        assert 'Checked 2 configs, 1 with errors' in out
@@ -0,0 +1,90 @@
+"""Tests the shell completion index written with the launch cache."""
+import os
+import shutil
+import subprocess
+import sys
+
+from docstr.cli import cli
+from docstr.completion import complete, load_index
+
+CONFIG = 'tests/numpy_example_sweep_config.yaml'
+
+
+class TestCompletion:
+    """Tests completing a program's args from its index alone."""
+    def test_completion_index(self, tmp_path):
+        config = str(tmp_path / 'config.yaml')
+        shutil.copy(CONFIG, config)
+        cache_dir = str(tmp_path / 'cache')
+
+        assert load_index(config, cache_dir) is None
+        cli.load_program(config, cache_dir)
+        index = load_index(config, cache_dir)
+
+        assert index['prog'] == 'NumpyDocClassObjective'
+        assert list(index['args']) == ['x', 'loss', 'epochs', 'verbose']
+        assert index['args']['x']['type'] == 'float'
+        assert index['args']['loss']['choices'] == ['square', 'abs']
+        assert index['args']['loss']['default'] == 'square'
+        assert index['args']['verbose']['type'] == 'bool'
+        assert index['args']['verbose']['choices'] == ['False', 'True']
+        assert index['args']['epochs']['help'].startswith('The budget')
+
+        assert complete(index, ['']) == [
+            '--x',
+            '--loss',
+            '--epochs',
+            '--verbose',
+        ]
+        assert complete(index, ['--x', '1', '--e']) == ['--epochs']
+        assert complete(index, ['--loss', '']) == ['square', 'abs']
+        assert complete(index, ['--loss', 'a']) == ['abs']
+        assert complete(index, ['--verbose=T']) == ['--verbose=True']
+        assert complete(index, ['--x', '']) == []
+        assert complete(index, ['--e'], describe=True) == [
+            '--epochs\t(int) The budget of the evaluation, where the '
+            "loss's offset is 1 / epochs.",
+        ]
+
+        # A changed config has no index until it is cached again.
+        with open(config, 'a') as openf:
+            openf.write('  loss: abs\n')
+        assert load_index(config, cache_dir) is None
+
+    def test_complete_without_program(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        cli.load_program(CONFIG, cache_dir)
+
+        out = subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                '\n'.join([
+                    'import sys',
+                    'from docstr.cli.console import main',
+                    'main()',
+                    'print(sorted(',
+                    '    name for name in sys.modules',
+                    "    if name.partition('.')[0] in {",
+                    "        'tests', 'sphinx', 'docutils'",
+                    '    }',
+                    "    or name in {'docstr.cli.cli', 'docstr.parsing'}",
+                    '))',
+                ]),
+                'complete',
+                CONFIG,
+                '--docstr.cache_dir',
+                cache_dir,
+                '--',
+                '--loss',
+                's',
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.getcwd(),
+        ).stdout.splitlines()
+
+        # Neither the program, docstr's commands, nor its docstring parsing
+        # is imported.
+        assert out == ['square', '[]']
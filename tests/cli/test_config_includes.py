@@ -0,0 +1,88 @@
+"""Tests linking configs to other config files with `!docstr.include`."""
+import os
+
+import pytest
+import yaml
+
+from docstr.cache import LaunchCache
+from docstr.cli import cli
+from docstr.includes import (
+    add_includes,
+    clear_include_cache,
+    load_include,
+)
+
+CONFIG = '\n'.join([
+    'docstr:',
+    '  style: numpy',
+    '  from import:',
+    '    tests.numpy_example_docstrings:',
+    '      - NumpyDocClassObjective',
+    '  main: run',
+    'NumpyDocClassObjective: !docstr.include shared.yaml#objective',
+])
+
+
+def write(path, text):
+    with open(path, 'w') as openf:
+        openf.write(text)
+
+
+class TestConfigIncludes:
+    """Tests included configs are parsed once, shared, and invalidated."""
+    def test_include_cache(self, tmp_path):
+        clear_include_cache()
+        loader = add_includes(type('TestLoader', (yaml.SafeLoader,), {}))
+        write(tmp_path / 'shared.yaml', 'objective: {x: 1.0, epochs: 2}\n')
+        write(tmp_path / 'first.yaml', 'a: !docstr.include shared.yaml\n')
+        write(
+            tmp_path / 'second.yaml',
+            'b: !docstr.include shared.yaml#objective.x\n',
+        )
+
+        first = load_include(tmp_path / 'first.yaml', loader)
+        again = load_include(tmp_path / 'first.yaml', loader)
+        second = load_include(tmp_path / 'second.yaml', loader)
+        assert first is again
+        assert first == {'a': {'objective': {'x': 1.0, 'epochs': 2}}}
+        assert second == {'b': 1.0}
+
+        # The included file is parsed once and shared.
+        nested = load_include(tmp_path / 'shared.yaml', loader)
+        assert first['a'] is nested
+
+        # Changing an included file invalidates the files including it.
+        write(tmp_path / 'shared.yaml', 'objective: {x: 3.0, epochs: 20}\n')
+        os.utime(tmp_path / 'shared.yaml', ns=(0, 0))
+        changed = load_include(tmp_path / 'first.yaml', loader)
+        assert changed == {'a': {'objective': {'x': 3.0, 'epochs': 20}}}
+
+    def test_include_cycle(self, tmp_path):
+        clear_include_cache()
+        loader = add_includes(type('TestLoader', (yaml.SafeLoader,), {}))
+        write(tmp_path / 'a.yaml', 'b: !docstr.include b.yaml\n')
+        write(tmp_path / 'b.yaml', 'a: !docstr.include a.yaml\n')
+        with pytest.raises(ValueError, match='Cyclic'):
+            load_include(tmp_path / 'a.yaml', loader)
+
+    def test_run_included_config(self, tmp_path):
+        clear_include_cache()
+        write(tmp_path / 'shared.yaml', 'objective: {x: 1.0, epochs: 2}\n')
+        write(tmp_path / 'config.yaml', CONFIG)
+        config = str(tmp_path / 'config.yaml')
+        cache_dir = str(tmp_path / 'cache')
+
+        assert cli.run_config(config, cache_dir=cache_dir) == 1.5
+        assert cli.run_config(config, cache_dir=cache_dir) == 1.5
+        assert LaunchCache(cache_dir).load(config) is not None
+
+        # The launch cache is stale once an included config changes.
+        write(tmp_path / 'shared.yaml', 'objective: {x: 2.0, epochs: 4}\n')
+        assert LaunchCache(cache_dir).load(config) is None
+        assert cli.run_config(config, cache_dir=cache_dir) == 0.25
+
+        # The tags of docstr configs are not added to PyYAML's own loaders.
+        for loader in (yaml.SafeLoader, getattr(yaml, 'CSafeLoader', None)):
+            if loader is not None:
+                assert '!docstr.include' not in loader.yaml_constructors
+                assert '!' not in loader.yaml_multi_constructors
@@ -0,0 +1,152 @@
+"""Tests `docstr serve` and `docstr run --docstr.via_daemon`."""
+import io
+import os
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from docstr.daemon import get_client_args, run_via_daemon
+
+CONFIG = '\n'.join([
+    'docstr:',
+    '  style: numpy',
+    '  from import:',
+    '    tests.numpy_example_docstrings:',
+    '      - NumpyDocClassObjective',
+    '  main: run',
+    'NumpyDocClassObjective:',
+    '  x: {x}',
+    '  loss: abs',
+    '  verbose: True',
+])
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Starts a docstr daemon in a subprocess and yields its socket path."""
+    socket_path = str(tmp_path / 'docstr.sock')
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            '-c',
+            'import sys; from docstr.daemon import serve; serve(sys.argv[1])',
+            socket_path,
+        ],
+        cwd=os.getcwd(),
+    )
+    deadline = time.monotonic() + 60
+    while not os.path.exists(socket_path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            pytest.fail('The docstr daemon did not start.')
+        time.sleep(0.05)
+
+    yield socket_path
+
+    proc.terminate()
+    proc.wait(timeout=10)
+    assert not os.path.exists(socket_path)
+
+
+class TestDaemon:
+    """Tests the daemon runs configs in forked workers."""
+    def test_get_client_args(self):
+        assert get_client_args([
+            'config.yaml',
+            '--docstr.via_daemon',
+            '--x',
+            '1',
+        ]) == ('config.yaml', ['--x', '1'], None)
+        assert get_client_args([
+            '--docstr.via_daemon',
+            '--docstr.socket',
+            'd.sock',
+            'config.yaml',
+        ]) == ('config.yaml', [], 'd.sock')
+
+        # Left to the full docstr parser.
+        assert get_client_args(['config.yaml', '--docstr.log_level', 'INFO'])\
+            is None
+        assert get_client_args(['a.yaml', 'b.yaml']) is None
+        assert get_client_args(['config.yaml', '-j', '2']) is None
+        assert get_client_args(['--x', '1']) is None
+
+    def test_run_via_daemon(self, tmp_path, daemon):
+        # Only the user may connect to the daemon.
+        assert stat.S_IMODE(os.stat(daemon).st_mode) == 0o600
+
+        config = tmp_path / 'config.yaml'
+        config.write_text(CONFIG.format(x=0.0))
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_status = run_via_daemon(
+            str(config),
+            ['--x', '5.0'],
+            socket_path=daemon,
+            stdout=stdout,
+            stderr=stderr,
+        )
+        assert exit_status == 0, stderr.getvalue()
+        assert stdout.getvalue() == 'abs loss at x = 5.0: 4.0\n'
+
+        # A changed config is loaded again.
+        time.sleep(0.01)
+        config.write_text(CONFIG.format(x=1.0))
+        stdout = io.StringIO()
+        exit_status = run_via_daemon(str(config), [], daemon, stdout=stdout)
+        assert exit_status == 0
+        assert stdout.getvalue() == 'abs loss at x = 1.0: 2.0\n'
+
+        # Errors of the program are streamed with a failing exit status.
+        stderr = io.StringIO()
+        exit_status = run_via_daemon(
+            str(config),
+            ['--x', 'not_a_number'],
+            daemon,
+            stdout=io.StringIO(),
+            stderr=stderr,
+        )
+        assert exit_status != 0
+        assert stderr.getvalue()
+
+    def test_client_without_parsing(self, tmp_path, daemon):
+        config = tmp_path / 'config.yaml'
+        config.write_text(CONFIG.format(x=0.0))
+
+        out = subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                '\n'.join([
+                    'import sys',
+                    'from docstr.cli.console import main',
+                    'exit_status = main()',
+                    'print(exit_status, sorted(',
+                    '    name for name in sys.modules',
+                    "    if name.partition('.')[0] in {",
+                    "        'tests', 'sphinx', 'docutils'",
+                    '    }',
+                    "    or name in {'docstr.cli.cli', 'docstr.parsing'}",
+                    '))',
+                ]),
+                'run',
+                str(config),
+                '--docstr.via_daemon',
+                '--docstr.socket',
+                daemon,
+                '--x',
+                '5.0',
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.getcwd(),
+        ).stdout.splitlines()
+
+        # Only the daemon's worker imports the program and docstr's docstring
+        # parsing.
+        assert out == ['abs loss at x = 5.0: 4.0', '0 []']
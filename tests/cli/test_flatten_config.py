@@ -0,0 +1,146 @@
+"""Tests the single pass, non-destructive flattening of program configs."""
+from copy import deepcopy
+
+import pytest
+
+from docstr.cli import cli
+
+NAMESPACE = {'Model': object, 'Linear': object, 'Relu': object}
+
+CONFIG = '\n'.join([
+    'docstr:',
+    '  style: numpy',
+    '  from import:',
+    '    tests.numpy_example_docstrings:',
+    '      - NumpyDocClass',
+    '      - NumpyDocClassObjective',
+    '  main: run',
+    'shared: &shared {x: 3.0}',
+    'first:',
+    '  NumpyDocClass:',
+    '    name: first',
+    '    a: 1.0',
+    '    b: 2',
+    '    x: 3',
+    'NumpyDocClassObjective:',
+    '  <<: *shared',
+    '  epochs: 2',
+])
+
+
+class TestFlattenConfig:
+    """Tests flatten_config() keeps order and its input intact."""
+    def test_flatten(self):
+        config = {
+            'model': {
+                'Model': {
+                    'lr': 0.1,
+                    'layers': [
+                        {'Linear': {'size': 8, 'bias': True}},
+                        {'Relu': {}},
+                        {'Linear': {'size': 2}},
+                    ],
+                    'shape': [3, 4],
+                    'deep': {'a': {'b': {'c': 1}}, 'd': 2},
+                    'empty': {},
+                },
+            },
+            'seed': 0,
+        }
+        original = deepcopy(config)
+
+        # Lists are values, including lists of component configs.
+        args = cli.flatten_config(config, NAMESPACE)
+        assert list(args.items()) == [
+            ('model.lr', 0.1),
+            ('model.layers', config['model']['Model']['layers']),
+            ('model.shape', [3, 4]),
+            ('model.deep.a.b.c', 1),
+            ('model.deep.d', 2),
+            ('seed', 0),
+        ]
+
+        # The config is unchanged, so it may be flattened again.
+        assert config == original
+        assert cli.flatten_config(config, NAMESPACE) == args
+        assert cli.flatten_config(
+            config,
+            NAMESPACE,
+            dests={'model.lr', 'model.deep', 'seed'},
+        ) == {
+            'model.lr': 0.1,
+            'model.deep': {'a': {'b': {'c': 1}}, 'd': 2},
+            'seed': 0,
+        }
+
+    def test_run_component_list(self, tmp_path):
+        config = tmp_path / 'config.yaml'
+        config.write_text('\n'.join([
+            'docstr:',
+            '  style: numpy',
+            '  from import:',
+            '    tests.numpy_example_docstrings:',
+            '      - NumpyDocClassLayers',
+            '      - NumpyDocClassObjective',
+            '  main: run',
+            'NumpyDocClassLayers:',
+            '  layers:',
+            '    - NumpyDocClassObjective: {x: 1.0}',
+            '    - NumpyDocClassObjective: {x: 2.0}',
+        ]))
+        expected = [
+            ('NumpyDocClassObjective', 1.0),
+            ('NumpyDocClassObjective', 2.0),
+        ]
+        assert cli.run_config(str(config)) == expected
+
+        # Parsed with program arguments, and given as a yaml sequence.
+        assert cli.run_config(str(config), ['--scale', '2']) == [
+            (name, x * 2) for name, x in expected
+        ]
+        assert cli.run_config(
+            str(config),
+            ['--layers', '[{NumpyDocClassObjective: {x: 3.0}}]'],
+        ) == [('NumpyDocClassObjective', 3.0)]
+
+    def test_null_key(self):
+        # A yaml null key does not end the flattening of its section.
+        config = {'deep': {None: 1, 'a': 2}, 'seed': 0}
+        assert cli.flatten_config(config, NAMESPACE) == {
+            'deep.None': 1,
+            'deep.a': 2,
+            'seed': 0,
+        }
+
+    def test_multiple_programs(self, tmp_path):
+        config = tmp_path / 'config.yaml'
+        config.write_text(CONFIG)
+        namespace = cli.prototype_hack_reformat_yaml_dict_unnested_cap(
+            str(config)
+        )
+
+        assert namespace.docstr.prog_names == [
+            'first',
+            'NumpyDocClassObjective',
+        ]
+        assert namespace.docstr.prog_name == 'NumpyDocClassObjective'
+        assert namespace.first.args == {
+            'name': 'first',
+            'a': 1.0,
+            'b': 2,
+            'x': 3,
+        }
+        assert namespace.NumpyDocClassObjective.args == {
+            'x': 3.0,
+            'epochs': 2,
+        }
+        assert namespace.docstr.entry_obj is (
+            namespace.NumpyDocClassObjective.entry_obj
+        )
+        assert cli.run_config(str(config)) == 1.5
+
+    def test_entry_name(self):
+        with pytest.raises(ValueError):
+            cli.get_entry_name('prog', {'Model': {}, 'Linear': {}}, NAMESPACE)
+        entry = cli.get_entry_name('prog', {'Model': {}, 'x': 1}, NAMESPACE)
+        assert entry == 'Model'
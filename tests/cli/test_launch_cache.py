@@ -0,0 +1,135 @@
+"""Tests the docstr launch cache of parsed configs, tokens, and parsers."""
+import os
+import pickle
+import shutil
+
+import yaml
+
+import pytest
+
+from docstr.cache import LaunchCache, hash_file
+from docstr.completion import get_cache_key
+from docstr.cli import cli
+from docstr.configargparse import (
+    NestedNamespace,
+    get_parser_spec,
+    parser_from_spec,
+)
+from docstr.parsing import parse_config
+
+
+@pytest.mark.incremental
+class TestLaunchCache:
+    """Tests the saving, loading, and invalidation of the launch cache."""
+    def test_parser_spec_roundtrip(self):
+        namespace = cli.prototype_hack_reformat_yaml_dict_unnested_cap(
+            'tests/numpy_example_config.yaml'
+        )
+        tokens = parse_config(
+            namespace.docstr,
+            getattr(namespace, namespace.docstr.prog_name),
+        )
+        prog_cap = cli.get_configargparser(tokens)
+        prog_yaml_args = getattr(namespace, namespace.docstr.prog_name).args
+
+        rebuilt = parser_from_spec(get_parser_spec(prog_cap))
+
+        assert (
+            rebuilt.parse_args(
+                args=['--very_useful_class.x', '7'],
+                namespace=NestedNamespace(),
+                config_file_contents=yaml.dump(prog_yaml_args),
+            )
+            == prog_cap.parse_args(
+                args=['--very_useful_class.x', '7'],
+                namespace=NestedNamespace(),
+                config_file_contents=yaml.dump(prog_yaml_args),
+            )
+        )
+
+    def test_repeat_launch_loads_cache(self, tmp_path, monkeypatch):
+        cache_dir = str(tmp_path / 'cache')
+        config = 'tests/numpy_example_config.yaml'
+
+        assert cli.docstr_cap(config, True, cache_dir=cache_dir) == 'foobar'
+        assert os.path.exists(LaunchCache(cache_dir).path(
+            get_cache_key(config, hash_file(config))
+        ))
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Cached launch parsed the config again.')
+
+        monkeypatch.setattr(
+            cli,
+            'prototype_hack_reformat_yaml_dict_unnested_cap',
+            fail,
+        )
+        monkeypatch.setattr(cli, 'parse_config', fail)
+        assert cli.docstr_cap(config, True, cache_dir=cache_dir) == 'foobar'
+
+        prog = cli.docstr_cap(
+            config,
+            True,
+            return_prog=True,
+            cache_dir=cache_dir,
+        )
+        assert prog.very_useful_class.name == 'Hello World!'
+
+    def test_changed_config_invalidates(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        config = str(tmp_path / 'config.yaml')
+        shutil.copy('tests/numpy_example_config.yaml', config)
+
+        cli.docstr_cap(config, True, cache_dir=cache_dir)
+        assert LaunchCache(cache_dir).load(config) is not None
+
+        with open(config, 'a') as openf:
+            openf.write('\n# A changed config.\n')
+        assert LaunchCache(cache_dir).load(config) is None
+
+    def test_changed_module_invalidates(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        config = 'tests/numpy_example_config.yaml'
+        cli.docstr_cap(config, True, cache_dir=cache_dir)
+
+        launch_cache = LaunchCache(cache_dir)
+        entry = launch_cache.load(config)
+        assert 'tests.numpy_example_docstrings' in entry.module_hashes
+
+        # Stand in for an edited module by outdating its recorded hash.
+        entry.module_hashes['tests.numpy_example_docstrings'] = 'outdated'
+        with open(launch_cache.path(entry.key), 'wb') as openf:
+            pickle.dump(entry, openf)
+        assert launch_cache.load(config) is None
+
+    def test_same_config_other_dir(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        configs = []
+        for name in ['first', 'second']:
+            os.makedirs(tmp_path / name)
+            configs.append(str(tmp_path / name / 'config.yaml'))
+            shutil.copy('tests/numpy_example_config.yaml', configs[-1])
+
+        cli.docstr_cap(configs[0], True, cache_dir=cache_dir)
+        launch_cache = LaunchCache(cache_dir)
+        assert launch_cache.load(configs[0]) is not None
+        # Identical contents, but relative includes would resolve elsewhere.
+        assert launch_cache.load(configs[1]) is None
+
+    def test_unpicklable_not_cached(self, tmp_path, caplog):
+        cache_dir = str(tmp_path / 'cache')
+        config = 'tests/numpy_example_config.yaml'
+        cap_namespace, prog_parser = cli.load_program(config)
+        cap_namespace.unpicklable = lambda: None
+
+        launch_cache = LaunchCache(cache_dir)
+        entry = launch_cache.save(
+            config,
+            cap_namespace,
+            prog_parser.tokens,
+            prog_parser.parser,
+        )
+        assert entry.cap_namespace is cap_namespace
+        assert 'unpicklable' in caplog.text
+        assert launch_cache.load(config) is None
+        assert os.listdir(cache_dir) == []
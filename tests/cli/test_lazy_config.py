@@ -0,0 +1,79 @@
+"""Tests constructing only the sections of a config that are program args."""
+import pickle
+
+import yaml
+
+from docstr.cli import cli
+from docstr.lazyconfig import LazyMapping, load_lazy
+
+CONFIG = '\n'.join([
+    'docstr:',
+    '  style: numpy',
+    '  from import:',
+    '    tests.numpy_example_docstrings:',
+    '      - NumpyDocClassObjective',
+    '  main: run',
+    'NumpyDocClassObjective:',
+    '  x: 1.0',
+    '  epochs: 2',
+    '  label_map: &labels',
+    '    cat: 0',
+    '    dog: 1',
+    '  per_class: {cat: [1, 2], dog: [3, 4]}',
+])
+
+
+class TestLazyConfig:
+    """Tests the lazy config leaves unused sections unconstructed."""
+    def test_lazy_mapping(self):
+        text = '\n'.join([
+            'base: &base {a: 1, b: [1, 2]}',
+            'merged:',
+            '  <<: *base',
+            '  b: [3]',
+        ])
+        lazy = load_lazy(text)
+        assert isinstance(lazy, LazyMapping)
+        assert list(lazy) == ['base', 'merged']
+        assert not lazy.is_constructed('merged')
+        assert lazy.is_mapping('merged')
+        assert lazy['merged']['b'] == [3]
+        assert lazy['merged']['a'] == 1
+        assert lazy.to_dict() == yaml.safe_load(text)
+
+        loaded = pickle.loads(pickle.dumps(lazy))
+        assert isinstance(loaded, LazyMapping)
+        assert not loaded.is_constructed('base')
+        assert loaded.to_dict() == yaml.safe_load(text)
+
+    def test_load_program(self, tmp_path):
+        config = tmp_path / 'config.yaml'
+        config.write_text(CONFIG)
+
+        cap_namespace, prog_parser = cli.load_program(str(config), lazy=True)
+        prog_config = cap_namespace.NumpyDocClassObjective.config
+        assert prog_parser.config == {'x': 1.0, 'epochs': 2}
+        assert not prog_config.is_constructed('label_map')
+        assert not prog_config.is_constructed('per_class')
+
+        # Unused sections are constructed on first access.
+        assert prog_config['label_map'] == {'cat': 0, 'dog': 1}
+        assert prog_config['per_class']['dog'] == [3, 4]
+
+        assert cli.run_config(str(config), lazy_config=True) == 1.5
+        assert cli.run_config(
+            str(config),
+            ['--x', '2.0'],
+            cache_dir=str(tmp_path / 'cache'),
+            lazy_config=True,
+        ) == 0.5
+
+        # The launch cache keeps the unused sections lazy.
+        cap_namespace, _ = cli.load_program(
+            str(config),
+            str(tmp_path / 'cache'),
+            lazy=True,
+        )
+        prog_config = cap_namespace.NumpyDocClassObjective.config
+        assert isinstance(prog_config, LazyMapping)
+        assert not prog_config.is_constructed('label_map')
@@ -0,0 +1,77 @@
+"""Tests the `from import` objects are only imported once they are used."""
+import logging
+import pickle
+
+from docstr.cli import cli
+from docstr.imports import LazyImports, LazyWhitelist
+
+CONFIG = '\n'.join([
+    'docstr:',
+    '  style: numpy',
+    '  from import:',
+    '    tests.numpy_example_docstrings:',
+    '      - func_choices',
+    '      - NumpyDocClass',
+    '      - NumpyDocClassRecursiveParse',
+    '    tests.module_that_does_not_exist:',
+    '      - NeverImported',
+    '  main: run',
+    'NumpyDocClassRecursiveParse:',
+    '  very_useful_class:',
+    '    NumpyDocClass:',
+    '      name: lazy',
+    '      a: 1.0',
+    '      b: 2',
+    '      x: 3',
+])
+
+
+class TestLazyImports:
+    """Tests LazyImports and LazyWhitelist only import what is used."""
+    def test_lazy_imports(self):
+        imports = LazyImports({
+            'tests.numpy_example_docstrings': ['NumpyDocClass', 'func_choices'],
+            'tests.module_that_does_not_exist': 'NeverImported',
+        })
+        whitelist = LazyWhitelist(imports)
+
+        assert 'NeverImported' in imports
+        assert list(imports) == [
+            'NumpyDocClass',
+            'func_choices',
+            'NeverImported',
+        ]
+        assert imports.unused() == list(imports)
+        assert whitelist
+
+        assert 'tests.numpy_example_docstrings.NumpyDocClass' in whitelist
+        assert 'builtins.int' not in whitelist
+        assert imports.used() == ['NumpyDocClass']
+
+        loaded = pickle.loads(pickle.dumps(whitelist))
+        assert loaded == whitelist
+        assert loaded.imports.used() == ['NumpyDocClass']
+
+    def test_load_program(self, tmp_path, caplog):
+        config = tmp_path / 'config.yaml'
+        config.write_text(CONFIG)
+
+        with caplog.at_level(logging.INFO):
+            cap_namespace, prog_parser = cli.load_program(str(config))
+        namespace = cap_namespace.docstr.namespace
+        assert namespace.used() == [
+            'NumpyDocClass',
+            'NumpyDocClassRecursiveParse',
+        ]
+        assert namespace.unused() == ['func_choices', 'NeverImported']
+        assert 'func_choices, NeverImported' in caplog.text
+        assert prog_parser.config['very_useful_class.name'] == 'lazy'
+
+        # The cached program keeps which objects were used.
+        cache_dir = str(tmp_path / 'cache')
+        cli.load_program(str(config), cache_dir)
+        cap_namespace, _ = cli.load_program(str(config), cache_dir)
+        assert cap_namespace.docstr.namespace.unused() == [
+            'func_choices',
+            'NeverImported',
+        ]
@@ -0,0 +1,108 @@
+"""Tests binding config-only runs without the program's ConfigArgParser."""
+import pytest
+import yaml
+
+from docstr.cli import cli
+from docstr.configargparse import (
+    ConfigBindError,
+    ConfigBinder,
+    IndexedNamespace,
+)
+
+import tests.numpy_example_docstrings as examples
+
+
+def parse_with_argparse(prog_parser, config):
+    """Parses the config with the program's ConfigArgParser and no args."""
+    return prog_parser.get_parser().parse_args(
+        args=[],
+        namespace=IndexedNamespace(),
+        config_file_contents=yaml.dump(dict(config)),
+    )
+
+
+@pytest.fixture(scope='module')
+def prog_parser():
+    return cli.load_program('tests/numpy_example_config.yaml')[1]
+
+
+@pytest.fixture(scope='module')
+def objective_parser():
+    return cli.load_program('tests/numpy_example_sweep_config.yaml')[1]
+
+
+class TestConfigBinder:
+    """Tests the ConfigBinder binds configs as argparse parses them."""
+    def test_bind_matches_argparse(self, prog_parser, objective_parser):
+        for parser, config in [
+            (prog_parser, prog_parser.config),
+            (
+                prog_parser,
+                {
+                    'very_useful_class.name': 'bound',
+                    'very_useful_class.a': '2',
+                    'very_useful_class.b': 1.5,
+                    'very_useful_class.x': None,
+                    'very_useful_class.ok': True,
+                },
+            ),
+            (objective_parser, objective_parser.config),
+            (
+                objective_parser,
+                {'x': 3, 'loss': 'abs', 'epochs': 4, 'verbose': 'True'},
+            ),
+        ]:
+            bound = parser.binder.bind(config)
+            assert isinstance(bound, IndexedNamespace)
+            assert bound == parse_with_argparse(parser, config)
+
+        bound = objective_parser.binder.bind({})
+        assert bound.docstr_type is examples.NumpyDocClassObjective
+        assert bound.loss == 'square'
+        assert bound.verbose is False
+
+    def test_bind_errors(self, prog_parser, objective_parser):
+        config = dict(prog_parser.config)
+        del config['very_useful_class.name']
+        for parser, config in [
+            (prog_parser, config),
+            (prog_parser, {**prog_parser.config, 'very_useful_class.a': 'c'}),
+            (prog_parser, {**prog_parser.config, 'unknown': 1}),
+            (objective_parser, {'loss': 'cube'}),
+            (objective_parser, {'verbose': 'yes'}),
+            (objective_parser, {'x': [1, 2]}),
+        ]:
+            with pytest.raises(ConfigBindError):
+                parser.binder.bind(config)
+            # The argparse fallback reports the error.
+            with pytest.raises(SystemExit):
+                parser.with_config(config).parse()
+
+        assert 'unknown' not in prog_parser.binder.bind(
+            {**prog_parser.config, 'unknown': 1},
+            known_args=True,
+        )
+
+    def test_parser_built_on_demand(self):
+        _, prog_parser = cli.load_program('tests/numpy_example_config.yaml')
+        args = prog_parser.parse()
+        assert 'parser' not in prog_parser._built
+        assert args.very_useful_class.x == 100
+
+        copied = prog_parser.with_config({
+            **prog_parser.config,
+            'very_useful_class.x': 5,
+        })
+        args = copied.parse(['--very_useful_class.y', '2'])
+        assert args.very_useful_class.x == 5
+        assert args.very_useful_class.y == 2
+        # The parser built by the copy is shared with the original.
+        assert prog_parser._built['parser'] is copied.parser
+
+    def test_from_tokens_order(self, prog_parser):
+        binder = ConfigBinder.from_tokens(prog_parser.tokens)
+        dests = [
+            action.dest for action in prog_parser.get_parser()._actions
+            if action.dest != 'help'
+        ]
+        assert list(binder.args) == dests
@@ -0,0 +1,107 @@
+"""Tests the structurally shared merge of `!docstr.configs` default mappings.
+"""
+import copy
+import json
+import pickle
+
+import yaml
+
+from docstr.configargparse import (
+    DefaultsDict,
+    add_default_mappings,
+    merge_mappings,
+    recursive_dict_update,
+)
+
+
+class TestMergeMappings:
+    """Tests merge_mappings() matches recursive_dict_update() while sharing
+    the unchanged subtrees of the base.
+    """
+    def test_merge(self):
+        base = {
+            'a': 1,
+            'nested': {'b': 2, 'deep': {'c': 3}, 'other': {'d': 4}},
+            'shared': {'e': 5},
+        }
+        src = {'a': -1, 'nested': {'deep': {'c': -3}, 'new': 6}, 'f': 7}
+        expected = recursive_dict_update(base, src, copy=True)
+        merged = merge_mappings(base, src)
+
+        assert isinstance(merged, DefaultsDict)
+        assert merged == expected
+        assert list(merged) == list(expected)
+        assert list(merged['nested']) == list(expected['nested'])
+        assert repr(merged) == repr(expected)
+
+        # The base is unchanged and its unchanged subtrees are shared.
+        assert base['a'] == 1
+        assert base['nested']['deep'] == {'c': 3}
+        assert merged['shared'] is base['shared']
+        assert merged['nested']['other'] is base['nested']['other']
+        assert merge_mappings(base, {}) == base
+        assert merge_mappings(base, {}).defaults is base
+
+    def test_defaults_dict(self):
+        base = {'a': 1, 'b': 2, 'c': 3}
+        merged = DefaultsDict(base, {'b': -2, 'd': 4})
+        expected = {'a': 1, 'b': -2, 'c': 3, 'd': 4}
+
+        # Every way of reading it sees the merged mapping.
+        assert dict(merged) == {**merged} == expected
+        assert list(merged.items()) == list(expected.items())
+        assert len(merged) == 4
+        assert 'a' in merged and 'e' not in merged
+        assert merged.get('c') == 3 and merged.get('e') is None
+        assert json.loads(json.dumps(merged)) == expected
+        assert yaml.safe_load(yaml.safe_dump(merged)) == expected
+        assert yaml.safe_load(yaml.dump(merged)) == expected
+        for copied in (pickle.loads(pickle.dumps(merged)), copy.copy(merged)):
+            assert type(copied) is dict
+            assert copied == expected
+
+        # Writes only change the dict, never the defaults.
+        merged['a'] = 0
+        del merged['c']
+        assert merged.pop('b') == -2
+        merged.update(e=5)
+        assert merged == {'a': 0, 'd': 4, 'e': 5}
+        assert list(merged) == ['a', 'd', 'e']
+        assert base == {'a': 1, 'b': 2, 'c': 3}
+
+        merged['c'] = 6
+        assert list(merged) == ['a', 'c', 'd', 'e']
+        assert merged.popitem() == ('e', 5)
+        merged.clear()
+        assert merged == {} and len(merged) == 0
+
+    def test_default_mapping_tags(self):
+        default_map = {'x': 1, 'nested': {'y': 2, 'z': 3}}
+        loader = add_default_mappings(
+            type('TestLoader', (yaml.SafeLoader,), {}),
+            {'default': default_map},
+        )
+        loaded = yaml.load(
+            '\n'.join([
+                'first: !docstr.configs:default {x: 0}',
+                'second: !docstr.configs:default {nested: {z: 0}}',
+            ]),
+            Loader=loader,
+        )
+
+        assert loaded['first'] == {'x': 0, 'nested': {'y': 2, 'z': 3}}
+        assert loaded['second'] == {'x': 1, 'nested': {'y': 2, 'z': 0}}
+        assert loaded['first']['nested'] is default_map['nested']
+        assert default_map == {'x': 1, 'nested': {'y': 2, 'z': 3}}
+
+    def test_default_mapping_documents(self):
+        loader = add_default_mappings(
+            type('TestLoader', (yaml.SafeLoader,), {}),
+            {'default': {'x': 1, 'nested': {'y': 2}}},
+        )
+        text = '!docstr.configs:default {x: 0}'
+
+        # A tagged document is a dict, as the config file parsers require.
+        loaded = yaml.load(text, Loader=loader)
+        assert isinstance(loaded, dict)
+        assert yaml.safe_load(yaml.safe_dump(loaded)) == loaded
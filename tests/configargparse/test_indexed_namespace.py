@@ -0,0 +1,98 @@
+"""Tests the IndexedNamespace's dotted path index of its nested args."""
+import pickle
+
+import pytest
+
+from docstr.configargparse import (
+    ArgumentParser,
+    IndexedNamespace,
+    NestedNamespace,
+)
+
+
+def get_args():
+    """Returns a flat dict of dotted paths to values, as a config."""
+    args = {}
+    for i in range(100):
+        args[f'group_{i % 5}.sub_{i % 3}.arg_{i}'] = i
+    args['top'] = 'top'
+    return args
+
+
+class TestIndexedNamespace:
+    """Tests the index stays consistent with the nested args."""
+    def test_update(self):
+        args = get_args()
+        indexed = IndexedNamespace()
+        indexed.update(args)
+        nested = NestedNamespace()
+        for name, value in args.items():
+            setattr(nested, name, value)
+
+        assert indexed == nested
+        assert list(indexed.leaves()) == list(args.items())
+        for name, value in args.items():
+            assert getattr(indexed, name) == value
+            assert name in indexed
+        assert getattr(indexed, 'group_1.sub_1') is indexed.group_1.sub_1
+        assert list(indexed.group_1.leaves())[0] == ('sub_1.arg_1', 1)
+
+        # Setting through a nested namespace updates the root's index.
+        indexed.group_1.sub_1.arg_1 = -1
+        setattr(indexed.group_1, 'sub_1.new', 'new')
+        assert getattr(indexed, 'group_1.sub_1.arg_1') == -1
+        assert getattr(indexed, 'group_1.sub_1.new') == 'new'
+
+    def test_replace_and_delete(self):
+        indexed = IndexedNamespace(**get_args())
+        indexed.group_0 = NestedNamespace(a=1)
+        assert isinstance(indexed.group_0, IndexedNamespace)
+        assert getattr(indexed, 'group_0.a') == 1
+        assert 'group_0.sub_0.arg_0' not in indexed
+
+        delattr(indexed, 'group_0.a')
+        del indexed.group_1
+        assert 'group_0.a' not in indexed
+        assert 'group_1.sub_1.arg_1' not in indexed
+        assert not any(
+            path.startswith(('group_0', 'group_1'))
+            for path, _ in indexed.leaves()
+        )
+
+    def test_missing(self):
+        indexed = IndexedNamespace(a=1)
+        nested = NestedNamespace(a=1)
+        for namespace in (indexed, nested):
+            with pytest.raises(AttributeError):
+                namespace.missing
+            with pytest.raises(AttributeError):
+                getattr(namespace, 'a.missing')
+            assert getattr(namespace, 'missing', 'default') == 'default'
+            assert not hasattr(namespace, 'b.c')
+
+    def test_pickle(self):
+        indexed = IndexedNamespace(**get_args())
+        loaded = pickle.loads(pickle.dumps(indexed))
+        assert loaded == indexed
+        loaded.group_2.sub_2.arg_2 = -2
+        assert getattr(loaded, 'group_2.sub_2.arg_2') == -2
+        assert getattr(indexed, 'group_2.sub_2.arg_2') == 2
+
+    def test_parse_args(self):
+        parser = ArgumentParser()
+        parser.add_argument('--group.sub.arg', type=int, default=1)
+        parser.add_argument('--group.other', default='other')
+        parser.add_argument('--top', type=float, default=0.0)
+        args = parser.parse_args(
+            ['--group.sub.arg', '2', '--top', '3'],
+            namespace=IndexedNamespace(),
+        )
+
+        assert args.group.sub.arg == 2
+        assert getattr(args, 'group.other') == 'other'
+        assert args.top == 3.0
+        assert dict(args.leaves()) == {
+            'group.sub.arg': 2,
+            'group.other': 'other',
+            'top': 3.0,
+        }
@@ -0,0 +1,326 @@
+"""Tests the initialization of programs from their nested namespaces."""
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import pytest
+
+from docstr.cli import cli
+from docstr.configargparse import (
+    InitPlan,
+    InitPlanError,
+    LazyProxy,
+    NestedNamespace,
+    OverlayNamespace,
+    init_prog,
+    is_initialized,
+    resolve_lazy,
+)
+
+
+class SlowComponent(object):
+    """A component that loads for a while when constructed."""
+    def __init__(self, name, seconds=0.2, child=None):
+        time.sleep(seconds)
+        self.name = name
+        self.child = child
+
+
+class Parent(object):
+    """A parent of independent sibling components."""
+    def __init__(self, first, second, third):
+        self.first = first
+        self.second = second
+        self.third = third
+
+
+def get_namespace():
+    """Returns the namespace of a Parent of three slow siblings, where the
+    third has its own slow child.
+    """
+    namespace = NestedNamespace()
+    namespace.docstr_type = Parent
+    for name in ['first', 'second', 'third']:
+        setattr(namespace, f'{name}.docstr_type', SlowComponent)
+        setattr(namespace, f'{name}.name', name)
+    setattr(namespace, 'third.child.docstr_type', SlowComponent)
+    setattr(namespace, 'third.child.name', 'child')
+    return namespace
+
+
+class TestInitProg:
+    """Tests the sequential and parallel initialization of programs."""
+    def test_parallel_siblings(self):
+        start = time.perf_counter()
+        sequential = init_prog(get_namespace())
+        sequential_time = time.perf_counter() - start
+
+        with ThreadPoolExecutor(4) as executor:
+            start = time.perf_counter()
+            parallel = init_prog(get_namespace(), executor)
+            parallel_time = time.perf_counter() - start
+
+        assert sequential_time >= 0.8
+        # The siblings load concurrently, then the third's parent waits.
+        assert parallel_time < 0.6
+
+        for prog in (sequential, parallel):
+            assert isinstance(prog, Parent)
+            assert prog.first.name == 'first'
+            assert prog.second.name == 'second'
+            assert prog.third.name == 'third'
+            assert prog.third.child.name == 'child'
+
+    def test_run_config_init_jobs(self):
+        prog = cli.run_config(
+            'tests/numpy_example_config.yaml',
+            [],
+            return_prog=True,
+            init_jobs=2,
+        )
+        assert prog.very_useful_class.name == 'Hello World!'
+        assert prog.very_useful_class.x_times_b == 100 * 11
+        assert prog.run() == 'foobar'
+
+
+class Tokenizer(object):
+    """A component identical under two parents of the config."""
+    def __init__(self, vocab):
+        self.vocab = vocab
+
+
+class Dataset(object):
+    """A parent of a tokenizer."""
+    def __init__(self, tokenizer, split):
+        self.tokenizer = tokenizer
+        self.split = split
+
+
+class Pipeline(object):
+    """The entry object of two datasets sharing a tokenizer."""
+    def __init__(self, train, test, train_again):
+        self.train = train
+        self.test = test
+        self.train_again = train_again
+
+
+def get_missing_tokenizer(vocab):
+    """A factory of a tokenizer that counts its calls and returns None."""
+    get_missing_tokenizer.count += 1
+
+
+get_missing_tokenizer.count = 0
+
+
+def get_shared_namespace():
+    """Returns a namespace where identical subtrees name the same tokenizer,
+    and the train dataset is identical to train_again.
+    """
+    namespace = NestedNamespace()
+    namespace.docstr_type = Pipeline
+    for name, split in [
+        ('train', 'train'),
+        ('test', 'test'),
+        ('train_again', 'train'),
+    ]:
+        setattr(namespace, f'{name}.docstr_type', Dataset)
+        setattr(namespace, f'{name}.split', split)
+        setattr(namespace, f'{name}.tokenizer.docstr_type', Tokenizer)
+        setattr(namespace, f'{name}.tokenizer.vocab', ['a', 'b'])
+    return namespace
+
+
+class TestInitProgShared:
+    """Tests initializing identical namespace subtrees once when sharing."""
+    def test_not_shared_by_default(self):
+        prog = init_prog(get_shared_namespace())
+        assert prog.train.tokenizer is not prog.test.tokenizer
+        assert prog.train is not prog.train_again
+
+    def test_shared(self):
+        with ThreadPoolExecutor(2) as executor:
+            for prog in (
+                init_prog(get_shared_namespace(), share=True),
+                init_prog(get_shared_namespace(), executor, share=True),
+            ):
+                assert prog.train.tokenizer is prog.test.tokenizer
+                assert prog.train is prog.train_again
+                assert prog.train is not prog.test
+                assert prog.test.split == 'test'
+
+    def test_shared_none(self):
+        with ThreadPoolExecutor(2) as executor:
+            for kwargs in ({}, {'executor': executor}):
+                namespace = get_shared_namespace()
+                for name in ['train', 'test', 'train_again']:
+                    setattr(
+                        namespace,
+                        f'{name}.tokenizer.docstr_type',
+                        get_missing_tokenizer,
+                    )
+                get_missing_tokenizer.count = 0
+                prog = init_prog(namespace, share=True, **kwargs)
+                assert prog.train.tokenizer is None
+                assert get_missing_tokenizer.count == 1
+
+    def test_unshared_types(self):
+        prog = init_prog(
+            get_shared_namespace(),
+            share=True,
+            unshared={f'{__name__}.Tokenizer'},
+        )
+        assert prog.train.tokenizer is not prog.test.tokenizer
+        # Parents of unshared objects differ by their objects' identities.
+        assert prog.train is not prog.train_again
+
+        prog = init_prog(
+            get_shared_namespace(),
+            share=True,
+            unshared={Dataset},
+        )
+        assert prog.train.tokenizer is prog.test.tokenizer
+        assert prog.train is not prog.train_again
+
+
+class Counted(object):
+    """A component that counts how many times it was initialized."""
+    count = 0
+
+    def __init__(self, name, child=None):
+        Counted.count += 1
+        self.name = name
+        self.child = child
+
+    def __call__(self, greeting):
+        return f'{greeting} {self.name}'
+
+
+class TestInitProgLazy:
+    """Tests initializing nested objects on their first use."""
+    def get_namespace(self):
+        namespace = NestedNamespace()
+        namespace.docstr_type = Parent
+        for name in ['first', 'second', 'third']:
+            setattr(namespace, f'{name}.docstr_type', Counted)
+            setattr(namespace, f'{name}.name', name)
+            setattr(namespace, f'{name}.child.docstr_type', Counted)
+            setattr(namespace, f'{name}.child.name', f'{name}_child')
+        return namespace
+
+    def test_lazy(self):
+        Counted.count = 0
+        prog = init_prog(self.get_namespace(), lazy=True)
+        assert Counted.count == 0
+
+        assert isinstance(prog.first, LazyProxy)
+        assert isinstance(prog.first, Counted)
+        assert not is_initialized(prog.first)
+        assert Counted.count == 0
+
+        # Only the touched component is initialized, not its child.
+        assert prog.first.name == 'first'
+        assert Counted.count == 1
+        assert is_initialized(prog.first)
+        assert not is_initialized(prog.first.child)
+
+        assert prog.second('Hello') == 'Hello second'
+        assert prog.first.child.name == 'first_child'
+        assert Counted.count == 3
+
+        first = resolve_lazy(prog.first)
+        assert type(first) is Counted
+        assert resolve_lazy(prog.first) is first
+        assert not is_initialized(prog.third)
+
+    def test_lazy_run_config(self):
+        prog = cli.run_config(
+            'tests/numpy_example_config.yaml',
+            [],
+            return_prog=True,
+            lazy=True,
+        )
+        assert not is_initialized(prog.very_useful_class)
+        assert prog.run() == 'foobar'
+        assert prog.very_useful_class.x_times_b == 100 * 11
+
+
+class Recorded(object):
+    """A component that records the order of its initialization."""
+    order = []
+
+    def __init__(self, name, child=None, **kwargs):
+        Recorded.order.append(name)
+        self.name = name
+        self.child = child
+        self.kwargs = kwargs
+
+
+class TestInitPlan:
+    """Tests compiled initialization plans initialize as init_prog does."""
+    def get_namespace(self):
+        namespace = NestedNamespace()
+        namespace.docstr_type = Recorded
+        namespace.name = 'root'
+        for name in ['first', 'second', 'third']:
+            setattr(namespace, f'{name}.docstr_type', Recorded)
+            setattr(namespace, f'{name}.name', name)
+        setattr(namespace, 'third.child.docstr_type', Recorded)
+        setattr(namespace, 'third.child.name', 'third_child')
+        return namespace
+
+    def test_init_matches_init_prog(self):
+        Recorded.order = []
+        expected = init_prog(self.get_namespace())
+        expected_order = Recorded.order
+
+        plan = InitPlan.compile(self.get_namespace())
+        for namespace in [
+            self.get_namespace(),
+            OverlayNamespace(self.get_namespace(), {'second.name': 'second'}),
+        ]:
+            Recorded.order = []
+            prog = plan.init(namespace)
+            assert Recorded.order == expected_order
+            assert list(prog.kwargs) == list(expected.kwargs)
+            assert prog.kwargs['third'].child.name == 'third_child'
+
+        prog = plan.init(OverlayNamespace(
+            self.get_namespace(),
+            {'third.child.name': 'other'},
+        ))
+        assert prog.kwargs['third'].child.name == 'other'
+
+    def test_shape_mismatch(self):
+        plan = InitPlan.compile(self.get_namespace())
+        extra = self.get_namespace()
+        setattr(extra, 'third.child.extra', 1)
+        renamed = self.get_namespace()
+        delattr(renamed, 'first')
+        renamed.fourth = 4
+
+        for namespace in [extra, renamed]:
+            Recorded.order = []
+            with pytest.raises(InitPlanError):
+                plan.init(namespace)
+            # The shape is checked before any object is initialized.
+            assert Recorded.order == []
+
+    def test_program_parser_init_prog(self):
+        _, prog_parser = cli.load_program('tests/numpy_example_config.yaml')
+        prog = prog_parser.init_prog(prog_parser.parse())
+        plan = prog_parser._built['init_plan']
+        assert prog.very_useful_class.x_times_b == 100 * 11
+
+        copied = prog_parser.with_config({
+            **prog_parser.config,
+            'very_useful_class.x': 5,
+        })
+        prog = copied.init_prog(copied.parse())
+        assert prog.very_useful_class.x_times_b == 5 * 11
+        assert copied._built['init_plan'] is plan
+
+        # Another shape is compiled in place of the program's plan.
+        args = prog_parser.parse()
+        args.extra = 1
+        with pytest.raises(TypeError):
+            prog_parser.init_prog(args)
+        assert prog_parser._built['init_plan'] is not plan
@@ -0,0 +1,127 @@
+"""Tests the lazily registered nested argument groups of a program's parser."""
+import threading
+
+import pytest
+import yaml
+
+from docstr.cli import cli
+from docstr.cli.check import check_args
+from docstr.configargparse import (
+    ArgumentParser,
+    IndexedNamespace,
+    get_configargparser,
+    get_parser_spec,
+)
+
+CONFIG = 'tests/numpy_example_components_config.yaml'
+
+
+def parse(parser, args, config):
+    return parser.parse_args(
+        args=args,
+        namespace=IndexedNamespace(),
+        config_file_contents=yaml.dump(dict(config)),
+    )
+
+
+@pytest.fixture
+def prog_parser():
+    return cli.load_program(CONFIG)[1]
+
+
+class TestNestedParsers:
+    """Tests nested groups are registered once used and parse as if eager."""
+    def test_pending_until_used(self, prog_parser):
+        parser = prog_parser.parser
+        assert isinstance(parser, ArgumentParser)
+        assert list(parser.nested_parsers.pending) == ['first', 'second']
+        assert '--first.x' not in parser._option_string_actions
+
+        args = prog_parser.parse(['--name', 'lazy'])
+        assert args.first.x == 3.0
+        assert args.second.loss == 'square'
+        assert list(parser.nested_parsers.pending) == ['second']
+
+        args = prog_parser.parse(['--second.epochs=4'])
+        assert args.second.epochs == 4
+        assert not parser.nested_parsers.pending
+
+    def test_matches_eager(self, prog_parser):
+        eager = get_configargparser(prog_parser.tokens)
+        assert eager.nested_parsers is None
+        for args, config in [
+            ([], prog_parser.config),
+            (['--second.loss', 'abs'], prog_parser.config),
+            (['--first.verbose', 'True'], {'second.x': 1}),
+            (['--name=other'], {}),
+        ]:
+            lazy = get_configargparser(prog_parser.tokens, lazy_nested=True)
+            expected = parse(eager, args, config)
+            parsed = parse(lazy, args, config)
+            assert parsed == expected
+            # Args are in the order of the tokens, not of their registering.
+            assert repr(parsed) == repr(expected)
+
+    def test_errors(self, prog_parser):
+        parser = get_configargparser(prog_parser.tokens, lazy_nested=True)
+        for args in [
+            ['--second.loss', 'cube'],
+            ['--third.x', '1'],
+        ]:
+            with pytest.raises(SystemExit):
+                parse(parser, args, {})
+
+        checked = prog_parser.with_config({'first.x': 'a', 'second.y': 1})
+        errors = check_args(checked)
+        assert len(errors) == 2
+        assert errors[0].startswith('argument --first.x: invalid')
+        assert errors[1] == 'unrecognized argument: --second.y'
+
+    def test_parses_run_at_once(self, prog_parser):
+        nested = prog_parser.parser.nested_parsers
+        parsed = []
+
+        def run_parse(args):
+            thread = threading.Thread(
+                target=lambda: parsed.append(prog_parser.parse(args)),
+            )
+            thread.start()
+            return thread
+
+        with nested.parsing(['first.x']):
+            assert list(nested.pending) == ['second']
+
+            # Parses of registered groups do not wait on one in progress.
+            thread = run_parse(['--name', 'at_once'])
+            thread.join(timeout=10)
+            assert not thread.is_alive()
+            assert parsed[0].name == 'at_once'
+
+            # Adding a pending group waits for the parses in progress.
+            thread = run_parse(['--second.epochs=4'])
+            thread.join(timeout=0.2)
+            assert thread.is_alive()
+            assert list(nested.pending) == ['second']
+
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert parsed[1].second.epochs == 4
+        assert not nested.pending
+        assert nested.complete and nested.parses == 0
+
+    def test_help_and_spec_register_all(self, prog_parser):
+        parser = get_configargparser(prog_parser.tokens, lazy_nested=True)
+        assert '--second.loss' in parser.format_help()
+        assert not parser.nested_parsers.pending
+
+        parser = get_configargparser(prog_parser.tokens, lazy_nested=True)
+        dests = {arg.dest for arg in get_parser_spec(parser).args}
+        assert {'first.x', 'second.verbose'} <= dests
+
+    def test_required_registered(self):
+        _, prog_parser = cli.load_program('tests/numpy_example_config.yaml')
+        parser = prog_parser.parser
+        assert not parser.nested_parsers.pending
+        assert parser._option_string_actions[
+            '--very_useful_class.name'
+        ].required
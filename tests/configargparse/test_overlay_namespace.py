@@ -0,0 +1,91 @@
+"""Tests the copy-on-write OverlayNamespace of a shared NestedNamespace."""
+from docstr.cli import cli
+from docstr.configargparse import (
+    NestedNamespace,
+    OverlayNamespace,
+    init_prog,
+    namespace_items,
+)
+from docstr.params import Trial, get_base_namespace, get_trial_namespace
+
+
+def get_base():
+    """Returns a nested namespace with many args, as a large config."""
+    base = NestedNamespace()
+    for i in range(1000):
+        setattr(base, f'group_{i % 10}.arg_{i}', i)
+    base.top = 'top'
+    return base
+
+
+class TestOverlayNamespace:
+    """Tests overrides of an overlay leave its shared base unchanged."""
+    def test_overrides(self):
+        base = get_base()
+        overlay = OverlayNamespace(base, {'group_3.arg_3': -3, 'top': 'new'})
+        overlay.group_3.arg_13 = -13
+        setattr(overlay, 'new_group.arg', 'new')
+
+        assert overlay.top == 'new'
+        assert overlay.group_3.arg_3 == -3
+        assert getattr(overlay, 'group_3.arg_13') == -13
+        assert overlay.group_3.arg_23 == 23
+        assert overlay.new_group.arg == 'new'
+        assert vars(overlay.group_4)['_base'] is base.group_4
+
+        # The base is shared, not copied, and is never modified.
+        assert base.top == 'top'
+        assert base.group_3.arg_3 == 3
+        assert base.group_3.arg_13 == 13
+        assert 'new_group' not in vars(base)
+        assert len(vars(overlay)) == 2
+        assert set(vars(overlay)['_overrides']) == {
+            'top',
+            'group_3',
+            'group_4',
+            'new_group',
+        }
+
+        names = [name for name, _ in namespace_items(overlay)]
+        assert names == [f'group_{i}' for i in range(10)] + [
+            'top',
+            'new_group',
+        ]
+
+        expected = get_base()
+        expected.top = 'new'
+        expected.group_3.arg_3 = -3
+        expected.group_3.arg_13 = -13
+        setattr(expected, 'new_group.arg', 'new')
+        assert overlay == expected
+        assert OverlayNamespace(base) == get_base()
+
+    def test_init_prog(self):
+        _, prog_parser = cli.load_program('tests/numpy_example_config.yaml')
+        base = get_base_namespace(prog_parser)
+        trial = Trial(
+            0,
+            {'very_useful_class.x': '7', 'very_useful_class.ok': True},
+        )
+
+        overlay = get_trial_namespace(prog_parser, trial, base=base)
+        assert isinstance(overlay, OverlayNamespace)
+        assert overlay == prog_parser.parse(config=trial.args)
+
+        prog = init_prog(overlay)
+        assert prog.very_useful_class.ok is True
+        assert prog.very_useful_class.x_times_b == 7 * 11
+        assert base.very_useful_class.x == 100
+
+        # The program's arguments override the trial's args.
+        overlay = get_trial_namespace(
+            prog_parser,
+            trial,
+            ['--very_useful_class.x', '5'],
+            get_base_namespace(prog_parser, ['--very_useful_class.x', '5']),
+        )
+        assert overlay.very_useful_class.x == 5
+        assert overlay == prog_parser.parse(
+            ['--very_useful_class.x', '5'],
+            trial.args,
+        )
@@ -0,0 +1,58 @@
+"""Tests the reuse of a docstr program's parser for many parses."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from docstr.cli import cli
+from docstr.configargparse import NestedNamespace, ProgramParser
+
+import tests.numpy_example_docstrings as examples
+
+
+@pytest.fixture(scope='module')
+def prog_parser():
+    return cli.load_program('tests/numpy_example_config.yaml')[1]
+
+
+class TestProgramParser:
+    """Tests the ProgramParser parses overrides and configs repeatedly."""
+    def test_parse_config_defaults(self, prog_parser):
+        args = prog_parser.parse()
+
+        assert isinstance(args, NestedNamespace)
+        assert args.docstr_type == examples.NumpyDocClassRecursiveParse
+        assert args.very_useful_class.name == 'Hello World!'
+        assert args.very_useful_class.a == 3.14
+        assert args.very_useful_class.b == 8
+        assert args.very_useful_class.x == 100
+        assert args.very_useful_class.y == 11
+
+    def test_parse_overrides_and_config(self, prog_parser):
+        args = prog_parser.parse(
+            ['--very_useful_class.x', '7'],
+            {'very_useful_class.name': 'override', 'very_useful_class.b': 2},
+        )
+        assert args.very_useful_class.x == 7
+        assert args.very_useful_class.name == 'override'
+        assert args.very_useful_class.b == 2
+
+        # The program's config is unchanged and each parse is a new namespace
+        assert prog_parser.config['very_useful_class.b'] == 8
+        assert prog_parser.parse() is not prog_parser.parse()
+        assert prog_parser.parse().very_useful_class.b == 8
+
+    def test_parse_threaded(self, prog_parser):
+        def parse_x(x):
+            return x, prog_parser.parse(['--very_useful_class.x', str(x)])
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(parse_x, range(200)))
+
+        for x, args in results:
+            assert args.very_useful_class.x == x
+            assert args.very_useful_class.name == 'Hello World!'
+
+    def test_from_tokens(self, prog_parser):
+        rebuilt = ProgramParser(prog_parser.tokens, config=prog_parser.config)
+        assert rebuilt.parse(['--very_useful_class.z', '1.5']) \
+            == prog_parser.parse(['--very_useful_class.z', '1.5'])
@@ -455,3 +455,94 @@ class NumpyDocClassMultiLinking(NumpyDocClassLinking):
         super(self, NumpyDocClassLinking).__init__(*args, **kwargs)
 
 # TODO make an example of doc linking where you link to a method within a class
+
+
+class NumpyDocClassObjective(object):
+    """An example objective whose parameters are searched over, where the loss
+    is minimized at x = 2 and lessens with more epochs.
+
+    Attributes
+    ----------
+    x : float = 0.0
+        The point at which the objective is evaluated.
+    loss : 'square' | 'abs' = 'square'
+        The loss of the distance between x and the minimum.
+    epochs : int = 1
+        The budget of the evaluation, where the loss's offset is 1 / epochs.
+    verbose : bool = False
+        If True, prints the loss when run.
+    """
+    def __init__(self, x=0.0, loss='square', epochs=1, verbose=False):
+        """
+        Args
+        ----
+        see self
+        """
+        self.x = x
+        self.loss = loss
+        self.epochs = epochs
+        self.verbose = verbose
+
+    def run(self):
+        distance = self.x - 2
+        if self.loss == 'square':
+            result = distance ** 2 + 1 / self.epochs
+        else:
+            result = abs(distance) + 1 / self.epochs
+        if self.verbose:
+            print(f'{self.loss} loss at x = {self.x}: {result}')
+        return result
+
+
+class NumpyDocClassComponents(object):
+    """An example program of optional components, where each component is an
+    objective that is configured only if its args differ from the defaults.
+
+    Attributes
+    ----------
+    name : str = 'components'
+        The name of the program.
+    first : NumpyDocClassObjective
+        The first component objective.
+    second : NumpyDocClassObjective
+        The second component objective.
+    """
+    def __init__(self, first, second, name='components'):
+        """
+        Args
+        ----
+        see self
+        """
+        self.name = name
+        self.first = first
+        self.second = second
+
+    def run(self):
+        return self.first.run() + self.second.run()
+
+
+class NumpyDocClassLayers(object):
+    """An example program given a list of component configs as is.
+
+    Attributes
+    ----------
+    layers : list
+        The configs of the layers, e.g. `[{NumpyDocClassObjective: {...}}]`.
+    scale : float = 1.0
+        The scale of the layers' sizes.
+    """
+    def __init__(self, layers, scale=1.0):
+        """
+        Args
+        ----
+        see self
+        """
+        self.layers = layers
+        self.scale = scale
+
+    def run(self):
+        return [
+            (name, args['x'] * self.scale)
+            for layer in self.layers
+            for name, args in layer.items()
+        ]
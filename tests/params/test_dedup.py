@@ -0,0 +1,106 @@
+"""Tests the deduplication of trials by the canonical hash of their config."""
+from docstr.cli import cli
+from docstr.params import (
+    Trial,
+    dedup_trials,
+    get_canonical_config,
+    get_canonical_hash,
+    run_sweep,
+)
+from docstr.results import ResultsStore
+
+CONFIG = 'tests/numpy_example_sweep_config.yaml'
+
+
+class TestDedup:
+    """Tests canonical configs and skipping trials identical once resolved."""
+    def test_canonical_config(self):
+        _, prog_parser = cli.load_program('tests/numpy_example_config.yaml')
+        tokens = prog_parser.tokens
+
+        canonical = get_canonical_config(prog_parser.parse(), tokens)
+        assert list(canonical) == sorted(canonical)
+        assert canonical == {
+            'very_useful_class.a': 3.14,
+            'very_useful_class.b': 8,
+            'very_useful_class.name': 'Hello World!',
+            'very_useful_class.x': 100,
+        }
+
+        # Values equal to their defaults once cast by their types are dropped.
+        namespace = prog_parser.parse([
+            '--very_useful_class.x',
+            '8.0',
+            '--very_useful_class.ok',
+            'False',
+        ])
+        assert 'very_useful_class.x' not in get_canonical_config(
+            namespace,
+            tokens,
+        )
+        assert get_canonical_hash(namespace, tokens) == get_canonical_hash(
+            prog_parser.parse(config={'very_useful_class.x': 8}),
+            tokens,
+        )
+
+    def test_dedup_trials(self):
+        _, prog_parser = cli.load_program(CONFIG)
+        trials = [
+            Trial(0, {'x': 2}),
+            Trial(1, {'x': '2.0'}),
+            Trial(2, {'x': 3.0, 'loss': 'square'}),
+            Trial(3, {'x': 3.0, 'loss': None}),
+            Trial(4, {'x': 'not_a_number'}),
+            Trial(5, {'x': 'not_a_number'}),
+        ]
+        deduped = list(dedup_trials(trials, prog_parser))
+
+        assert [trial.index for trial in deduped] == [0, 2, 4, 5]
+        assert deduped[0].config_hash is not None
+        # Trials that fail to parse are run to report their errors.
+        assert deduped[2].config_hash is None
+
+    def test_sweep_skips_memoized(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        results = run_sweep(
+            CONFIG,
+            space={'x': [1, 1.0, 2], 'epochs': [1, 2]},
+            jobs=2,
+            results=path,
+        )
+        assert [trial.index for trial, _ in results] == [0, 1, 4, 5]
+
+        # The same resolved configs written differently are all skipped.
+        results = run_sweep(
+            CONFIG,
+            space={'x': ['2.0', 1.0, 3.0]},
+            prog_args=['--loss', 'square'],
+            jobs=2,
+            results=path,
+        )
+        assert [trial.args for trial, _ in results] == [{'x': 3.0}]
+
+        # Both the config hash and canonical hash of every trial.
+        assert len(ResultsStore(path).get_completed()) == 2 * 5
+
+        results = run_sweep(
+            CONFIG,
+            space={'x': [1, 1.0, 2]},
+            jobs=2,
+            results=path,
+            dedup=False,
+        )
+
+        # Without dedup, only the exact args of a completed trial are skipped.
+        assert [trial.args for trial, _ in results] == [{'x': 1.0}]
+
+    def test_sweep_resumes_across_dedup(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        space = {'x': [1.0, 2.0]}
+        results = run_sweep(CONFIG, space=space, results=path, dedup=False)
+        assert len(results) == 2
+        assert run_sweep(CONFIG, space=space, results=path) == []
+
+        path = str(tmp_path / 'dedup_results.jsonl')
+        assert len(run_sweep(CONFIG, space=space, results=path)) == 2
+        assert run_sweep(CONFIG, space=space, results=path, dedup=False) == []
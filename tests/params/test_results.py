@@ -0,0 +1,88 @@
+"""Tests the append-only results store of trials and resuming sweeps."""
+from docstr.params import run_sweep
+from docstr.results import ResultsStore, TrialRecord, get_config_hash
+
+CONFIG = 'tests/numpy_example_sweep_config.yaml'
+
+
+def make_record(i, status='success'):
+    """Returns an example record of a trial with the arg `x` of i."""
+    return TrialRecord(
+        config_hash=get_config_hash({'x': i}),
+        args={'x': i},
+        returned=i * 2,
+        wall_time=0.1,
+        cpu_time=0.1,
+        status=status,
+        index=i,
+    )
+
+
+class TestResultsStore:
+    """Tests the writing, loading, and crash recovery of ResultsStore."""
+    def test_batched_writes(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        store = ResultsStore(path, fsync_interval=3600, batch_size=3)
+
+        store.append(make_record(0))
+        store.append(make_record(1))
+        assert store.load() == []
+
+        store.append(make_record(2, 'failed'))
+        assert store.load() == [make_record(i) for i in range(2)] + [
+            make_record(2, 'failed')
+        ]
+
+        store.append(make_record(3))
+        store.close()
+        assert len(store.load()) == 4
+        assert store.get_completed() == {
+            get_config_hash({'x': i}) for i in (0, 1, 3)
+        }
+
+    def test_partial_line_recovery(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        with ResultsStore(path, fsync_interval=0) as store:
+            store.append(make_record(0))
+
+        # Stand in for a crash mid-write of a record.
+        with open(path, 'a') as openf:
+            openf.write('{"config_hash": "trunc')
+
+        with ResultsStore(path, fsync_interval=0) as store:
+            assert store.load() == [make_record(0)]
+            store.append(make_record(1))
+        assert store.load() == [make_record(0), make_record(1)]
+
+    def test_sweep_resumes(self, tmp_path):
+        path = str(tmp_path / 'results.jsonl')
+        results = run_sweep(CONFIG, jobs=2, results=path)
+        assert len(results) == 8
+
+        records = ResultsStore(path).load()
+        assert [record.index for record in records] == list(range(8))
+        assert records[2].args == {'x': 1.0, 'loss': 'square', 'epochs': 1}
+        assert records[2].returned == 2.0
+        assert records[2].status == 'success'
+        assert records[2].cpu_time >= 0
+
+        # Keep the first 3 records, as if the sweep crashed after them.
+        with open(path, 'r') as openf:
+            lines = openf.readlines()
+        with open(path, 'w') as openf:
+            openf.writelines(lines[:3])
+
+        results = run_sweep(CONFIG, jobs=2, results=path)
+        assert [trial.index for trial, _ in results] == list(range(3, 8))
+
+        # Both the config hash and canonical hash of every trial.
+        assert len(ResultsStore(path).get_completed()) == 2 * 8
+
+        # Overriding args changes the configs, so none are skipped.
+        results = run_sweep(
+            CONFIG,
+            prog_args=['--epochs', '2'],
+            jobs=2,
+            results=path,
+        )
+        assert len(results) == 8
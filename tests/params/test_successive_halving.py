@@ -0,0 +1,109 @@
+"""Tests the successive halving and Hyperband searches of `docstr sweep`."""
+import sys
+
+import pytest
+
+from docstr.cli import cli
+from docstr.cli.batch import run_captured
+from docstr.params import (
+    Trial,
+    get_best,
+    get_rung_budgets,
+    get_score,
+    run_successive_halving,
+)
+
+CONFIG = 'tests/numpy_example_sweep_config.yaml'
+
+
+class TestSuccessiveHalving:
+    """Tests the promotion of the best trials to larger budgets."""
+    def test_rung_budgets(self):
+        assert get_rung_budgets(1, 27) == [1, 3, 9, 27]
+        assert get_rung_budgets(2, 20, eta=2) == [2, 4, 8, 16]
+        with pytest.raises(ValueError):
+            get_rung_budgets(3, 1)
+
+    def test_successive_halving(self):
+        runs = run_successive_halving(CONFIG, 'epochs', 1, 9, jobs=2)
+
+        # 8 trials on 1 epoch, the best 2 on 3 epochs, then the best on 9.
+        budgets = [trial.args['epochs'] for trial, _ in runs]
+        assert budgets == [1] * 8 + [3] * 2 + [9]
+        assert [trial.index for trial, _ in runs[8:]] == [4, 5, 4]
+
+        trial, result = get_best(runs)
+        assert trial.args == {'x': 2.0, 'loss': 'square', 'epochs': 9}
+        assert result.returned == pytest.approx(1 / 9)
+
+        # Maximizing promotes the worst trials of the minimization.
+        runs = run_successive_halving(CONFIG, 'epochs', 1, 3, mode='max')
+        assert [trial.index for trial, _ in runs[8:]] == [0, 1]
+
+    def test_hyperband(self):
+        runs = run_successive_halving(
+            CONFIG,
+            'epochs',
+            1,
+            9,
+            hyperband=True,
+            seed=0,
+            jobs=2,
+        )
+        budgets = [trial.args['epochs'] for trial, _ in runs]
+
+        # The brackets start on 1, 3, and 9 epochs with 8, 5, and 3 trials.
+        assert budgets == [1] * 8 + [3] * 2 + [9] + [3] * 5 + [9] + [9] * 3
+
+    def test_best_on_largest_budget(self):
+        runs = [
+            (
+                Trial(index, {'epochs': epochs}),
+                run_captured('config.yaml', lambda loss=loss: loss),
+            )
+            for index, epochs, loss in [(0, 1, 0.1), (1, 3, 0.5), (2, 3, 0.3)]
+        ]
+        assert get_best(runs)[0].index == 0
+        assert get_best(runs, budget_arg='epochs')[0].index == 2
+        assert get_best(runs, 'max', 'epochs')[0].index == 1
+
+    def test_int_metric(self):
+        result = run_captured('config.yaml', lambda: 3)
+        assert get_score(result) == 3
+        assert get_score(result, 'max') == -3
+
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError):
+            run_successive_halving(CONFIG, 'x', 1, 9)
+        with pytest.raises(TypeError):
+            run_successive_halving(
+                CONFIG,
+                'loss',
+                1,
+                9,
+                space={'x': [1.0, 2.0]},
+            )
+
+    def test_cli_successive_halving(self, monkeypatch, capsys):
+        monkeypatch.setattr(
+            sys,
+            'argv',
+            [
+                'docstr',
+                'sweep',
+                CONFIG,
+                '-j',
+                '2',
+                '--docstr.budget',
+                'epochs',
+                '--docstr.max_budget',
+                '3',
+            ],
+        )
+        assert cli.docstr_cap() == 0
+
+        out = capsys.readouterr().out
+        assert (
+            "==> best trial 5 {'x': 2.0, 'loss': 'abs', 'epochs': 3}"
+            in out
+        )
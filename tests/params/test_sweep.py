@@ -0,0 +1,121 @@
+"""Tests the grid search of a program's parameters by `docstr sweep`."""
+import sys
+
+import pytest
+
+from docstr.cli import cli
+from docstr.params import ParamSpace, get_search_space, run_sweep
+
+CONFIG = 'tests/numpy_example_sweep_config.yaml'
+
+
+class TestSweep:
+    """Tests the expansion, validation, and running of search spaces."""
+    def test_search_space(self):
+        _, prog_parser = cli.load_program('tests/numpy_example_config.yaml')
+        search_space = get_search_space(
+            prog_parser.tokens,
+            {
+                'very_useful_class.x': {'start': 1, 'stop': 7, 'step': 3},
+                'very_useful_class.z': {'stop': 5.0},
+                'very_useful_class.ok': None,
+            },
+        )
+
+        assert list(search_space['very_useful_class.x']) == [1, 4]
+        assert search_space['very_useful_class.z'] == [3.14159, 4.14159]
+        assert search_space['very_useful_class.ok'] == [False, True]
+
+        trials = list(ParamSpace(search_space))
+        assert len(trials) == 8
+        assert [trial.index for trial in trials] == list(range(8))
+        assert trials[1].args == {
+            'very_useful_class.x': 1,
+            'very_useful_class.z': 3.14159,
+            'very_useful_class.ok': True,
+        }
+
+    def test_param_space_indexing(self):
+        # A space of over 10^11 trials is never materialized.
+        space = ParamSpace({
+            f'arg_{i}': range(10) if i % 2 == 0 else range(10, 100)
+            for i in range(8)
+        })
+        assert space.size == 10 ** 4 * 90 ** 4
+
+        trial = space[123456789]
+        assert trial.index == 123456789
+        assert list(space.iterate(123456789, 123456790)) == [trial]
+        assert space[-1].args == {
+            f'arg_{i}': 9 if i % 2 == 0 else 99 for i in range(8)
+        }
+        with pytest.raises(IndexError):
+            space[space.size]
+
+        # The digits carry over as the trials are iterated.
+        trials = list(space.iterate(89, 92))
+        assert [t.args['arg_7'] for t in trials] == [99, 10, 11]
+        assert [t.args['arg_6'] for t in trials] == [0, 1, 1]
+        assert trials == [space[89], space[90], space[91]]
+
+    def test_param_space_shards(self):
+        space = ParamSpace({'a': range(5), 'b': ['x', 'y']})
+
+        shards = [list(space.iterate(shard=i, num_shards=3)) for i in range(3)]
+        assert [len(trials) for trials in shards] == [3, 3, 4]
+        assert sum(shards, []) == list(space)
+
+        # Resuming from a checkpoint index within a shard.
+        assert list(space.iterate(4, shard=1, num_shards=3)) == shards[1][1:]
+        assert list(space.iterate(9, shard=0, num_shards=3)) == []
+
+        with pytest.raises(ValueError):
+            space.get_shard(3, 3)
+
+    def test_invalid_search_space(self):
+        _, prog_parser = cli.load_program(CONFIG)
+        with pytest.raises(ValueError) as error:
+            get_search_space(
+                prog_parser.tokens,
+                {
+                    'x': ['not_a_number', 1.0],
+                    'loss': ['square', 'huber'],
+                    'epochs': None,
+                    'not_an_arg': [1],
+                },
+            )
+
+        # Every error is reported at once.
+        message = str(error.value)
+        assert 'not_a_number' in message
+        assert 'huber' in message
+        assert '`epochs` must be given' in message
+        assert 'not_an_arg' in message
+
+    def test_run_sweep(self):
+        results = run_sweep(CONFIG, prog_args=['--epochs', '2'], jobs=2)
+
+        assert len(results) == 8
+        for trial, result in results:
+            assert result.exit_status == 0
+            distance = trial.args['x'] - 2
+            if trial.args['loss'] == 'square':
+                assert result.returned == distance ** 2 + 0.5
+            else:
+                assert result.returned == abs(distance) + 0.5
+
+    def test_run_sweep_shard(self):
+        results = run_sweep(CONFIG, jobs=2, start=3, shard=0, num_shards=2)
+        assert [trial.index for trial, _ in results] == [3]
+
+    def test_cli_sweep(self, monkeypatch, capsys):
+        monkeypatch.setattr(
+            sys,
+            'argv',
+            ['docstr', 'sweep', CONFIG, '-j', '1', '--epochs', '4'],
+        )
+        assert cli.docstr_cap() == 0
+
+        out = capsys.readouterr().out
+        assert "==> trial 7 {'x': 3.0, 'loss': 'abs'} <== exit status 0" in out
+        assert 'returned 1.25' in out
@@ -0,0 +1,85 @@
+"""Tests the filesystem work queue of trials run by `docstr worker`."""
+import os
+import subprocess
+import sys
+
+from docstr.params import run_sweep
+from docstr.results import ResultsStore, get_config_hash
+from docstr.workqueue import WorkQueue, run_worker, submit_sweep
+
+CONFIG = 'tests/numpy_example_sweep_config.yaml'
+
+
+class TestWorkQueue:
+    """Tests submitting, claiming, and running the trials of a work queue."""
+    def test_local_worker_processes(self, tmp_path):
+        queue_dir = str(tmp_path / 'queue')
+        count = submit_sweep(CONFIG, queue_dir, prog_args=['--epochs', '2'])
+        assert count == 8
+
+        # Several local processes stand in for the nodes sharing the disk.
+        workers = [
+            subprocess.Popen(
+                [sys.executable, '-m', 'docstr.cli.cli', 'worker', queue_dir],
+                stdout=subprocess.PIPE,
+            )
+            for _ in range(3)
+        ]
+        ran = 0
+        for worker in workers:
+            out, _ = worker.communicate(timeout=120)
+            assert worker.returncode == 0
+            ran += int(out.split()[-4])
+        assert ran == 8
+
+        work_queue = WorkQueue(queue_dir)
+        assert os.listdir(work_queue.path('pending')) == []
+        assert os.listdir(work_queue.path('claimed')) == []
+
+        records = work_queue.results()
+        assert [record.index for record in records] == list(range(8))
+        for record in records:
+            assert record.status == 'success'
+            distance = record.args['x'] - 2
+            if record.args['loss'] == 'square':
+                assert record.returned == distance ** 2 + 0.5
+            else:
+                assert record.returned == abs(distance) + 0.5
+
+    def test_requeue(self, tmp_path):
+        queue_dir = str(tmp_path / 'queue')
+        submit_sweep(CONFIG, queue_dir, space={'x': [1.0, 2.0, 3.0]})
+        work_queue = WorkQueue(queue_dir)
+
+        # A worker that died after claiming a trial.
+        claims = work_queue.claim()
+        next(claims)
+        claims.close()
+
+        assert run_worker(queue_dir) == 2
+        assert len(os.listdir(work_queue.path('claimed'))) == 1
+
+        assert work_queue.requeue() == 1
+        assert run_worker(queue_dir) == 1
+        assert [record.index for record in work_queue.results()] == [0, 1, 2]
+
+    def test_records_match_sweep(self, tmp_path):
+        queue_dir = str(tmp_path / 'queue')
+        path = str(tmp_path / 'results.jsonl')
+        space = {'x': [1.0, 2.0, 3.0]}
+        run_sweep(CONFIG, space={'x': [1.0, 2.0]}, results=path)
+
+        # Trials that succeeded in the results or the queue are not submitted.
+        assert submit_sweep(CONFIG, queue_dir, space=space, results=path) == 1
+        assert run_worker(queue_dir) == 1
+        assert submit_sweep(CONFIG, queue_dir, space=space, results=path) == 0
+
+        # The worker's records hash the trials as the sweep's records do.
+        record = WorkQueue(queue_dir).results()[0]
+        assert record.args['x'] == 3.0
+        assert record.config_hash == get_config_hash(record.args)
+        assert record.canonical_hash is not None
+        with ResultsStore(path) as store:
+            store.append(record)
+        assert run_sweep(CONFIG, space=space, results=path, dedup=False) == []
+        assert run_sweep(CONFIG, space=space, results=path) == []